@@ -1,22 +1,174 @@
 import anthropic
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from uuid import UUID
 import logging
 import json
+import asyncio
+import time
 from datetime import datetime
 
 from core.config import settings
 from models.database import SessionLocal
-from models import Business, BusinessResearch, ResearchStatus
+from models import Business, BusinessResearch, ResearchUsage, ResearchStatus
+from services.job_queue import job_queue
+from services.research_cache import fingerprint, get_research_cache
+from services.json_stream import JSONObjectStream
+from services.token_budget import get_token_budget
+from services.progress import send_research_progress
+from schemas.research import ResearchPayload
 
 logger = logging.getLogger(__name__)
 
+RESEARCH_MODEL = settings.research_model
+# Part of the research cache key; bump whenever the prompts change meaningfully
+RESEARCH_PROMPT_VERSION = "3"
+
+# Shortest prefix the API will cache for Sonnet models; a cache_control block
+# ending before this many tokens is silently processed uncached
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+# Targeted re-request budget per failing field; far below a full research call
+REPAIR_TOKENS_PER_FIELD = 400
+
+# Adaptive max_tokens: recent single-mode calls per business type considered
+ADAPTIVE_SAMPLE_SIZE = 50
+ADAPTIVE_MIN_SAMPLES = 5
+ADAPTIVE_HEADROOM = 1.25
+
+# Top-level research fields, in prompt order; each maps to a BusinessResearch column
+RESEARCH_FIELDS = (
+    "description", "services", "hours", "reviews", "social_media",
+    "images", "menu_items", "specialties", "history", "owner_info",
+)
+
+# Prompts are laid out as a static prefix (system, identical on every call and
+# marked for prompt caching) followed by a short per-business user message.
+# The guide is the first system block of every mode, so the modes share one
+# cached prefix; it must stay above PROMPT_CACHE_MIN_TOKENS. Anything business
+# specific must stay out of these constants.
+RESEARCH_GUIDE = """You write research records about local businesses for a website builder.
+Each record becomes the content of a one-page website for that business, read by
+its prospective customers. Accuracy matters more than completeness: a short,
+true record produces a better site than a long, invented one.
+
+GENERAL RULES
+- Use only information you can attribute to the business as described in the
+  user message or that is well known about it. Never invent phone numbers,
+  addresses, prices, URLs, review authors, owner names or founding dates.
+- When a field cannot be filled truthfully, use its empty value: "" for text,
+  [] for arrays and {} for objects. An empty field is never an error.
+- Write in plain English for customers. No markdown, HTML, emojis or hashtags,
+  and no claims such as "best in town" unless customers demonstrably say so.
+- Refer to the business in the third person and by its name, not "we" or "us".
+- Reply with JSON only: no prose before or after it and no code fences. Use
+  double-quoted keys and strings, no comments and no trailing commas.
+- Always emit the keys in the order of the field guide below, so a reply that
+  is cut short still carries the most important fields first.
+
+FIELD GUIDE
+description (string): 2-3 sentences, 40-80 words. Say what the business is,
+  where it is and what makes it worth a visit. Avoid repeating the address.
+services (array of strings): 3-10 services or product lines, each at most six
+  words in title case, most important first, e.g. "Custom Birthday Cakes".
+  Do not list generic filler such as "Customer Service" or "Great Prices".
+hours (object): keys are full English day names, Monday through Sunday; values
+  are ranges such as "9:00 AM - 5:00 PM", several ranges joined by ", ", or
+  "Closed". Leave out days you do not know, and use {} if none are known.
+reviews (array of objects): at most 5 real customer reviews or testimonials.
+  Each object has "author" (string, first name and last initial at most),
+  "rating" (integer 1-5, omitted if unknown), "text" (string, at most 300
+  characters, quoted faithfully and trimmed at a sentence boundary) and
+  "source" (string such as "Google" or "Yelp"). Never compose reviews.
+social_media (object): lowercase platform names ("facebook", "instagram",
+  "tiktok", "x", "youtube", "linkedin", "yelp") mapped to full https profile
+  URLs. Include only profiles that belong to this business.
+images (array of strings): 3-6 descriptions of photos that would suit the
+  site, each one sentence, e.g. "Morning light over the front counter with
+  trays of fresh croissants". Describe scenes, never give URLs or file names.
+menu_items (array of objects): for restaurants, cafes and shops only, at most
+  12 signature items. Each object has "name" (string), "description" (string,
+  at most 20 words) and "price" (string with currency, e.g. "$12.50", omitted
+  when unknown). Use [] for service businesses.
+specialties (array of strings): 2-5 short phrases naming what sets the
+  business apart, e.g. "Gluten-free baking" or "Same-day repairs".
+history (string): 1-3 sentences on how and when the business started or has
+  changed, or "" when unknown. Do not guess founding years.
+owner_info (object): only when publicly known, with "name" (string), "role"
+  (string, e.g. "Owner and head baker") and "summary" (string, one sentence).
+  Use {} otherwise; never name private individuals from guesswork.
+
+VALIDATION
+Records are checked field by field against the types above. A field with the
+wrong type is discarded and asked for again on its own, so returning a string
+where an array belongs, or free-form lines where an object belongs, costs the
+business a second request. Prefer the empty value over a wrongly typed one.
+
+EXAMPLE
+This example is about a fictional business and only shows the expected shape
+and tone; it has nothing to do with the businesses you will be asked about.
+
+Business: Harbor Lane Bakery, 12 Harbor Lane, Port Ellis
+{"description": "Harbor Lane Bakery is a neighborhood bakery in Port Ellis known for naturally leavened bread and seasonal fruit pastries. Locals stop in for morning coffee and a warm morning bun before heading down to the waterfront.",
+ "services": ["Artisan Sourdough Bread", "Seasonal Pastries", "Custom Celebration Cakes", "Wholesale Bread for Cafes"],
+ "hours": {"Monday": "Closed", "Tuesday": "7:00 AM - 3:00 PM", "Wednesday": "7:00 AM - 3:00 PM", "Thursday": "7:00 AM - 3:00 PM", "Friday": "7:00 AM - 5:00 PM", "Saturday": "8:00 AM - 5:00 PM", "Sunday": "8:00 AM - 1:00 PM"},
+ "reviews": [{"author": "Dana R.", "rating": 5, "text": "The sourdough is the best I have had outside of San Francisco, and the staff remember my order.", "source": "Google"}],
+ "social_media": {"instagram": "https://instagram.com/harborlanebakery"},
+ "images": ["Rows of crusty sourdough loaves cooling on wooden racks", "A baker dusting flour over dough on a marble counter", "Morning customers at small tables by a sunny front window"],
+ "menu_items": [{"name": "Country Sourdough", "description": "Naturally leavened loaf with a dark, crackling crust", "price": "$9.00"}, {"name": "Morning Bun", "description": "Laminated pastry rolled with orange zest and cinnamon sugar"}],
+ "specialties": ["Naturally leavened bread", "Seasonal fruit pastries"],
+ "history": "",
+ "owner_info": {}}
+"""
+
+RESEARCH_SYSTEM_PROMPT = """TASK
+The user message gives one business's name, address, phone, current website
+and Google Maps URL. Research that business and return a single JSON object
+with every key of the field guide."""
+
+REPAIR_SYSTEM_PROMPT = """TASK
+You fix individual fields of a research record. The user message gives the
+business details and lists the fields that were missing or invalid, with the
+reason. Return a single JSON object containing exactly the listed keys, typed
+as in the field guide."""
+
+BATCH_SYSTEM_PROMPT = """TASK
+The user message lists several businesses, one per line, each starting with
+its number in brackets followed by name, address, phone and website. Research
+each of them, keeping lists at the short end of the field guide's ranges since
+the businesses share one reply.
+
+Return a single JSON array with one object per business, in the order listed.
+Each object must have a "ref" key set to the business's number in brackets,
+followed by every key of the field guide."""
+
+
+def research_fingerprint(business: Business) -> str:
+    """Cache key covering every business field the research prompts use"""
+    inputs = {
+        "name": business.name,
+        "address": business.address,
+        "phone": business.phone,
+        "website": business.website,
+        "google_maps_url": business.google_maps_url,
+    }
+    return fingerprint(inputs, RESEARCH_MODEL, RESEARCH_PROMPT_VERSION)
+
+
+def _estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for budgeting English prompts
+    return len(text) // 4 + 1
+
 
 class ResearchAgent:
     def __init__(self):
-        self.client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+        self.client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+        self.cache = get_research_cache()
+        self.budget = get_token_budget()
+    
+    async def cached_research(self, business: Business):
+        return await self.cache.get(research_fingerprint(business))
     
-    async def research_business(self, business_id: UUID):
+    async def research_business(self, business_id: UUID, force_refresh: bool = False):
         db = SessionLocal()
         try:
             business = db.query(Business).filter(Business.id == business_id).first()
@@ -28,103 +180,441 @@ class ResearchAgent:
                 logger.error(f"Business or research not found for {business_id}")
                 return
             
+            cache_key = research_fingerprint(business)
+            if not force_refresh:
+                cached = await self.cache.get(cache_key)
+                if cached is not None:
+                    self.apply_research(research, cached)
+                    db.commit()
+                    await send_research_progress(business.id, "completed", 100, "Research loaded from cache")
+                    logger.info(f"Research for {business.name} served from cache")
+                    return
+            
             research_prompt = self._create_research_prompt(business)
             
-            response = self.client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=4000,
-                messages=[{
-                    "role": "user",
-                    "content": research_prompt
-                }]
-            )
+            await send_research_progress(business.id, "started", 0, f"Researching {business.name}")
+            
+            max_tokens = self._max_tokens_for(db, business.business_type)
+            reservation = await self._reserve(RESEARCH_SYSTEM_PROMPT + research_prompt, max_tokens)
+            started = time.monotonic()
             
-            research_data = self._parse_research_response(response.content[0].text)
-            
-            research.description = research_data.get("description")
-            research.services = research_data.get("services", [])
-            research.hours = research_data.get("hours", {})
-            research.reviews = research_data.get("reviews", [])
-            research.social_media = research_data.get("social_media", {})
-            research.images = research_data.get("images", [])
-            research.menu_items = research_data.get("menu_items", [])
-            research.specialties = research_data.get("specialties", [])
-            research.history = research_data.get("history")
-            research.owner_info = research_data.get("owner_info", {})
-            research.raw_research_data = research_data
-            research.status = ResearchStatus.COMPLETED
-            research.researched_at = datetime.utcnow()
+            # Fields are saved and pushed to the UI as soon as each one closes
+            parser = JSONObjectStream()
+            try:
+                async with self.client.messages.stream(
+                    model=RESEARCH_MODEL,
+                    max_tokens=max_tokens,
+                    system=self._system_blocks(RESEARCH_SYSTEM_PROMPT),
+                    messages=[{
+                        "role": "user",
+                        "content": research_prompt
+                    }]
+                ) as stream:
+                    async for text in stream.text_stream:
+                        fields = parser.feed(text)
+                        if fields:
+                            await self._save_partial(db, research, fields, parser)
+                    message = await stream.get_final_message()
+            except Exception:
+                await self.budget.settle(reservation, _estimate_tokens(RESEARCH_SYSTEM_PROMPT + research_prompt))
+                raise
+            
+            await self._record_usage(db, [(business, research)], "single", message, max_tokens, started, reservation)
+            
+            if not parser.complete:
+                logger.warning(f"Research reply for {business.name} was truncated; kept {sorted(parser.fields)}")
+            research_data, errors = await self._validate(db, business, research, parser.fields)
+            # Only fully valid research is reused
+            if not errors:
+                await self.cache.set(cache_key, research_data)
+            self.apply_research(research, research_data)
             
             db.commit()
+            await send_research_progress(business.id, "completed", 100, "Research completed")
             
             logger.info(f"Research completed for {business.name}")
             
         except Exception as e:
-            logger.error(f"Research failed: {e}")
-            if research:
+            # Left IN_PROGRESS: the job queue retries, and marks it FAILED once dead-lettered
+            logger.error(f"Research failed for {business_id}: {e}")
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    async def research_batch(self, business_ids: List[str], force_refresh: bool = False) -> Dict[str, str]:
+        """
+        Research several businesses with one LLM call
+        
+        Returns a status per business id: "completed", "cached", "missing"
+        when the model returned nothing usable for it, or "not_found". Missing items
+        are left IN_PROGRESS for the caller to retry individually; only a
+        failed call raises.
+        """
+        db = SessionLocal()
+        try:
+            results = {business_id: "not_found" for business_id in business_ids}
+            research_by_business = {
+                research.business_id: research
+                for research in db.query(BusinessResearch).filter(
+                    BusinessResearch.business_id.in_(business_ids)
+                )
+            }
+            businesses = [
+                business for business in db.query(Business).filter(Business.id.in_(business_ids))
+                if business.id in research_by_business
+            ]
+            
+            cache_keys = {business.id: research_fingerprint(business) for business in businesses}
+            if not force_refresh:
+                uncached = []
+                for business in businesses:
+                    cached = await self.cache.get(cache_keys[business.id])
+                    if cached is None:
+                        uncached.append(business)
+                        continue
+                    self.apply_research(research_by_business[business.id], cached)
+                    results[business.id] = "cached"
+                businesses = uncached
+            
+            if not businesses:
+                db.commit()
+                return results
+            
+            batch_prompt = self._create_batch_prompt(businesses)
+            max_tokens = min(
+                settings.research_batch_max_tokens,
+                sum(self._max_tokens_for(db, business.business_type) for business in businesses)
+            )
+            reservation = await self._reserve(BATCH_SYSTEM_PROMPT + batch_prompt, max_tokens)
+            started = time.monotonic()
+            try:
+                response = await self.client.messages.create(
+                    model=RESEARCH_MODEL,
+                    max_tokens=max_tokens,
+                    system=self._system_blocks(BATCH_SYSTEM_PROMPT),
+                    messages=[{
+                        "role": "user",
+                        "content": batch_prompt
+                    }]
+                )
+            except Exception:
+                await self.budget.settle(reservation, _estimate_tokens(BATCH_SYSTEM_PROMPT + batch_prompt))
+                raise
+            
+            await self._record_usage(
+                db,
+                [(business, research_by_business[business.id]) for business in businesses],
+                "batch", response, max_tokens, started, reservation
+            )
+            
+            # Items are matched back by their 1-based "ref", not by position
+            items = {}
+            for item in self._parse_batch_response(response.content[0].text):
+                try:
+                    items[int(item.pop("ref"))] = item
+                except (KeyError, TypeError, ValueError):
+                    continue
+            
+            for ref, business in enumerate(businesses, start=1):
+                research_data = items.get(ref)
+                if research_data is None:
+                    results[business.id] = "missing"
+                    continue
+                research = research_by_business[business.id]
+                research_data, errors = await self._validate(db, business, research, research_data)
+                if not errors:
+                    await self.cache.set(cache_keys[business.id], research_data)
+                self.apply_research(research, research_data)
+                results[business.id] = "completed"
+            
+            db.commit()
+            
+            completed = sum(1 for status in results.values() if status == "completed")
+            logger.info(f"Batch research completed for {completed}/{len(businesses)} businesses")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Batch research failed for {len(business_ids)} businesses: {e}")
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    def mark_failed(self, business_id: str):
+        db = SessionLocal()
+        try:
+            research = db.query(BusinessResearch).filter(
+                BusinessResearch.business_id == business_id
+            ).first()
+            if research and research.status == ResearchStatus.IN_PROGRESS:
                 research.status = ResearchStatus.FAILED
                 db.commit()
         finally:
             db.close()
     
+    def _max_tokens_for(self, db, business_type: Optional[str]) -> int:
+        """
+        Output budget sized from recent replies for this business type
+        
+        Uses the 95th percentile of recent output tokens plus headroom, and
+        the full ceiling until there are enough samples or whenever a recent
+        reply was cut off at its limit.
+        """
+        ceiling = settings.research_max_tokens
+        rows = db.query(ResearchUsage.output_tokens, ResearchUsage.stop_reason).filter(
+            ResearchUsage.business_type == business_type,
+            ResearchUsage.mode == "single"
+        ).order_by(ResearchUsage.created_at.desc()).limit(ADAPTIVE_SAMPLE_SIZE).all()
+        
+        if len(rows) < ADAPTIVE_MIN_SAMPLES or any(row.stop_reason == "max_tokens" for row in rows):
+            return ceiling
+        
+        outputs = sorted(row.output_tokens for row in rows)
+        p95 = outputs[min(len(outputs) - 1, int(len(outputs) * 0.95))]
+        # Round up to a 256-token step so small fluctuations do not change the limit
+        suggested = -(-int(p95 * ADAPTIVE_HEADROOM) // 256) * 256
+        return max(settings.research_min_max_tokens, min(ceiling, suggested))
+    
+    async def _reserve(self, prompt: str, max_tokens: int) -> Dict[str, int]:
+        # Worst case (the guide written to the cache) until the call reports its real usage
+        return await self.budget.reserve(_estimate_tokens(RESEARCH_GUIDE + prompt) + max_tokens)
+    
+    async def _record_usage(
+        self,
+        db,
+        targets: List[Tuple[Business, BusinessResearch]],
+        mode: str,
+        message,
+        max_tokens: int,
+        started: float,
+        reservation: Dict[str, int]
+    ):
+        usage = message.usage
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        # Cache reads do not count against input rate limits, so they stay off the budget
+        await self.budget.settle(reservation, usage.input_tokens + cache_write + usage.output_tokens)
+        
+        latency_ms = int((time.monotonic() - started) * 1000)
+        share = len(targets)
+        for business, research in targets:
+            db.add(ResearchUsage(
+                research_id=research.id,
+                business_id=business.id,
+                business_type=business.business_type,
+                model=RESEARCH_MODEL,
+                mode=mode,
+                input_tokens=usage.input_tokens // share,
+                output_tokens=usage.output_tokens // share,
+                cache_read_tokens=cache_read // share,
+                cache_write_tokens=cache_write // share,
+                max_tokens=max_tokens,
+                stop_reason=message.stop_reason,
+                latency_ms=latency_ms
+            ))
+        logger.info(
+            f"Research {mode} call: {usage.input_tokens} in (+{cache_read} cached, {cache_write} cache write) / "
+            f"{usage.output_tokens} out tokens "
+            f"of {max_tokens} max, {latency_ms}ms, stop={message.stop_reason}"
+        )
+    
+    async def _validate(
+        self,
+        db,
+        business: Business,
+        research: BusinessResearch,
+        research_data: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Validate against ResearchPayload, re-requesting only the fields that fail
+        
+        Local repairs happen in the schema's validators. Fields still missing
+        or invalid are asked for with a short targeted prompt; whatever fails
+        after that keeps its empty default. Returns the data and the errors
+        left over.
+        """
+        clean, errors = ResearchPayload.validate_fields(research_data)
+        if not errors:
+            return clean, errors
+        
+        logger.info(f"Repairing research fields for {business.name}: {errors}")
+        try:
+            repaired = await self._request_fields(db, business, research, errors, research_data)
+        except Exception as e:
+            logger.error(f"Research repair failed for {business.name}: {e}")
+            return clean, errors
+        
+        fixed, still_failing = ResearchPayload.validate_fields({**research_data, **repaired})
+        for name in errors:
+            if name not in still_failing:
+                clean[name] = fixed[name]
+        remaining = {name: error for name, error in errors.items() if name in still_failing}
+        if remaining:
+            logger.warning(f"Research fields for {business.name} still invalid after repair: {remaining}")
+        return clean, remaining
+    
+    async def _request_fields(
+        self,
+        db,
+        business: Business,
+        research: BusinessResearch,
+        errors: Dict[str, str],
+        research_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        problems = []
+        for name, error in errors.items():
+            if name in research_data:
+                previous = json.dumps(research_data[name], default=str)[:200]
+                problems.append(f"- {name}: previous value {previous} was invalid ({error})")
+            else:
+                problems.append(f"- {name}: missing")
+        prompt = self._create_research_prompt(business) + "\n\nProvide only these fields:\n" + "\n".join(problems)
+        
+        max_tokens = min(settings.research_max_tokens, REPAIR_TOKENS_PER_FIELD * len(errors))
+        reservation = await self._reserve(REPAIR_SYSTEM_PROMPT + prompt, max_tokens)
+        started = time.monotonic()
+        try:
+            response = await self.client.messages.create(
+                model=RESEARCH_MODEL,
+                max_tokens=max_tokens,
+                system=self._system_blocks(REPAIR_SYSTEM_PROMPT),
+                messages=[{
+                    "role": "user",
+                    "content": prompt
+                }]
+            )
+        except Exception:
+            await self.budget.settle(reservation, _estimate_tokens(REPAIR_SYSTEM_PROMPT + prompt))
+            raise
+        await self._record_usage(db, [(business, research)], "repair", response, max_tokens, started, reservation)
+        
+        parser = JSONObjectStream()
+        parser.feed(response.content[0].text)
+        return {name: value for name, value in parser.fields.items() if name in errors}
+    
+    async def _save_partial(
+        self,
+        db,
+        research: BusinessResearch,
+        fields: List[Tuple[str, Any]],
+        parser: JSONObjectStream
+    ):
+        # Only values that pass the schema reach the database or the UI
+        clean, errors = ResearchPayload.validate_fields(dict(fields))
+        valid = [(key, clean[key]) for key, _ in fields if key in RESEARCH_FIELDS and key not in errors]
+        for key, value in valid:
+            setattr(research, key, value)
+        db.commit()
+        
+        done = sum(1 for key in RESEARCH_FIELDS if key in parser.fields)
+        progress = min(99, round(100 * done / len(RESEARCH_FIELDS)))
+        for key, value in valid:
+            await send_research_progress(
+                research.business_id, key, progress, f"Found {key.replace('_', ' ')}",
+                data={"field": key, "value": value}
+            )
+    
     def _create_research_prompt(self, business: Business) -> str:
-        return f"""Research the following business and provide detailed information:
-
-Business Name: {business.name}
+        """Per-business suffix; the instructions live in RESEARCH_SYSTEM_PROMPT"""
+        return f"""Business Name: {business.name}
 Address: {business.address}
 Phone: {business.phone or 'Not available'}
 Current Website: {business.website or 'None'}
-Google Maps URL: {business.google_maps_url or 'Not available'}
-
-Please research and provide the following information in JSON format:
-1. A compelling business description (2-3 sentences)
-2. List of services offered
-3. Business hours
-4. Recent reviews or testimonials (if available)
-5. Social media presence
-6. Suggested images (descriptions of what would work)
-7. Menu items or product offerings (if applicable)
-8. Specialties or unique selling points
-9. Brief history (if available)
-10. Owner information (if publicly available)
-
-Return the information as a valid JSON object with these keys:
-- description: string
-- services: array of strings
-- hours: object with day names as keys
-- reviews: array of review objects
-- social_media: object with platform names as keys
-- images: array of image description strings
-- menu_items: array of item objects
-- specialties: array of strings
-- history: string
-- owner_info: object
-
-If information is not available for any field, use appropriate empty values."""
+Google Maps URL: {business.google_maps_url or 'Not available'}"""
     
-    def _parse_research_response(self, response: str) -> Dict[str, Any]:
-        try:
-            if "```json" in response:
-                json_str = response.split("```json")[1].split("```")[0].strip()
-            elif "{" in response:
-                start = response.index("{")
-                end = response.rindex("}") + 1
-                json_str = response[start:end]
-            else:
-                json_str = response
-            
-            return json.loads(json_str)
-        except Exception as e:
-            logger.error(f"Failed to parse research response: {e}")
-            return {
-                "description": response[:500] if len(response) > 500 else response,
-                "services": [],
-                "hours": {},
-                "reviews": [],
-                "social_media": {},
-                "images": [],
-                "menu_items": [],
-                "specialties": [],
-                "history": "",
-                "owner_info": {}
-            }
\ No newline at end of file
+    def _create_batch_prompt(self, businesses: List[Business]) -> str:
+        """Per-batch suffix; the instructions live in BATCH_SYSTEM_PROMPT"""
+        return "\n".join(
+            f"[{ref}] {business.name} | {business.address} | "
+            f"Phone: {business.phone or 'Not available'} | Website: {business.website or 'None'}"
+            for ref, business in enumerate(businesses, start=1)
+        )
+    
+    @staticmethod
+    def _system_blocks(prompt: str) -> List[Dict[str, Any]]:
+        # Both blocks are cache breakpoints: the guide is shared by every mode,
+        # and the guide plus the mode's task is reused by repeat calls of that mode
+        return [
+            {"type": "text", "text": RESEARCH_GUIDE, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}},
+        ]
+    
+    def _parse_batch_response(self, response: str) -> List[Dict[str, Any]]:
+        """Decode array items one at a time so a truncated reply keeps its complete items"""
+        pos = response.find("[")
+        if pos == -1:
+            logger.error("Batch research response contained no JSON array")
+            return []
+        
+        decoder = json.JSONDecoder()
+        items = []
+        pos += 1
+        while pos < len(response):
+            while pos < len(response) and response[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(response) or response[pos] == "]":
+                break
+            try:
+                item, pos = decoder.raw_decode(response, pos)
+            except ValueError:
+                logger.warning(f"Batch research response truncated after {len(items)} items")
+                break
+            if isinstance(item, dict):
+                items.append(item)
+        return items
+    
+    def apply_research(self, research: BusinessResearch, research_data: Dict[str, Any]):
+        research.description = research_data.get("description")
+        research.services = research_data.get("services", [])
+        research.hours = research_data.get("hours", {})
+        research.reviews = research_data.get("reviews", [])
+        research.social_media = research_data.get("social_media", {})
+        research.images = research_data.get("images", [])
+        research.menu_items = research_data.get("menu_items", [])
+        research.specialties = research_data.get("specialties", [])
+        research.history = research_data.get("history")
+        research.owner_info = research_data.get("owner_info", {})
+        research.raw_research_data = research_data
+        research.status = ResearchStatus.COMPLETED
+        research.researched_at = datetime.utcnow()
+
+
+# Shared agent so every research job reuses one HTTP connection pool
+research_agent = ResearchAgent()
+
+RESEARCH_JOB = "research"
+RESEARCH_BATCH_JOB = "research_batch"
+
+
+def research_dedupe_key(business_id) -> str:
+    return f"{RESEARCH_JOB}:{business_id}"
+
+
+async def run_research_job(payload: Dict[str, Any]):
+    await research_agent.research_business(
+        UUID(payload["business_id"]), force_refresh=payload.get("force_refresh", False)
+    )
+
+
+async def fail_research_job(payload: Dict[str, Any]):
+    await asyncio.to_thread(research_agent.mark_failed, UUID(payload["business_id"]))
+
+
+async def run_research_batch_job(payload: Dict[str, Any]):
+    results = await research_agent.research_batch(
+        payload["business_ids"], force_refresh=payload.get("force_refresh", False)
+    )
+    # Items the batch reply did not cover fall back to single research jobs
+    for business_id, status in results.items():
+        if status == "missing":
+            await asyncio.to_thread(
+                job_queue.enqueue, RESEARCH_JOB,
+                {"business_id": business_id, "force_refresh": payload.get("force_refresh", False)},
+                research_dedupe_key(business_id)
+            )
+
+
+async def fail_research_batch_job(payload: Dict[str, Any]):
+    for business_id in payload["business_ids"]:
+        await asyncio.to_thread(research_agent.mark_failed, business_id)
@@ -0,0 +1,41 @@
+"""add business listing indexes
+
+Revision ID: 3f1c2a9d7b10
+Revises: 
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '3f1c2a9d7b10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_businesses_discovered_at_id", ["discovered_at", "id"]),
+    ("ix_businesses_status_discovered_at_id", ["website_status", "discovered_at", "id"]),
+    ("ix_businesses_type_discovered_at_id", ["business_type", "discovered_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    # Build without locking writes on a live businesses table
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name, "businesses", columns,
+                if_not_exists=True, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(
+                name, table_name="businesses",
+                if_exists=True, postgresql_concurrently=True
+            )
@@ -0,0 +1,59 @@
+"""add business geohash
+
+Revision ID: 8b2e4d6f1a35
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from services import geohash
+
+
+revision: str = '8b2e4d6f1a35'
+down_revision: Union[str, None] = '3f1c2a9d7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    op.add_column("businesses", sa.Column("geohash", sa.String(length=12), nullable=True))
+
+    # Backfill existing rows in batches
+    businesses = sa.table(
+        "businesses",
+        sa.column("id", sa.String),
+        sa.column("latitude", sa.Float),
+        sa.column("longitude", sa.Float),
+        sa.column("geohash", sa.String),
+    )
+    connection = op.get_bind()
+    while True:
+        rows = connection.execute(
+            sa.select(businesses.c.id, businesses.c.latitude, businesses.c.longitude)
+            .where(businesses.c.geohash.is_(None))
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        connection.execute(
+            businesses.update()
+            .where(businesses.c.id == sa.bindparam("business_id"))
+            .values(geohash=sa.bindparam("business_geohash")),
+            [
+                {"business_id": row.id, "business_geohash": geohash.encode(row.latitude, row.longitude)}
+                for row in rows
+            ]
+        )
+
+    op.create_index("ix_businesses_geohash", "businesses", ["geohash"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_businesses_geohash", table_name="businesses")
+    op.drop_column("businesses", "geohash")
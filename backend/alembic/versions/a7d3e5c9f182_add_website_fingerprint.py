@@ -0,0 +1,25 @@
+"""add website fingerprint
+
+Revision ID: a7d3e5c9f182
+Revises: f6a2c8e4b157
+Create Date: 2026-10-16 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a7d3e5c9f182'
+down_revision: Union[str, None] = 'f6a2c8e4b157'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("generated_websites", sa.Column("fingerprint", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("generated_websites", "fingerprint")
@@ -0,0 +1,43 @@
+"""add research usage
+
+Revision ID: d91a3c5e7f24
+Revises: c4d7e9a2b613
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd91a3c5e7f24'
+down_revision: Union[str, None] = 'c4d7e9a2b613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "research_usage",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("research_id", sa.String(), sa.ForeignKey("business_research.id"), nullable=False),
+        sa.Column("business_id", sa.String(), sa.ForeignKey("businesses.id"), nullable=False),
+        sa.Column("business_type", sa.String(), nullable=True),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("mode", sa.String(), nullable=False),
+        sa.Column("input_tokens", sa.Integer(), nullable=False),
+        sa.Column("output_tokens", sa.Integer(), nullable=False),
+        sa.Column("max_tokens", sa.Integer(), nullable=True),
+        sa.Column("stop_reason", sa.String(), nullable=True),
+        sa.Column("latency_ms", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_research_usage_research_id", "research_usage", ["research_id"])
+    op.create_index("ix_research_usage_type_created_at", "research_usage", ["business_type", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_research_usage_type_created_at", table_name="research_usage")
+    op.drop_index("ix_research_usage_research_id", table_name="research_usage")
+    op.drop_table("research_usage")
@@ -0,0 +1,27 @@
+"""add research usage cache tokens
+
+Revision ID: e3b8f0d2a946
+Revises: d91a3c5e7f24
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e3b8f0d2a946'
+down_revision: Union[str, None] = 'd91a3c5e7f24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("research_usage", sa.Column("cache_read_tokens", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("research_usage", sa.Column("cache_write_tokens", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("research_usage", "cache_write_tokens")
+    op.drop_column("research_usage", "cache_read_tokens")
@@ -0,0 +1,42 @@
+"""add pipeline runs
+
+Revision ID: f6a2c8e4b157
+Revises: e3b8f0d2a946
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f6a2c8e4b157'
+down_revision: Union[str, None] = 'e3b8f0d2a946'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+pipeline_status = sa.Enum("QUEUED", "RUNNING", "SUCCEEDED", "FAILED", name="pipelinestatus")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pipeline_runs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("spec", sa.JSON(), nullable=False),
+        sa.Column("template_id", sa.String(), sa.ForeignKey("templates.id"), nullable=True),
+        sa.Column("status", pipeline_status, nullable=False),
+        sa.Column("business_ids", sa.JSON(), nullable=False),
+        sa.Column("discovery_complete", sa.Boolean(), nullable=False),
+        sa.Column("stats", sa.JSON(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("pipeline_runs")
+    pipeline_status.drop(op.get_bind(), checkfirst=True)
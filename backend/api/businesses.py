@@ -1,26 +1,43 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 from uuid import UUID
+from datetime import datetime
+import base64
+import binascii
+import json
+import logging
 
-from models import get_db, Business
+from models import get_db, Business, WebsiteStatus
+from models.database import SessionLocal
 from services.google_places import GooglePlacesService
+from services.business_store import upsert_businesses, find_businesses_in_bbox, find_businesses_near
 from schemas.business import (
     BusinessSearch, 
     BusinessResponse, 
     BusinessCreate,
-    BusinessFilter
+    BusinessFilter,
+    BusinessPage
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
 
 @router.post("/search")
 async def search_businesses(
     search: BusinessSearch,
     db: Session = Depends(get_db)
 ) -> List[BusinessResponse]:
-    places_service = GooglePlacesService()
+    places_service = GooglePlacesService(session_factory=SessionLocal)
     
     try:
         places_data = await places_service.search_businesses(
@@ -30,30 +47,7 @@ async def search_businesses(
             max_results=search.max_results
         )
         
-        saved_businesses = []
-        for business_data in places_data:
-            existing = db.query(Business).filter_by(
-                google_place_id=business_data['place_id']
-            ).first()
-            
-            if not existing:
-                new_business = Business(
-                    google_place_id=business_data['place_id'],
-                    name=business_data['name'],
-                    address=business_data['address'],
-                    latitude=business_data['latitude'],
-                    longitude=business_data['longitude'],
-                    phone=business_data.get('phone'),
-                    website=business_data.get('website'),
-                    website_status=business_data['website_status'],
-                    google_maps_url=business_data.get('google_maps_url'),
-                    business_type=business_data.get('business_type')
-                )
-                db.add(new_business)
-                db.flush()  # Get the ID before commit
-                saved_businesses.append(new_business)
-            else:
-                saved_businesses.append(existing)
+        saved_businesses = upsert_businesses(db, places_data)
         
         db.commit()
         
@@ -63,19 +57,137 @@ async def search_businesses(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/search/stream")
+async def stream_search_businesses(
+    search: BusinessSearch,
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$")
+) -> StreamingResponse:
+    """Stream each business as soon as its details arrive and it is saved.
+    
+    Frames are ``business`` objects followed by one ``summary`` frame (or an
+    ``error`` frame), as NDJSON lines or Server-Sent Events.
+    """
+    return StreamingResponse(
+        _search_frames(search, format),
+        media_type=STREAM_MEDIA_TYPES[format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _search_frames(search: BusinessSearch, format: str) -> AsyncIterator[str]:
+    places_service = GooglePlacesService(session_factory=SessionLocal)
+    counts = {status: 0 for status in WebsiteStatus}
+    # The request-scoped session is closed before a streamed body is sent
+    db = SessionLocal()
+    
+    try:
+        async for business_data in places_service.stream_businesses(
+            location=search.location,
+            radius_miles=search.radius_miles,
+            business_types=search.business_types,
+            max_results=search.max_results
+        ):
+            business = upsert_businesses(db, [business_data])[0]
+            db.commit()
+            counts[business.website_status] += 1
+            yield _frame(format, "business", BusinessResponse.model_validate(business).model_dump(mode="json"))
+        
+        yield _frame(format, "summary", {
+            "total": sum(counts.values()),
+            "no_website": counts[WebsiteStatus.NO_WEBSITE],
+            "facebook_only": counts[WebsiteStatus.FACEBOOK_ONLY],
+            "has_website": counts[WebsiteStatus.HAS_WEBSITE],
+            "chains_filtered": places_service.chains_filtered
+        })
+    except Exception as e:
+        logger.error(f"Streaming search failed: {e}")
+        db.rollback()
+        yield _frame(format, "error", {"detail": str(e)})
+    finally:
+        db.close()
+
+
+def _frame(format: str, event: str, data: Dict[str, Any]) -> str:
+    if format == "sse":
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"type": event, "data": data}) + "\n"
+
+
 @router.get("/")
 async def list_businesses(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
     limit: int = Query(20, ge=1, le=100),
-    website_status: Optional[str] = None,
+    website_status: Optional[WebsiteStatus] = None,
+    business_type: Optional[str] = None,
     db: Session = Depends(get_db)
-) -> List[BusinessResponse]:
+) -> BusinessPage:
+    """List businesses newest first using keyset pagination on (discovered_at, id)"""
     query = db.query(Business)
     
     if website_status:
         query = query.filter(Business.website_status == website_status)
+    if business_type:
+        query = query.filter(Business.business_type == business_type)
+    if cursor:
+        discovered_at, business_id = _decode_cursor(cursor)
+        query = query.filter(tuple_(Business.discovered_at, Business.id) < (discovered_at, business_id))
+    
+    # Fetch one extra row to know whether there is a next page
+    businesses = query.order_by(
+        Business.discovered_at.desc(), Business.id.desc()
+    ).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(businesses) > limit:
+        businesses = businesses[:limit]
+        next_cursor = _encode_cursor(businesses[-1])
+    
+    return BusinessPage(
+        items=[BusinessResponse.model_validate(b) for b in businesses],
+        next_cursor=next_cursor
+    )
+
+
+def _encode_cursor(business: Business) -> str:
+    payload = json.dumps([business.discovered_at.isoformat(), business.id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        discovered_at, business_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(discovered_at), str(business_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/nearby")
+async def nearby_businesses(
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius_meters: Optional[float] = Query(None, gt=0, le=50000),
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    min_lng: Optional[float] = Query(None, ge=-180, le=180),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lng: Optional[float] = Query(None, ge=-180, le=180),
+    website_status: Optional[WebsiteStatus] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db)
+) -> List[BusinessResponse]:
+    """Businesses we already know about inside a radius or bounding box"""
+    if None not in (lat, lng, radius_meters):
+        businesses = find_businesses_near(db, lat, lng, radius_meters, website_status, limit)
+    elif None not in (min_lat, min_lng, max_lat, max_lng):
+        if min_lat > max_lat or min_lng > max_lng:
+            raise HTTPException(status_code=400, detail="Bounding box minimums must not exceed maximums")
+        businesses = find_businesses_in_bbox(db, min_lat, min_lng, max_lat, max_lng, website_status, limit)
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide lat, lng and radius_meters, or min_lat, min_lng, max_lat and max_lng"
+        )
     
-    businesses = query.offset(skip).limit(limit).all()
     return [BusinessResponse.model_validate(b) for b in businesses]
 
 
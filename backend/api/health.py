@@ -3,6 +3,9 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from models.database import get_db
+from services.place_cache import get_place_cache
+from services.geocoding import get_geocode_cache
+from services.research_cache import get_research_cache
 
 router = APIRouter()
 
@@ -22,4 +25,13 @@ async def database_health(db: Session = Depends(get_db)):
         db.execute("SELECT 1")
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
-        return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
\ No newline at end of file
+        return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
+
+
+@router.get("/cache")
+async def cache_health():
+    return {
+        "place_details": get_place_cache().stats(),
+        "geocode": get_geocode_cache().stats(),
+        "research": get_research_cache().stats()
+    }
\ No newline at end of file
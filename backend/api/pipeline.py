@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+import asyncio
+from sqlalchemy.orm import Session
+from uuid import UUID
+
+from models import get_db, PipelineRun, PipelineStatus, Template
+from services.job_queue import job_queue
+from services.pipeline import PIPELINE_JOB, default_template_id, pipeline_dedupe_key
+from schemas.pipeline import PipelineRequest, PipelineRunResponse
+
+router = APIRouter()
+
+
+@router.post("/runs")
+async def start_pipeline(
+    pipeline_request: PipelineRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+) -> PipelineRunResponse:
+    """Search an area, then research and generate sites for what it finds, in one run"""
+    if pipeline_request.template_id:
+        template_id = str(pipeline_request.template_id)
+        if not db.query(Template).filter(Template.id == template_id).first():
+            raise HTTPException(status_code=404, detail="Template not found")
+    else:
+        template_id = default_template_id(db)
+    
+    run = PipelineRun(
+        spec=pipeline_request.model_dump(mode="json", exclude={"template_id"}),
+        template_id=template_id
+    )
+    db.add(run)
+    db.commit()
+    
+    await _enqueue(request, run.id)
+    return PipelineRunResponse.from_orm(run)
+
+
+@router.post("/runs/{run_id}/resume")
+async def resume_pipeline(
+    run_id: UUID,
+    request: Request,
+    db: Session = Depends(get_db)
+) -> PipelineRunResponse:
+    """Continue a failed or interrupted run; finished work is skipped"""
+    run = db.query(PipelineRun).filter(PipelineRun.id == str(run_id)).first()
+    if not run:
+        raise HTTPException(status_code=404, detail="Pipeline run not found")
+    if run.status == PipelineStatus.SUCCEEDED:
+        raise HTTPException(status_code=400, detail="Pipeline run already finished")
+    
+    # Joins the run's job when it is still queued or running
+    await _enqueue(request, run.id)
+    db.refresh(run)
+    return PipelineRunResponse.from_orm(run)
+
+
+@router.get("/runs/{run_id}")
+async def get_pipeline(
+    run_id: UUID,
+    db: Session = Depends(get_db)
+) -> PipelineRunResponse:
+    run = db.query(PipelineRun).filter(PipelineRun.id == str(run_id)).first()
+    if not run:
+        raise HTTPException(status_code=404, detail="Pipeline run not found")
+    
+    return PipelineRunResponse.from_orm(run)
+
+
+async def _enqueue(request: Request, run_id: str):
+    # Failed attempts are retried with backoff and resume where they stopped
+    await asyncio.to_thread(
+        job_queue.enqueue, PIPELINE_JOB, {"run_id": run_id}, pipeline_dedupe_key(run_id)
+    )
+    pipeline_worker = getattr(request.app.state, "pipeline_worker", None)
+    if pipeline_worker:
+        pipeline_worker.notify()
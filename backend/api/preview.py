@@ -1,30 +1,82 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from typing import Dict, Optional
 from pathlib import Path
+import mimetypes
+
+from services.precompressed import select_variant
+from templates.template_manager import DEFAULT_OUTPUT_BASE, SHARED_ASSETS_DIR, SITE_ASSETS_DIR
 
 router = APIRouter()
 
-GENERATED_WEBSITES_DIR = Path("../generated_websites")
+GENERATED_WEBSITES_DIR = DEFAULT_OUTPUT_BASE
+SHARED_ASSETS_PATH = DEFAULT_OUTPUT_BASE / SHARED_ASSETS_DIR
+# Asset file names carry a content hash, so a cached copy can never go stale
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def precompressed_response(
+    file_path: Path,
+    accept_encoding: Optional[str],
+    media_type: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> FileResponse:
+    """Serve the best precompressed variant of ``file_path`` the client accepts, else the file itself"""
+    media_type = media_type or mimetypes.guess_type(file_path.name)[0] or "application/octet-stream"
+    headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+    variant = select_variant(file_path, accept_encoding)
+    if variant:
+        encoding, file_path = variant
+        headers["Content-Encoding"] = encoding
+    return FileResponse(file_path, media_type=media_type, headers=headers)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves saved .br/.gz variants instead of compressing per request"""
+    
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code != 200 or not isinstance(response, FileResponse):
+            return response
+        accept_encoding = Headers(scope=scope).get("accept-encoding")
+        return precompressed_response(Path(response.path), accept_encoding, response.media_type)
+
+
+@router.get("/assets/{file_name}")
+async def get_shared_asset(file_name: str, request: Request):
+    asset_file = SHARED_ASSETS_PATH / file_name
+    
+    if not asset_file.is_file():
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    return precompressed_response(
+        asset_file,
+        request.headers.get("accept-encoding"),
+        headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    )
 
 
 @router.get("/{business_id}")
-async def preview_website(business_id: str) -> HTMLResponse:
+async def preview_website(business_id: str, request: Request) -> FileResponse:
     website_dir = GENERATED_WEBSITES_DIR / business_id
     index_file = website_dir / "index.html"
     
     if not index_file.exists():
         raise HTTPException(status_code=404, detail="Website not found")
     
-    content = index_file.read_text(encoding='utf-8')
-    return HTMLResponse(content=content)
+    return precompressed_response(index_file, request.headers.get("accept-encoding"), "text/html")
 
 
 @router.get("/{business_id}/{file_path:path}")
-async def get_website_asset(business_id: str, file_path: str):
+async def get_website_asset(business_id: str, file_path: str, request: Request):
     website_dir = GENERATED_WEBSITES_DIR / business_id
     asset_file = website_dir / file_path
     
     if not asset_file.exists() or not asset_file.is_file():
         raise HTTPException(status_code=404, detail="File not found")
     
-    return FileResponse(asset_file)
\ No newline at end of file
+    # Exported sites and sites saved before OUTPUT_VERSION 3 keep hashed copies here
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL} if asset_file.parent.name == SITE_ASSETS_DIR else None
+    return precompressed_response(asset_file, request.headers.get("accept-encoding"), headers=headers)
\ No newline at end of file
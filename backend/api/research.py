@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from models import get_db, Business, BusinessResearch, ResearchStatus
-from agents.research_agent import ResearchAgent
-from schemas.research import ResearchResponse, ResearchRequest
+from models import get_db, Business, BusinessResearch, ResearchUsage, ResearchStatus
+from agents.research_agent import RESEARCH_JOB, RESEARCH_BATCH_JOB, research_agent, research_dedupe_key
+from core.config import settings
+from services.job_queue import job_queue
+from services.single_flight import single_flight
+from services.token_budget import get_token_budget
+from schemas.research import (
+    ResearchResponse, ResearchRequest, BatchResearchRequest, BatchResearchItem, BatchResearchResponse
+)
 
 router = APIRouter()
 
@@ -12,7 +22,8 @@ router = APIRouter()
 @router.post("/{business_id}/start")
 async def start_research(
     business_id: UUID,
-    background_tasks: BackgroundTasks,
+    request: Request,
+    research_request: Optional[ResearchRequest] = None,
     db: Session = Depends(get_db)
 ) -> ResearchResponse:
     business = db.query(Business).filter(Business.id == business_id).first()
@@ -20,33 +31,174 @@ async def start_research(
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
-    existing_research = db.query(BusinessResearch).filter(
-        BusinessResearch.business_id == business_id
-    ).first()
-    
-    if existing_research and existing_research.status == ResearchStatus.IN_PROGRESS:
-        raise HTTPException(status_code=400, detail="Research already in progress")
+    force_refresh = research_request.force_refresh if research_request else False
+    dedupe_key = research_dedupe_key(business_id)
     
-    if not existing_research:
-        research = BusinessResearch(
-            business_id=business_id,
-            status=ResearchStatus.IN_PROGRESS
+    async def start() -> Optional[str]:
+        # The job queue, not the research status, decides whether work is pending;
+        # a status stuck IN_PROGRESS without an active job can be restarted
+        active = await asyncio.to_thread(_active_research_jobs, [str(business_id)])
+        if active:
+            return active[str(business_id)]
+        
+        existing_research = db.query(BusinessResearch).filter(
+            BusinessResearch.business_id == business_id
+        ).first()
+        
+        if not existing_research:
+            research = BusinessResearch(
+                business_id=business_id,
+                status=ResearchStatus.IN_PROGRESS
+            )
+            db.add(research)
+        else:
+            existing_research.status = ResearchStatus.IN_PROGRESS
+            research = existing_research
+        
+        # Unchanged inputs reuse earlier research without touching the LLM
+        cached = None if force_refresh else await research_agent.cached_research(business)
+        if cached is not None:
+            research_agent.apply_research(research, cached)
+            db.commit()
+            return None
+        
+        db.commit()
+        
+        job_id = await asyncio.to_thread(
+            job_queue.enqueue, RESEARCH_JOB,
+            {"business_id": str(business_id), "force_refresh": force_refresh}, dedupe_key
         )
-        db.add(research)
-    else:
-        existing_research.status = ResearchStatus.IN_PROGRESS
-        research = existing_research
+        job_worker = getattr(request.app.state, "job_worker", None)
+        if job_worker:
+            job_worker.notify()
+        return job_id
     
-    db.commit()
-    
-    background_tasks.add_task(
-        ResearchAgent().research_business,
-        business_id=business_id
-    )
+    # Concurrent requests for the same business share one job and its result
+    await single_flight.do(dedupe_key, start)
     
+    research = db.query(BusinessResearch).filter(
+        BusinessResearch.business_id == str(business_id)
+    ).populate_existing().first()
     return ResearchResponse.from_orm(research)
 
 
+@router.post("/batch")
+async def start_batch_research(
+    batch: BatchResearchRequest,
+    request: Request,
+    db: Session = Depends(get_db)
+) -> BatchResearchResponse:
+    """Queue research for many businesses, several per LLM call"""
+    business_ids = list(dict.fromkeys(str(business_id) for business_id in batch.business_ids))
+    found = {
+        business_id for (business_id,) in
+        db.query(Business.id).filter(Business.id.in_(business_ids))
+    }
+    existing = {
+        research.business_id: research
+        for research in db.query(BusinessResearch).filter(BusinessResearch.business_id.in_(found))
+    }
+    
+    # Same locks as start_research, so a business is never queued twice
+    async with single_flight.lock_many(research_dedupe_key(business_id) for business_id in found):
+        active = await asyncio.to_thread(_active_research_jobs, list(found))
+        
+        items, queued = [], []
+        for business_id in business_ids:
+            if business_id not in found:
+                items.append(BatchResearchItem(business_id=business_id, status="not_found"))
+                continue
+            if business_id in active:
+                items.append(BatchResearchItem(business_id=business_id, status="in_progress"))
+                continue
+            
+            research = existing.get(business_id)
+            if not research:
+                db.add(BusinessResearch(business_id=business_id, status=ResearchStatus.IN_PROGRESS))
+            else:
+                research.status = ResearchStatus.IN_PROGRESS
+            items.append(BatchResearchItem(business_id=business_id, status="queued"))
+            queued.append(business_id)
+        
+        db.commit()
+        
+        size = max(1, settings.research_batch_size)
+        job_ids = [
+            await asyncio.to_thread(
+                job_queue.enqueue, RESEARCH_BATCH_JOB,
+                {"business_ids": queued[i:i + size], "force_refresh": batch.force_refresh}
+            )
+            for i in range(0, len(queued), size)
+        ]
+    job_worker = getattr(request.app.state, "job_worker", None)
+    if job_worker and job_ids:
+        job_worker.notify()
+    
+    return BatchResearchResponse(job_ids=job_ids, items=items)
+
+
+def _active_research_jobs(business_ids: List[str]) -> Dict[str, str]:
+    """Map each business with research queued or running to its job id"""
+    active = {}
+    for job in job_queue.list_active(RESEARCH_BATCH_JOB):
+        for business_id in job["payload"]["business_ids"]:
+            active[business_id] = job["id"]
+    for business_id in business_ids:
+        job = job_queue.find_active(research_dedupe_key(business_id))
+        if job:
+            active[business_id] = job["id"]
+    return {business_id: active[business_id] for business_id in business_ids if business_id in active}
+
+
+@router.get("/queue/stats")
+async def research_queue_stats(request: Request):
+    job_worker = getattr(request.app.state, "job_worker", None)
+    return {
+        "jobs": await asyncio.to_thread(job_queue.stats),
+        "worker": job_worker.stats() if job_worker else None,
+        "single_flight": single_flight.stats(),
+    }
+
+
+@router.get("/usage")
+async def research_usage(hours: int = Query(24, ge=1, le=24 * 90), db: Session = Depends(get_db)):
+    """Token usage and latency per model and mode, plus the live token budget"""
+    since = datetime.utcnow() - timedelta(hours=hours)
+    rows = db.query(
+        ResearchUsage.model,
+        ResearchUsage.mode,
+        func.count(ResearchUsage.id),
+        func.sum(ResearchUsage.input_tokens),
+        func.sum(ResearchUsage.output_tokens),
+        func.sum(ResearchUsage.cache_read_tokens),
+        func.sum(ResearchUsage.cache_write_tokens),
+        func.avg(ResearchUsage.latency_ms)
+    ).filter(ResearchUsage.created_at >= since).group_by(ResearchUsage.model, ResearchUsage.mode).all()
+    
+    usage = []
+    for model, mode, count, input_tokens, output_tokens, cache_read, cache_write, avg_latency in rows:
+        input_tokens, cache_read, cache_write = int(input_tokens or 0), int(cache_read or 0), int(cache_write or 0)
+        prompt_tokens = input_tokens + cache_read + cache_write
+        usage.append({
+            "model": model,
+            "mode": mode,
+            "businesses": count,
+            "input_tokens": input_tokens,
+            "output_tokens": int(output_tokens or 0),
+            "cache_read_tokens": cache_read,
+            "cache_write_tokens": cache_write,
+            # Share of prompt tokens served from the prompt cache
+            "cache_hit_rate": round(cache_read / prompt_tokens, 3) if prompt_tokens else 0.0,
+            "avg_latency_ms": round(avg_latency or 0),
+        })
+    
+    return {
+        "hours": hours,
+        "usage": usage,
+        "budget": await get_token_budget().usage(),
+    }
+
+
 @router.get("/{business_id}")
 async def get_research(
     business_id: UUID,
@@ -1,11 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Request
+import asyncio
+import os
+import socket
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from uuid import UUID
+from typing import Dict, List, Optional
+from uuid import UUID, uuid4
 
 from models import get_db, GeneratedWebsite, Business, Template
-from schemas.website import WebsiteCreate, WebsiteResponse, WebsiteUpdate
-from services.website_generator import WebsiteGenerator
+from schemas.website import (
+    WebsiteCreate, WebsiteResponse, WebsiteUpdate, BatchWebsiteCreate, BatchWebsiteItem, BatchWebsiteResponse
+)
+from services.job_queue import job_queue
+from services.single_flight import single_flight
+from services.website_generator import (
+    GENERATE_WEBSITE_JOB, generation_dedupe_key, get_or_create_websites, run_claimed_generation_jobs
+)
 
 router = APIRouter()
 
@@ -13,7 +22,7 @@ router = APIRouter()
 @router.post("/generate")
 async def generate_website(
     website_data: WebsiteCreate,
-    background_tasks: BackgroundTasks,
+    request: Request,
     db: Session = Depends(get_db)
 ) -> WebsiteResponse:
     business = db.query(Business).filter(Business.id == website_data.business_id).first()
@@ -24,25 +33,108 @@ async def generate_website(
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
     
-    website = GeneratedWebsite(
-        business_id=website_data.business_id,
-        template_id=website_data.template_id,
-        content={},
-        settings=website_data.settings or {}
-    )
+    dedupe_key = generation_dedupe_key(website_data.business_id, website_data.template_id)
     
-    db.add(website)
-    db.commit()
-    db.refresh(website)
+    async def start() -> str:
+        # A generation already queued or running for this business/template is joined
+        active = await asyncio.to_thread(job_queue.find_active, dedupe_key)
+        if active:
+            return active["payload"]["website_id"]
+        
+        # The business's existing site for this template is regenerated in place
+        business_id = str(website_data.business_id)
+        website_id = get_or_create_websites(
+            db, [business_id], website_data.template_id, website_data.settings
+        )[business_id]
+        
+        await asyncio.to_thread(
+            job_queue.enqueue, GENERATE_WEBSITE_JOB, {"website_id": website_id}, dedupe_key
+        )
+        job_worker = getattr(request.app.state, "job_worker", None)
+        if job_worker:
+            job_worker.notify()
+        return website_id
     
-    background_tasks.add_task(
-        WebsiteGenerator().generate,
-        website_id=website.id
-    )
+    website_id = await single_flight.do(dedupe_key, start)
     
+    website = db.query(GeneratedWebsite).filter(GeneratedWebsite.id == website_id).first()
     return WebsiteResponse.from_orm(website)
 
 
+@router.post("/generate/batch")
+async def generate_websites_batch(
+    batch: BatchWebsiteCreate,
+    db: Session = Depends(get_db)
+) -> BatchWebsiteResponse:
+    """Generate sites for many businesses now, rendered across the generation process pool"""
+    template = db.query(Template).filter(Template.id == batch.template_id).first()
+    if not template:
+        raise HTTPException(status_code=404, detail="Template not found")
+    
+    business_ids = list(dict.fromkeys(str(business_id) for business_id in batch.business_ids))
+    found = {
+        business_id for (business_id,) in
+        db.query(Business.id).filter(Business.id.in_(business_ids))
+    }
+    dedupe_keys = {
+        business_id: generation_dedupe_key(business_id, batch.template_id) for business_id in found
+    }
+    
+    # Same locks as generate_website, held only while the jobs are recorded: the
+    # running jobs mark the sites in progress while this request renders them
+    worker_id = f"{socket.gethostname()}-{os.getpid()}-batch-{uuid4().hex[:6]}"
+    async with single_flight.lock_many(dedupe_keys.values()):
+        active = await asyncio.to_thread(_active_generation_jobs, dedupe_keys)
+        pending = [business_id for business_id in business_ids if business_id in found and business_id not in active]
+        website_ids = get_or_create_websites(db, pending, batch.template_id, batch.settings)
+        job_ids = await asyncio.to_thread(
+            _claim_generation_jobs, website_ids, dedupe_keys, worker_id
+        )
+    results = await run_claimed_generation_jobs(job_ids, worker_id)
+    
+    items = []
+    for business_id in business_ids:
+        if business_id not in found:
+            items.append(BatchWebsiteItem(business_id=business_id, status="not_found"))
+        elif business_id in active:
+            items.append(BatchWebsiteItem(business_id=business_id, status="in_progress", website_id=active[business_id]))
+        else:
+            website_id = website_ids[business_id]
+            result = results[website_id]
+            items.append(BatchWebsiteItem(
+                business_id=business_id,
+                status=result["status"],
+                website_id=website_id,
+                preview_url=result.get("preview_url"),
+                error=result.get("error")
+            ))
+    return BatchWebsiteResponse(items=items)
+
+
+def _claim_generation_jobs(
+    website_ids: Dict[str, str],
+    dedupe_keys: Dict[str, str],
+    worker_id: str
+) -> Dict[str, str]:
+    """Enqueue a generation job per website, leased to this request; returns job ids by website id"""
+    return {
+        website_id: job_queue.enqueue(
+            GENERATE_WEBSITE_JOB, {"website_id": website_id}, dedupe_keys[business_id], claimed_by=worker_id
+        )
+        for business_id, website_id in website_ids.items()
+    }
+
+
+def _active_generation_jobs(dedupe_keys: Dict[str, str]) -> Dict[str, str]:
+    """Map each business with a generation queued or running to its website id"""
+    active = {}
+    for business_id, dedupe_key in dedupe_keys.items():
+        job = job_queue.find_active(dedupe_key)
+        if job:
+            active[business_id] = job["payload"]["website_id"]
+    return active
+
+
 @router.get("/{website_id}")
 async def get_website(
     website_id: UUID,
@@ -7,6 +7,7 @@ import json
 from pathlib import Path
 from datetime import datetime
 from api.auth import get_current_user
+from core.config import settings
 from services.website_storage import WebsiteStorage
 
 router = APIRouter()
@@ -16,7 +17,7 @@ async def list_websites(current_user: str = Depends(get_current_user)) -> Dict:
     """List all generated websites"""
     
     storage = WebsiteStorage()
-    websites_dir = Path("generated_websites")
+    websites_dir = Path(settings.generated_websites_dir)
     
     websites = []
     
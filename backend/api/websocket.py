@@ -59,6 +59,7 @@ class ConnectionManager:
         for client_id in list(self.active_connections.keys()):
             await self.send_progress(client_id, message)
 
+# Progress is published through services.progress; main.py relays it to this manager
 manager = ConnectionManager()
 
 @router.websocket("/ws/{client_id}")
@@ -85,30 +86,3 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
     except Exception as e:
         print(f"WebSocket error: {e}")
         manager.disconnect(websocket, client_id)
-
-# Helper function to send progress updates from other parts of the app
-async def send_research_progress(business_id: str, step: str, progress: float, message: str):
-    """Send research progress update"""
-    await manager.broadcast_progress(
-        business_id=business_id,
-        progress_type="research_progress",
-        data={
-            "step": step,
-            "progress": progress,
-            "message": message,
-            "status": "in_progress" if progress < 100 else "completed"
-        }
-    )
-
-async def send_generation_progress(business_id: str, step: str, progress: float, message: str):
-    """Send website generation progress update"""
-    await manager.broadcast_progress(
-        business_id=business_id,
-        progress_type="generation_progress",
-        data={
-            "step": step,
-            "progress": progress,
-            "message": message,
-            "status": "in_progress" if progress < 100 else "completed"
-        }
-    )
\ No newline at end of file
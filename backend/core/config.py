@@ -1,4 +1,5 @@
 from typing import Optional
+from pathlib import Path
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -13,14 +14,78 @@ class Settings(BaseSettings):
         env="DATABASE_URL"
     )
     
-    redis_url: str = Field(
-        default="redis://localhost:6379/0",
-        env="REDIS_URL"
-    )
+    # Shares caches, token budgets and locks across processes; without it they
+    # stay in-process. Each *_backend setting below can force "redis" or "memory"
+    redis_url: Optional[str] = Field(default=None, env="REDIS_URL")
     
     google_maps_api_key: str = Field(default="", env="GOOGLE_MAPS_API_KEY")
     anthropic_api_key: str = Field(default="", env="ANTHROPIC_API_KEY")
     
+    # Maximum number of concurrent Google Place Details requests per search page
+    places_details_concurrency: int = Field(default=10, env="PLACES_DETAILS_CONCURRENCY")
+    # Area searches split into quadtree tiles; these bound the Nearby Search cost
+    tiling_concurrency: int = Field(default=4, env="TILING_CONCURRENCY")
+    tiling_request_budget: int = Field(default=45, env="TILING_REQUEST_BUDGET")
+    tiling_min_tile_meters: int = Field(default=250, env="TILING_MIN_TILE_METERS")
+    # Fully scanned tiles are answered from the database until their record expires
+    search_tile_backend: Optional[str] = Field(default=None, env="SEARCH_TILE_BACKEND")
+    search_tile_ttl_seconds: int = Field(default=7 * 24 * 60 * 60, env="SEARCH_TILE_TTL_SECONDS")
+    # Chain businesses to exclude, one name per line; reloaded when the file changes
+    chain_list_path: str = Field(
+        default=str(Path(__file__).resolve().parent.parent / "data" / "chain_names.txt"),
+        env="CHAIN_LIST_PATH"
+    )
+    # "redis" shares cached place details across workers, "memory" keeps them in-process
+    place_cache_backend: Optional[str] = Field(default=None, env="PLACE_CACHE_BACKEND")
+    # Geocoded locations are kept in an LRU persisted to this SQLite file
+    geocode_cache_path: str = Field(default="cache/geocode.sqlite3", env="GEOCODE_CACHE_PATH")
+    geocode_cache_size: int = Field(default=1024, env="GEOCODE_CACHE_SIZE")
+    
+    # Must support prompt caching; changing it misses the research cache
+    research_model: str = Field(default="claude-sonnet-4-5", env="RESEARCH_MODEL")
+    # Research jobs run on a bounded worker pool so LLM calls cannot swamp the API
+    research_concurrency: int = Field(default=4, env="RESEARCH_CONCURRENCY")
+    # Businesses packed into one LLM call by batch research, sharing one output budget
+    research_batch_size: int = Field(default=5, env="RESEARCH_BATCH_SIZE")
+    research_batch_max_tokens: int = Field(default=4096, env="RESEARCH_BATCH_MAX_TOKENS")
+    # Output ceiling per research call; actual max_tokens adapts per business type
+    research_max_tokens: int = Field(default=4000, env="RESEARCH_MAX_TOKENS")
+    research_min_max_tokens: int = Field(default=1024, env="RESEARCH_MIN_MAX_TOKENS")
+    # Token limits across all research calls; calls wait for the next window when exceeded
+    research_tokens_per_minute: int = Field(default=80000, env="RESEARCH_TOKENS_PER_MINUTE")
+    research_tokens_per_day: int = Field(default=5000000, env="RESEARCH_TOKENS_PER_DAY")
+    token_budget_backend: Optional[str] = Field(default=None, env="TOKEN_BUDGET_BACKEND")
+    # Research results keyed by business fingerprint + model + prompt version
+    research_cache_backend: Optional[str] = Field(default=None, env="RESEARCH_CACHE_BACKEND")
+    research_cache_ttl_seconds: int = Field(default=30 * 24 * 60 * 60, env="RESEARCH_CACHE_TTL_SECONDS")
+    
+    # "redis" locks single-flight work across processes, "memory" only within one
+    single_flight_backend: Optional[str] = Field(default=None, env="SINGLE_FLIGHT_BACKEND")
+    
+    # Durable job queue (jobs table); leases are renewed every third of their length
+    job_lease_seconds: int = Field(default=120, env="JOB_LEASE_SECONDS")
+    job_max_attempts: int = Field(default=5, env="JOB_MAX_ATTEMPTS")
+    job_backoff_base_seconds: float = Field(default=10.0, env="JOB_BACKOFF_BASE_SECONDS")
+    job_backoff_max_seconds: float = Field(default=600.0, env="JOB_BACKOFF_MAX_SECONDS")
+    job_poll_interval_seconds: float = Field(default=1.0, env="JOB_POLL_INTERVAL_SECONDS")
+    # Run a job worker inside the API process; disable when running worker.py separately
+    run_job_worker_in_api: bool = Field(default=True, env="RUN_JOB_WORKER_IN_API")
+    
+    # Discovery -> research -> generation pipeline: workers per stage, and how many
+    # businesses may wait between stages before the stage upstream pauses
+    pipeline_research_concurrency: int = Field(default=4, env="PIPELINE_RESEARCH_CONCURRENCY")
+    pipeline_generation_concurrency: int = Field(default=2, env="PIPELINE_GENERATION_CONCURRENCY")
+    pipeline_queue_size: int = Field(default=10, env="PIPELINE_QUEUE_SIZE")
+    # Pipeline runs executing at once; they have their own worker slots, apart from
+    # the research_concurrency slots of the jobs they wait on
+    pipeline_concurrency: int = Field(default=2, env="PIPELINE_CONCURRENCY")
+    
+    # Root of every generated site, the shared template assets and their zips
+    generated_websites_dir: str = Field(default="generated_websites", env="GENERATED_WEBSITES_DIR")
+    
+    # Processes that render generated sites and write their files; 0 uses one per CPU
+    generation_workers: int = Field(default=0, env="GENERATION_WORKERS")
+    
     jwt_secret_key: str = Field(
         default="your-secret-key-change-in-production",
         env="JWT_SECRET_KEY"
@@ -1,15 +1,18 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 from contextlib import asynccontextmanager
 import logging
 from pathlib import Path
 
 from core.config import settings
-from api import health, businesses, templates, websites, research, preview, auth, preview_server, websites_list, websocket
+from api import health, businesses, templates, websites, research, preview, auth, preview_server, websites_list, websocket, pipeline
+from api.preview import PrecompressedStaticFiles
 from models.database import engine, Base
 from services.preview_server import preview_manager
+from services.progress import progress_bus
+from services.website_generator import shutdown_generation_pool
+from worker import create_job_worker, create_pipeline_worker
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,9 +24,23 @@ async def lifespan(app: FastAPI):
     Base.metadata.create_all(bind=engine)
     # Start preview server manager
     await preview_manager.start()
+    # Relay research/generation progress from the job workers to websocket clients
+    await progress_bus.start(websocket.manager.broadcast_progress)
+    job_worker = create_job_worker() if settings.run_job_worker_in_api else None
+    pipeline_worker = create_pipeline_worker() if settings.run_job_worker_in_api else None
+    if job_worker:
+        await job_worker.start()
+        await pipeline_worker.start()
+    app.state.job_worker = job_worker
+    app.state.pipeline_worker = pipeline_worker
     yield
     # Stop all preview servers on shutdown
     await preview_manager.stop()
+    if job_worker:
+        await job_worker.stop()
+        await pipeline_worker.stop()
+    await progress_bus.stop()
+    shutdown_generation_pool()
     logger.info("Shutting down BizFly application...")
 
 
@@ -46,6 +63,7 @@ app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(businesses.router, prefix="/api/businesses", tags=["businesses"])
 app.include_router(websocket.router, tags=["websocket"])
 app.include_router(research.router, prefix="/api/research", tags=["research"])
+app.include_router(pipeline.router, prefix="/api/pipeline", tags=["pipeline"])
 app.include_router(templates.router, prefix="/api/templates", tags=["templates"])
 app.include_router(websites_list.router, prefix="/api/websites", tags=["websites_list"])
 app.include_router(preview_server.router, prefix="/api/websites", tags=["preview_server"])
@@ -65,13 +83,14 @@ images_path = static_path / "images"
 if not images_path.exists():
     images_path.mkdir()
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Generated sites ship .br/.gz variants, served without compressing per request
+app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
 
 # Preview route for generated websites
 @app.get("/preview/{business_id}")
 async def preview_website(business_id: str):
     """Preview a generated website"""
-    website_path = Path(f"../generated_websites/{business_id}/index.html")
+    website_path = Path(settings.generated_websites_dir) / business_id / "index.html"
     if website_path.exists():
         with open(website_path, 'r', encoding='utf-8') as f:
             content = f.read()
@@ -1,16 +1,23 @@
 from .database import Base, get_db
-from .business import Business, BusinessResearch, WebsiteStatus, ResearchStatus
+from .business import Business, BusinessResearch, ResearchUsage, WebsiteStatus, ResearchStatus
 from .template import Template, GeneratedWebsite
 from .user import User
+from .job import Job, JobStatus
+from .pipeline import PipelineRun, PipelineStatus
 
 __all__ = [
     "Base",
     "get_db",
     "Business",
     "BusinessResearch",
+    "ResearchUsage",
     "WebsiteStatus", 
     "ResearchStatus",
     "Template",
     "GeneratedWebsite",
     "User",
+    "Job",
+    "JobStatus",
+    "PipelineRun",
+    "PipelineStatus",
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, Text, JSON, Enum, ForeignKey
+from sqlalchemy import Column, String, Float, Integer, DateTime, Text, JSON, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -29,6 +29,8 @@ class Business(Base):
     address = Column(String, nullable=False)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
+    # Geohash of (latitude, longitude) for indexed bounding-box/radius lookups
+    geohash = Column(String(12), index=True)
     phone = Column(String)
     website = Column(String)
     website_status = Column(Enum(WebsiteStatus), nullable=False)
@@ -40,6 +42,14 @@ class Business(Base):
     
     research = relationship("BusinessResearch", back_populates="business", uselist=False)
     generated_websites = relationship("GeneratedWebsite", back_populates="business")
+    
+    # Keyset pagination orders by (discovered_at, id); the filtered variants
+    # let each list filter walk its own index instead of scanning the table
+    __table_args__ = (
+        Index("ix_businesses_discovered_at_id", "discovered_at", "id"),
+        Index("ix_businesses_status_discovered_at_id", "website_status", "discovered_at", "id"),
+        Index("ix_businesses_type_discovered_at_id", "business_type", "discovered_at", "id"),
+    )
 
 
 class BusinessResearch(Base):
@@ -66,4 +76,36 @@ class BusinessResearch(Base):
     researched_at = Column(DateTime)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    business = relationship("Business", back_populates="research")
\ No newline at end of file
+    business = relationship("Business", back_populates="research")
+    usage = relationship("ResearchUsage", back_populates="research", order_by="ResearchUsage.created_at")
+
+
+class ResearchUsage(Base):
+    """Token usage and latency of one LLM call made for a business's research"""
+    __tablename__ = "research_usage"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    research_id = Column(String, ForeignKey("business_research.id"), nullable=False, index=True)
+    business_id = Column(String, ForeignKey("businesses.id"), nullable=False)
+    business_type = Column(String)
+    
+    model = Column(String, nullable=False)
+    # "single" or "batch"; batch calls are split evenly across their businesses
+    mode = Column(String, nullable=False, default="single")
+    input_tokens = Column(Integer, nullable=False, default=0)
+    output_tokens = Column(Integer, nullable=False, default=0)
+    # Prompt-cache reads and writes, reported separately from input_tokens
+    cache_read_tokens = Column(Integer, nullable=False, default=0)
+    cache_write_tokens = Column(Integer, nullable=False, default=0)
+    max_tokens = Column(Integer)
+    stop_reason = Column(String)
+    latency_ms = Column(Integer)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    research = relationship("BusinessResearch", back_populates="usage")
+    
+    # Adaptive max_tokens reads the latest calls per business type
+    __table_args__ = (
+        Index("ix_research_usage_type_created_at", "business_type", "created_at"),
+    )
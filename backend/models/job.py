@@ -0,0 +1,42 @@
+from sqlalchemy import Column, String, Integer, DateTime, Text, JSON, Enum, Index
+from datetime import datetime
+import uuid
+import enum
+
+from .database import Base
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"
+
+
+class Job(Base):
+    """A unit of background work; see services/job_queue.py"""
+    __tablename__ = "jobs"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    # Identifies the work item (e.g. "research:<business_id>") to avoid duplicate active jobs
+    dedupe_key = Column(String)
+    
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    locked_by = Column(String)
+    lease_expires_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    last_error = Column(Text)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+        Index("ix_jobs_dedupe_key_status", "dedupe_key", "status"),
+    )
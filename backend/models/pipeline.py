@@ -0,0 +1,37 @@
+from sqlalchemy import Column, String, DateTime, Text, JSON, Boolean, Enum, ForeignKey
+from datetime import datetime
+import uuid
+import enum
+
+from .database import Base
+
+
+class PipelineStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class PipelineRun(Base):
+    """A discovery -> research -> generation run; see services/pipeline.py"""
+    __tablename__ = "pipeline_runs"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Search and stage options the run was started with
+    spec = Column(JSON, nullable=False)
+    template_id = Column(String, ForeignKey("templates.id"))
+    status = Column(Enum(PipelineStatus), nullable=False, default=PipelineStatus.QUEUED)
+    
+    # Discovered business ids in arrival order; a resumed run replays them
+    # instead of searching again once discovery has completed
+    business_ids = Column(JSON, nullable=False, default=list)
+    discovery_complete = Column(Boolean, nullable=False, default=False)
+    # Per-stage counts and timings
+    stats = Column(JSON, nullable=False, default=dict)
+    error = Column(Text)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -47,6 +47,8 @@ class GeneratedWebsite(Base):
     
     preview_url = Column(String)
     production_url = Column(String)
+    # Hash of the content, template name and template version last rendered
+    fingerprint = Column(String)
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
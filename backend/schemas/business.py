@@ -47,4 +47,11 @@ class BusinessResponse(BaseModel):
 
 class BusinessFilter(BaseModel):
     website_status: Optional[WebsiteStatus] = None
-    business_type: Optional[str] = None
\ No newline at end of file
+    business_type: Optional[str] = None
+
+
+class BusinessPage(BaseModel):
+    items: List[BusinessResponse]
+    next_cursor: Optional[str] = Field(
+        default=None, description="Opaque cursor for the next page, null on the last page"
+    )
\ No newline at end of file
@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, List, Any
+from uuid import UUID
+from datetime import datetime
+
+from models.business import WebsiteStatus
+from models.pipeline import PipelineStatus
+from schemas.business import BusinessSearch
+
+
+class PipelineRequest(BusinessSearch):
+    template_id: Optional[UUID] = Field(
+        default=None, description="Template for generated sites; defaults to the first active template"
+    )
+    website_statuses: List[WebsiteStatus] = Field(
+        default=[WebsiteStatus.NO_WEBSITE, WebsiteStatus.FACEBOOK_ONLY],
+        description="Only discovered businesses with these statuses are researched and generated"
+    )
+    force_refresh: bool = False
+    research_concurrency: Optional[int] = Field(default=None, ge=1, le=32)
+    generation_concurrency: Optional[int] = Field(default=None, ge=1, le=32)
+
+
+class PipelineRunResponse(BaseModel):
+    id: UUID
+    status: PipelineStatus
+    spec: Dict[str, Any]
+    template_id: Optional[UUID]
+    business_ids: List[str]
+    discovery_complete: bool
+    stats: Dict[str, Any]
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
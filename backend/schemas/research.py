@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, List, Any
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from typing import Optional, Dict, List, Any, Tuple
+from urllib.parse import urlparse
 from uuid import UUID
 from datetime import datetime
 
@@ -28,4 +29,130 @@ class ResearchResponse(BaseModel):
     updated_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class BatchResearchRequest(BaseModel):
+    business_ids: List[UUID] = Field(..., min_length=1, max_length=200)
+    force_refresh: bool = False
+
+
+class BatchResearchItem(BaseModel):
+    business_id: UUID
+    # queued, in_progress or not_found
+    status: str
+
+
+class BatchResearchResponse(BaseModel):
+    job_ids: List[str]
+    items: List[BatchResearchItem]
+
+
+class ResearchPayload(BaseModel):
+    """
+    Shape of the research JSON returned by the LLM
+    
+    Before-validators repair common near misses locally (a string where a
+    list belongs, "Monday: 9-5" lines instead of an hours object); anything
+    still invalid is reported per field by ``validate_fields``.
+    """
+    description: str = ""
+    services: List[str] = []
+    hours: Dict[str, str] = {}
+    reviews: List[Dict[str, Any]] = []
+    social_media: Dict[str, str] = {}
+    images: List[str] = []
+    menu_items: List[Dict[str, Any]] = []
+    specialties: List[str] = []
+    history: str = ""
+    owner_info: Dict[str, Any] = {}
+    
+    @field_validator("description", "history", mode="before")
+    @classmethod
+    def _join_text(cls, value):
+        if value is None:
+            return ""
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            return " ".join(value)
+        return value
+    
+    @field_validator("services", "images", "specialties", mode="before")
+    @classmethod
+    def _string_list(cls, value):
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [value] if value.strip() else []
+        if isinstance(value, list):
+            return [
+                item.get("name") or item.get("description") if isinstance(item, dict) else item
+                for item in value if item is not None
+            ]
+        return value
+    
+    @field_validator("hours", mode="before")
+    @classmethod
+    def _hours(cls, value):
+        if value is None:
+            return {}
+        if isinstance(value, str):
+            value = [line for line in value.splitlines() if line.strip()]
+        if isinstance(value, list) and all(isinstance(line, str) and ":" in line for line in value):
+            return {day.strip(): hours.strip() for day, hours in (line.split(":", 1) for line in value)}
+        if isinstance(value, dict):
+            return {day: str(hours) for day, hours in value.items() if hours is not None}
+        return value
+    
+    @field_validator("social_media", mode="before")
+    @classmethod
+    def _social_links(cls, value):
+        if value is None:
+            return {}
+        if isinstance(value, list) and all(isinstance(url, str) for url in value):
+            # ["https://facebook.com/x"] -> {"facebook": "https://facebook.com/x"}
+            return {
+                (urlparse(url if "//" in url else "//" + url).hostname or url).removeprefix("www.").split(".")[0]: url
+                for url in value
+            }
+        if isinstance(value, dict):
+            return {platform: link for platform, link in value.items() if link}
+        return value
+    
+    @field_validator("reviews", "menu_items", mode="before")
+    @classmethod
+    def _object_list(cls, value, info):
+        if value is None:
+            return []
+        if isinstance(value, list):
+            key = "text" if info.field_name == "reviews" else "name"
+            return [{key: item} if isinstance(item, str) else item for item in value]
+        return value
+    
+    @field_validator("owner_info", mode="before")
+    @classmethod
+    def _owner(cls, value):
+        if value is None:
+            return {}
+        if isinstance(value, str):
+            return {"summary": value} if value.strip() else {}
+        return value
+    
+    @classmethod
+    def validate_fields(cls, data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Validate each field on its own
+        
+        Returns every field (valid values, defaults elsewhere) and an error
+        message per field that was missing or could not be repaired.
+        """
+        clean = cls().model_dump()
+        errors = {}
+        for name in cls.model_fields:
+            if name not in data:
+                errors[name] = "missing"
+                continue
+            try:
+                clean[name] = getattr(cls.model_validate({name: data[name]}), name)
+            except ValidationError as e:
+                errors[name] = e.errors()[0]["msg"]
+        return clean, errors
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from pydantic import BaseModel, Field
+from typing import Dict, Any, List, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -29,8 +29,28 @@ class WebsiteResponse(BaseModel):
     published_at: Optional[datetime]
     preview_url: Optional[str]
     production_url: Optional[str]
+    fingerprint: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class BatchWebsiteCreate(BaseModel):
+    business_ids: List[UUID] = Field(..., min_length=1, max_length=200)
+    template_id: UUID
+    settings: Optional[Dict[str, Any]] = None
+
+
+class BatchWebsiteItem(BaseModel):
+    business_id: UUID
+    # completed, unchanged, failed, in_progress or not_found
+    status: str
+    website_id: Optional[UUID] = None
+    preview_url: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchWebsiteResponse(BaseModel):
+    items: List[BatchWebsiteItem]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Batch website generation throughput with 1 to N rendering processes.
+
+Each row renders and writes the same synthetic sites (cycling through every
+template) into a temporary directory through render_sites, the path used by
+WebsiteGenerator.generate_batch, minus the database. "in-process" renders on
+the event loop's thread, which is what a single background task used to do.
+Pool start-up is excluded; each pool renders one warm-up site per process.
+Every run forces a full render, since the sites are unchanged after the first.
+
+Usage: python scripts/benchmark_generation_pool.py [--sites 400] [--max-workers 8]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import sys
+import os
+import tempfile
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.template_manager import TemplateManager
+from services.website_generator import render_sites
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+class InlineExecutor(Executor):
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+def payload(i: int) -> dict:
+    return {
+        "business": {"name": f"Business {i}", "address": f"{i} Main St, Springfield", "phone": "(555) 010-0000"},
+        "description": "Family business known for friendly service. " * 6,
+        "services": [f"Service {n}" for n in range(8)],
+        "hours": {day: "9:00 AM - 5:00 PM" for day in DAYS},
+        "reviews": [{"author": f"Customer {n}", "text": "Great experience. " * 10} for n in range(5)],
+    }
+
+
+def sizes(max_workers: int):
+    workers = 1
+    while workers < max_workers:
+        yield workers
+        workers *= 2
+    yield max_workers
+
+
+async def run(executor: Executor, tasks, output_base: str, warmup: int) -> float:
+    await render_sites(tasks[:warmup], executor, output_base, force=True)
+    started = time.perf_counter()
+    results = await render_sites(tasks, executor, output_base, force=True)
+    elapsed = time.perf_counter() - started
+    failed = [result for result in results.values() if not result.get("success")]
+    if failed:
+        raise RuntimeError(f"{len(failed)} sites failed: {failed[0]}")
+    return elapsed
+
+
+async def main(args):
+    names = list(TemplateManager().templates)
+    tasks = [(f"site-{i}", names[i % len(names)], payload(i), {}) for i in range(args.sites)]
+    context = multiprocessing.get_context("spawn")
+
+    print(f"{args.sites} sites, {os.cpu_count()} CPUs")
+    print(f"{'workers':<12}{'seconds':>9}{'sites/s':>9}{'speedup':>9}")
+    with tempfile.TemporaryDirectory() as output_base:
+        baseline = await run(InlineExecutor(), tasks, output_base, 1)
+        print(f"{'in-process':<12}{baseline:>9.2f}{args.sites / baseline:>9.0f}{1:>9.1f}")
+        for workers in sizes(args.max_workers):
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                elapsed = await run(executor, tasks, output_base, workers)
+            print(f"{workers:<12}{elapsed:>9.2f}{args.sites / elapsed:>9.0f}{baseline / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batch website generation")
+    parser.add_argument("--sites", type=int, default=400)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark Place Details fetching against a fake Google Maps client.
+
+Compares sequential fetching (concurrency 1, the old behaviour) with the
+bounded-concurrency fetcher for 20/60/200 results. The page token delay is
+disabled so only details round trips are measured.
+
+Usage: python scripts/benchmark_places_details.py [--latency 0.1] [--concurrency 10]
+"""
+import argparse
+import asyncio
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.google_places import GooglePlacesService
+from services.place_cache import PlaceDetailsCache
+from services.kv_backend import MemoryBackend
+from services.geocoding import GeocodeCache
+
+
+class FakePlacesClient:
+    """Stand-in for googlemaps.Client with a fixed per-request latency."""
+    
+    def __init__(self, total_places: int, latency: float):
+        self.total_places = total_places
+        self.latency = latency
+    
+    def places_nearby(self, page_token=None, **kwargs):
+        time.sleep(self.latency)
+        start = int(page_token) if page_token else 0
+        end = min(start + 20, self.total_places)
+        results = [
+            {'place_id': f'place_{i}', 'types': ['restaurant', 'food']}
+            for i in range(start, end)
+        ]
+        response = {'results': results}
+        if end < self.total_places:
+            response['next_page_token'] = str(end)
+        return response
+    
+    def place(self, place_id, fields=None):
+        time.sleep(self.latency)
+        return {'result': {
+            'name': f'Business {place_id}',
+            'formatted_address': '123 Main St',
+            'geometry': {'location': {'lat': 34.0, 'lng': -81.0}},
+            'business_status': 'OPERATIONAL',
+        }}
+
+
+async def run_search(max_results: int, latency: float, concurrency: int) -> float:
+    # A fresh cache per run so every details lookup is a miss
+    service = GooglePlacesService(
+        client=FakePlacesClient(max_results, latency),
+        details_cache=PlaceDetailsCache(MemoryBackend()),
+        geocode_cache=GeocodeCache(":memory:")
+    )
+    service.details_concurrency = concurrency
+    service.PAGE_TOKEN_DELAY = 0
+    
+    started = time.perf_counter()
+    results = await service._search_tiled((34.0, -81.0), 1200, 'restaurant', max_results)
+    elapsed = time.perf_counter() - started
+    
+    assert len(results) == max_results, f"expected {max_results}, got {len(results)}"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.1, help='Fake API latency in seconds')
+    parser.add_argument('--concurrency', type=int, default=10, help='Details fan-out for the "after" run')
+    args = parser.parse_args()
+    
+    print(f"Fake API latency: {args.latency * 1000:.0f} ms, concurrency: {args.concurrency}")
+    print(f"{'results':>8} {'before (s)':>12} {'after (s)':>12} {'speedup':>9}")
+    
+    for max_results in (20, 60, 200):
+        before = asyncio.run(run_search(max_results, args.latency, 1))
+        after = asyncio.run(run_search(max_results, args.latency, args.concurrency))
+        print(f"{max_results:>8} {before:>12.2f} {after:>12.2f} {before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Throughput and cost report for single vs batch business research.
+
+Builds the real single and batch prompts for synthetic businesses and sends
+them to a fake Anthropic client that charges ~4 characters per input token
+and takes a fixed per-call latency plus time per output token. Replies go
+through the real parsers and ResearchPayload validation (``_validate``), so
+batch items lost to truncation show up as "missing".
+
+Usage: python scripts/benchmark_research_batch.py [--businesses 100] [--batch-size 5]
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+import os
+import time
+from types import SimpleNamespace
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.research_agent import ResearchAgent, RESEARCH_SYSTEM_PROMPT, BATCH_SYSTEM_PROMPT
+from core.config import settings
+from models import Business, WebsiteStatus
+from services.json_stream import JSONObjectStream
+
+# Sonnet list prices, USD per million tokens
+INPUT_PRICE = 3.0
+OUTPUT_PRICE = 15.0
+
+SAMPLE_RESEARCH = {
+    "description": "A family-run neighborhood spot known for friendly service and fresh, local ingredients.",
+    "services": ["Dine-in", "Takeout", "Catering"],
+    "hours": {day: "9am-9pm" for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]},
+    "reviews": [{"author": "Sam", "rating": 5, "text": "Great food and even better people."}],
+    "social_media": {"facebook": "https://facebook.com/example"},
+    "images": ["Storefront at golden hour", "Signature dish close-up"],
+    "menu_items": [{"name": "House special", "price": "$12"}],
+    "specialties": ["Homemade recipes"],
+    "history": "Opened in 1998 by two siblings.",
+    "owner_info": {},
+}
+
+
+class FakeClient:
+    def __init__(self, call_latency: float, seconds_per_token: float):
+        self.call_latency = call_latency
+        self.seconds_per_token = seconds_per_token
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.messages = self
+
+    async def create(self, model, max_tokens, system, messages):
+        prompt = "".join(block["text"] for block in system) + "\n\n" + messages[0]["content"]
+        refs = [int(ref) for ref in re.findall(r"^\[(\d+)\]", prompt, re.MULTILINE)]
+        if refs:
+            text = json.dumps([{"ref": ref, **SAMPLE_RESEARCH} for ref in refs], indent=2)
+        else:
+            text = json.dumps(SAMPLE_RESEARCH, indent=2)
+
+        output_tokens = len(text) // 4
+        if output_tokens > max_tokens:
+            text, output_tokens = text[:max_tokens * 4], max_tokens
+
+        self.calls += 1
+        self.input_tokens += len(prompt) // 4
+        self.output_tokens += output_tokens
+        await asyncio.sleep(self.call_latency + output_tokens * self.seconds_per_token)
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+def make_businesses(count: int):
+    return [
+        Business(
+            id=f"business-{i}",
+            name=f"Local Business {i}",
+            address=f"{100 + i} Main St, Springfield, IL 62701",
+            phone="(555) 010-0000",
+            website=None,
+            website_status=WebsiteStatus.NO_WEBSITE,
+            google_maps_url=f"https://maps.google.com/?cid={i}",
+        )
+        for i in range(count)
+    ]
+
+
+async def run_single(agent, client, businesses, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def research(business):
+        async with semaphore:
+            response = await client.create(
+                model="fake", max_tokens=4000,
+                system=agent._system_blocks(RESEARCH_SYSTEM_PROMPT),
+                messages=[{"role": "user", "content": agent._create_research_prompt(business)}]
+            )
+            parser = JSONObjectStream()
+            parser.feed(response.content[0].text)
+            # Valid replies never reach the repair request, which needs a database
+            await agent._validate(None, business, None, parser.fields)
+            return 1
+
+    return sum(await asyncio.gather(*(research(business) for business in businesses)))
+
+
+async def run_batch(agent, client, businesses, concurrency, batch_size):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def research(chunk):
+        async with semaphore:
+            response = await client.create(
+                model="fake", max_tokens=settings.research_batch_max_tokens,
+                system=agent._system_blocks(BATCH_SYSTEM_PROMPT),
+                messages=[{"role": "user", "content": agent._create_batch_prompt(chunk)}]
+            )
+            completed = 0
+            for item in agent._parse_batch_response(response.content[0].text):
+                await agent._validate(None, chunk[int(item.pop("ref")) - 1], None, item)
+                completed += 1
+            return completed
+
+    chunks = [businesses[i:i + batch_size] for i in range(0, len(businesses), batch_size)]
+    return sum(await asyncio.gather(*(research(chunk) for chunk in chunks)))
+
+
+async def measure(label, coroutine, client, total):
+    start = time.perf_counter()
+    completed = await coroutine
+    elapsed = time.perf_counter() - start
+    cost = (client.input_tokens * INPUT_PRICE + client.output_tokens * OUTPUT_PRICE) / 1_000_000
+    print(f"{label:<8} calls={client.calls:<5} completed={completed}/{total:<6} "
+          f"in_tokens={client.input_tokens:<8} out_tokens={client.output_tokens:<8} "
+          f"cost=${cost:.4f}  time={elapsed:.2f}s  ({total / elapsed:.1f} businesses/s)")
+    return elapsed, cost
+
+
+async def main(args):
+    agent = ResearchAgent()
+    businesses = make_businesses(args.businesses)
+
+    single = FakeClient(args.call_latency, args.token_latency)
+    single_time, single_cost = await measure(
+        "single", run_single(agent, single, businesses, args.concurrency), single, len(businesses)
+    )
+
+    batch = FakeClient(args.call_latency, args.token_latency)
+    batch_time, batch_cost = await measure(
+        "batch", run_batch(agent, batch, businesses, args.concurrency, args.batch_size), batch, len(businesses)
+    )
+
+    print(f"batch vs single: {single_time / batch_time:.1f}x faster, {single_cost / batch_cost:.1f}x cheaper")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare single and batch research")
+    parser.add_argument("--businesses", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=settings.research_batch_size)
+    parser.add_argument("--concurrency", type=int, default=settings.research_concurrency)
+    parser.add_argument("--call-latency", type=float, default=0.05,
+                        help="fixed seconds per call (scaled down from ~1-2s real)")
+    parser.add_argument("--token-latency", type=float, default=0.0002,
+                        help="seconds per output token (scaled down)")
+    asyncio.run(main(parser.parse_args()))
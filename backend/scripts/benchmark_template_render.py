@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Render throughput and allocations for every template and several payload sizes.
+
+"compiled" is the normal render path: the page is compiled once and each render
+fills its slots. "recompile" compiles the page again on every render, which is
+what the f-string templates used to cost (CSS and markup rebuilt per call).
+Allocation figures are the peak traced memory of a single render. Page sizes
+are shown with the CSS/JS inlined and as generated sites store them, linking
+the shared assets.
+
+Usage: python scripts/benchmark_template_render.py [--renders 2000]
+"""
+import argparse
+import sys
+import os
+import time
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.template_manager import SHARED_ASSETS_URL, TemplateManager
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+PAYLOADS = {
+    "small": {"business": {"name": "Corner Shop"}},
+    "medium": {
+        "business": {"name": "Rosa's Bakery & Cafe", "address": "12 Main St, Springfield", "phone": "(555) 010-0000"},
+        "description": "Family bakery known for sourdough and seasonal pies.",
+        "services": ["Bread", "Pastries", "Catering"],
+        "hours": {day: "7:00 AM - 3:00 PM" for day in DAYS[:5]},
+    },
+    "large": {
+        "business": {"name": "Rosa's Bakery & Cafe", "address": "12 Main St, Springfield", "phone": "(555) 010-0000"},
+        "description": "Family bakery known for sourdough and seasonal pies. " * 8,
+        "services": [f"Service <{i}>" for i in range(12)],
+        "hours": {day: "7:00 AM - 3:00 PM" for day in DAYS},
+        "reviews": [{"author": f"Customer {i}", "text": "Wonderful \"bread\" & coffee. " * 10} for i in range(6)],
+    },
+}
+
+
+def recompile_render(template, payload):
+    return template.compile().render(template.get_context(payload))
+
+
+def throughput(render, template, payload, renders):
+    start = time.perf_counter()
+    for _ in range(renders):
+        render(template, payload)
+    return renders / (time.perf_counter() - start)
+
+
+def peak_allocation(render, template, payload):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    render(template, payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - before
+
+
+def main(args):
+    manager = TemplateManager()
+    paths = {
+        "compiled": lambda template, payload: template.render(payload),
+        "recompile": recompile_render,
+    }
+
+    print(f"{'template':<10}{'payload':<9}{'path':<11}{'renders/s':>11}{'peak KiB':>10}{'inline KiB':>12}{'linked KiB':>12}")
+    for key, template in manager.templates.items():
+        template.render(PAYLOADS["small"])  # compile outside the timings
+        for payload_name, payload in PAYLOADS.items():
+            inline = len(template.render(payload).encode()) / 1024
+            linked = len(template.render(payload, asset_url=SHARED_ASSETS_URL).encode()) / 1024
+            rates = {}
+            for path, render in paths.items():
+                rates[path] = throughput(render, template, payload, args.renders)
+                peak = peak_allocation(render, template, payload) / 1024
+                print(f"{key:<10}{payload_name:<9}{path:<11}{rates[path]:>11.0f}{peak:>10.1f}{inline:>12.1f}{linked:>12.1f}")
+            print(f"{'':<19}compiled is {rates['compiled'] / rates['recompile']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark template rendering")
+    parser.add_argument("--renders", type=int, default=2000)
+    main(parser.parse_args())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Generate websites for many businesses at once, rendering across a process pool.
+
+Without business ids, every business with completed research and no site for
+the template yet is generated. Prints one status line per business.
+
+--regenerate re-renders every existing site instead (only those built from
+--template when given). Sites whose content and template version are unchanged
+are skipped, so after a template tweak only that template's sites are touched;
+--force renders them all anyway.
+
+Usage: python scripts/generate_websites.py [BUSINESS_ID ...] [--template ID] [--workers 8]
+       python scripts/generate_websites.py --regenerate [--template ID] [--force]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from models.database import SessionLocal
+from models import Business, BusinessResearch, GeneratedWebsite, ResearchStatus
+from services.pipeline import default_template_id
+from services.website_generator import WebsiteGenerator, get_or_create_websites, shutdown_generation_pool
+
+
+def pending_businesses(db, template_id) -> list:
+    generated = db.query(GeneratedWebsite.business_id).filter(
+        GeneratedWebsite.template_id == template_id,
+        GeneratedWebsite.preview_url.isnot(None)
+    )
+    return [
+        business_id for (business_id,) in
+        db.query(Business.id)
+        .join(BusinessResearch, BusinessResearch.business_id == Business.id)
+        .filter(BusinessResearch.status == ResearchStatus.COMPLETED, Business.id.notin_(generated))
+    ]
+
+
+async def regenerate(args):
+    with SessionLocal() as db:
+        query = db.query(GeneratedWebsite.id).filter(GeneratedWebsite.preview_url.isnot(None))
+        if args.template:
+            query = query.filter(GeneratedWebsite.template_id == args.template)
+        website_ids = [website_id for (website_id,) in query]
+
+    started = time.perf_counter()
+    try:
+        results = await WebsiteGenerator().generate_batch(website_ids, force=args.force)
+    finally:
+        shutdown_generation_pool()
+    elapsed = time.perf_counter() - started
+
+    for website_id in website_ids:
+        result = results[website_id]
+        print(f"{website_id}  {result['status']:<10}{result.get('error') or ''}")
+    counts = {}
+    for result in results.values():
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"\n{len(website_ids)} sites in {elapsed:.1f}s: {summary or 'nothing to do'}")
+
+
+async def main(args):
+    if args.regenerate:
+        return await regenerate(args)
+    with SessionLocal() as db:
+        template_id = args.template or default_template_id(db)
+        if not template_id:
+            sys.exit("no active template; run scripts/seed_templates.py first")
+        business_ids = args.business_ids or pending_businesses(db, template_id)
+        found = {
+            business_id for (business_id,) in
+            db.query(Business.id).filter(Business.id.in_(business_ids))
+        }
+        website_ids = get_or_create_websites(db, [b for b in business_ids if b in found], template_id)
+
+    started = time.perf_counter()
+    try:
+        results = await WebsiteGenerator().generate_batch(website_ids.values(), force=args.force)
+    finally:
+        shutdown_generation_pool()
+    elapsed = time.perf_counter() - started
+
+    for business_id in business_ids:
+        if business_id not in website_ids:
+            print(f"{business_id}  not_found")
+            continue
+        result = results[website_ids[business_id]]
+        print(f"{business_id}  {result['status']:<10}{result.get('preview_url') or result.get('error') or ''}")
+    completed = sum(result["status"] == "completed" for result in results.values())
+    rate = completed / elapsed if elapsed else 0
+    print(f"\n{completed} of {len(business_ids)} generated in {elapsed:.1f}s ({rate:.1f} sites/s)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Generate websites in bulk")
+    parser.add_argument("business_ids", nargs="*", help="defaults to researched businesses without a site")
+    parser.add_argument("--template", help="template id; defaults to the first active template")
+    parser.add_argument("--regenerate", action="store_true", help="re-render existing sites whose inputs changed")
+    parser.add_argument("--force", action="store_true", help="render even when inputs are unchanged")
+    parser.add_argument("--workers", type=int, help="rendering processes; defaults to GENERATION_WORKERS or one per CPU")
+    args = parser.parse_args()
+    if args.workers:
+        settings.generation_workers = args.workers
+    asyncio.run(main(args))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Run the discovery -> research -> generation pipeline for an area in this process.
+
+Prints per-stage counts and timings when done. An interrupted run can be
+continued with --resume; businesses already researched or generated are skipped.
+
+Usage: python scripts/run_pipeline.py "Springfield, IL" [--radius 2] [--types cafe bakery]
+       python scripts/run_pipeline.py --resume RUN_ID
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config import settings
+from models.database import SessionLocal
+from models import PipelineRun
+from schemas.pipeline import PipelineRequest
+from services.pipeline import Pipeline, default_template_id
+
+
+def create_run(args) -> str:
+    spec = PipelineRequest(
+        location=args.location,
+        radius_miles=args.radius,
+        business_types=args.types,
+        max_results=args.max_results,
+        force_refresh=args.force_refresh,
+        research_concurrency=args.research_concurrency,
+        generation_concurrency=args.generation_concurrency,
+    )
+    with SessionLocal() as db:
+        run = PipelineRun(
+            spec=spec.model_dump(mode="json", exclude={"template_id"}),
+            template_id=args.template or default_template_id(db)
+        )
+        db.add(run)
+        db.commit()
+        return run.id
+
+
+def report(run_id: str, stats):
+    print(f"\npipeline run {run_id}")
+    print(f"{'stage':<12}{'done':>6}{'skipped':>9}{'failed':>8}{'busy s':>9}{'blocked s':>11}{'first':>8}{'last':>8}")
+    for name, stage in stats["stages"].items():
+        print(
+            f"{name:<12}{stage['completed']:>6}{stage['skipped']:>9}{stage['failed']:>8}"
+            f"{stage['busy_seconds']:>9.1f}{stage['blocked_seconds']:>11.1f}"
+            f"{stage['first_at'] or 0:>8.1f}{stage['last_at'] or 0:>8.1f}"
+        )
+    elapsed = stats["elapsed_seconds"]
+    speedup = stats["serial_seconds"] / elapsed if elapsed else 0
+    print(f"elapsed {elapsed:.1f}s vs {stats['serial_seconds']:.1f}s of stage work run serially ({speedup:.1f}x)")
+
+
+async def main(args):
+    run_id = args.resume or create_run(args)
+    stats = await Pipeline(run_id).run()
+    report(run_id, stats)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Search, research and generate sites for an area")
+    parser.add_argument("location", nargs="?", help="address or coordinates to search around")
+    parser.add_argument("--radius", type=float, default=5.0, help="search radius in miles")
+    parser.add_argument("--types", nargs="*", help="business types to search for")
+    parser.add_argument("--max-results", type=int, default=60)
+    parser.add_argument("--template", help="template id; defaults to the first active template")
+    parser.add_argument("--force-refresh", action="store_true", help="redo research and generation")
+    parser.add_argument("--research-concurrency", type=int, default=settings.pipeline_research_concurrency)
+    parser.add_argument("--generation-concurrency", type=int, default=settings.pipeline_generation_concurrency)
+    parser.add_argument("--resume", metavar="RUN_ID", help="continue an earlier run")
+    args = parser.parse_args()
+    if not args.location and not args.resume:
+        parser.error("a location or --resume RUN_ID is required")
+    asyncio.run(main(args))
@@ -0,0 +1,154 @@
+"""
+Business Store - batched persistence and spatial lookups for discovered businesses
+"""
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+import uuid
+import logging
+
+from sqlalchemy import select, and_, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import Business, WebsiteStatus
+from services import geohash
+from services.geo_tiling import haversine_meters, offset
+
+logger = logging.getLogger(__name__)
+
+# Columns refreshed on businesses we have already stored
+REFRESHED_COLUMNS = ("last_checked", "website", "website_status")
+
+_UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def upsert_businesses(db: Session, places_data: List[Dict[str, Any]]) -> List[Business]:
+    """
+    Insert new businesses and refresh existing ones in a single statement
+
+    Uses ``INSERT ... ON CONFLICT (google_place_id) DO UPDATE ... RETURNING``
+    on PostgreSQL and SQLite; other databases fall back to one ``IN`` lookup
+    plus a batched insert. Returns the stored rows in the order of
+    ``places_data``. The caller owns the transaction.
+    """
+    rows = _to_rows(places_data)
+    if not rows:
+        return []
+
+    insert = _UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+    if insert:
+        stmt = insert(Business).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Business.google_place_id],
+            set_={column: stmt.excluded[column] for column in REFRESHED_COLUMNS}
+        )
+        businesses = db.scalars(
+            stmt.returning(Business),
+            execution_options={"populate_existing": True}
+        ).all()
+    else:
+        businesses = _upsert_fallback(db, rows)
+
+    by_place_id = {business.google_place_id: business for business in businesses}
+    return [by_place_id[row["google_place_id"]] for row in rows]
+
+
+def _to_rows(places_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # A place can appear twice in one search; ON CONFLICT cannot touch a row twice
+    now = datetime.utcnow()
+    rows = {}
+    for business_data in places_data:
+        rows.setdefault(business_data['place_id'], {
+            "id": str(uuid.uuid4()),
+            "google_place_id": business_data['place_id'],
+            "name": business_data['name'],
+            "address": business_data['address'],
+            "latitude": business_data['latitude'],
+            "longitude": business_data['longitude'],
+            "geohash": geohash.encode(business_data['latitude'], business_data['longitude']),
+            "phone": business_data.get('phone'),
+            "website": business_data.get('website'),
+            "website_status": business_data['website_status'],
+            "google_maps_url": business_data.get('google_maps_url'),
+            "business_type": business_data.get('business_type'),
+            "discovered_at": now,
+            "last_checked": now,
+        })
+    return list(rows.values())
+
+
+def _upsert_fallback(db: Session, rows: List[Dict[str, Any]]) -> List[Business]:
+    existing = {
+        business.google_place_id: business
+        for business in db.scalars(
+            select(Business).where(Business.google_place_id.in_([row["google_place_id"] for row in rows]))
+        )
+    }
+
+    businesses = []
+    for row in rows:
+        business = existing.get(row["google_place_id"])
+        if business:
+            for column in REFRESHED_COLUMNS:
+                setattr(business, column, row[column])
+        else:
+            business = Business(**row)
+            db.add(business)
+        businesses.append(business)
+
+    db.flush()
+    return businesses
+
+
+def find_businesses_in_bbox(
+    db: Session,
+    min_lat: float,
+    min_lng: float,
+    max_lat: float,
+    max_lng: float,
+    website_status: Optional[WebsiteStatus] = None,
+    limit: Optional[int] = None
+) -> List[Business]:
+    """Stored businesses inside a bounding box, found via geohash prefix ranges"""
+    # Each prefix becomes an index range scan: prefix <= geohash < next prefix
+    prefix_ranges = []
+    for prefix in geohash.cover(min_lat, min_lng, max_lat, max_lng):
+        upper = geohash.prefix_upper_bound(prefix)
+        prefix_ranges.append(
+            and_(Business.geohash >= prefix, Business.geohash < upper) if upper else Business.geohash >= prefix
+        )
+    query = db.query(Business).filter(
+        or_(*prefix_ranges),
+        Business.latitude.between(min_lat, max_lat),
+        Business.longitude.between(min_lng, max_lng)
+    )
+    if website_status:
+        query = query.filter(Business.website_status == website_status)
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
+
+def find_businesses_near(
+    db: Session,
+    lat: float,
+    lng: float,
+    radius_meters: float,
+    website_status: Optional[WebsiteStatus] = None,
+    limit: Optional[int] = None
+) -> List[Business]:
+    """Stored businesses within a radius, nearest first"""
+    south, west = offset((lat, lng), -radius_meters, -radius_meters)
+    north, east = offset((lat, lng), radius_meters, radius_meters)
+    candidates = find_businesses_in_bbox(db, south, west, north, east, website_status)
+
+    distances = [
+        (haversine_meters((lat, lng), (business.latitude, business.longitude)), business)
+        for business in candidates
+    ]
+    nearby = [business for distance, business in sorted(distances, key=lambda d: d[0])
+              if distance <= radius_meters]
+    return nearby[:limit] if limit else nearby
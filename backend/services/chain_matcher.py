@@ -0,0 +1,86 @@
+"""
+Chain Matcher - recognizes chain businesses by name with one compiled regex
+"""
+from pathlib import Path
+from typing import List, Optional
+import logging
+import re
+import threading
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Never matches anything; used when the chain list is empty
+_NO_MATCH = re.compile(r"(?!x)x")
+
+
+class ChainMatcher:
+    """
+    Word-boundary aware multi-pattern matcher built from a chain list file
+
+    All names are folded into a single alternation so a business name is
+    scanned once, whatever the size of the list. The pattern is rebuilt when
+    the file changes on disk, or on demand with ``reload()``.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.names: List[str] = []
+        self._pattern = _NO_MATCH
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """Re-read the chain list and recompile the pattern"""
+        with self._lock:
+            try:
+                mtime = self.path.stat().st_mtime
+                lines = self.path.read_text(encoding="utf-8").splitlines()
+            except OSError as e:
+                logger.error(f"Could not read chain list {self.path}: {e}")
+                return
+
+            names = []
+            for line in lines:
+                name = self._normalize(line.split("#", 1)[0])
+                if name and name not in names:
+                    names.append(name)
+
+            self.names = names
+            self._pattern = self.compile(names)
+            self._mtime = mtime
+            logger.info(f"Loaded {len(names)} chain names from {self.path}")
+
+    def reload_if_changed(self):
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.reload()
+
+    def match(self, business_name: str) -> Optional[str]:
+        """Return the matched chain text, or None for a local business"""
+        found = self._pattern.search(self._normalize(business_name))
+        return found.group(0) if found else None
+
+    @staticmethod
+    def compile(names: List[str]) -> "re.Pattern":
+        if not names:
+            return _NO_MATCH
+        # Longest first so the reported match is the most specific name
+        alternatives = [
+            re.escape(name).replace(r"\ ", r"\s+")
+            for name in sorted(names, key=len, reverse=True)
+        ]
+        # A trailing possessive or plural is allowed: "wendy" -> "Wendy's"
+        return re.compile(r"(?<!\w)(?:" + "|".join(alternatives) + r")(?:'s|s)?(?!\w)")
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        return name.strip().lower().replace("’", "'")
+
+
+chain_matcher = ChainMatcher(settings.chain_list_path)
@@ -0,0 +1,69 @@
+"""
+Geo Tiling - quadtree tiles for covering a search radius with Nearby Search
+"""
+from dataclasses import dataclass
+from typing import List, Tuple
+import math
+
+EARTH_RADIUS_METERS = 6371000
+
+# Nearby Search returns at most 3 pages of 20 results
+NEARBY_RESULT_CAP = 60
+
+
+def haversine_meters(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """Great-circle distance between two (lat, lng) points"""
+    lat1, lng1 = map(math.radians, a)
+    lat2, lng2 = map(math.radians, b)
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(h))
+
+
+def offset(origin: Tuple[float, float], north_m: float, east_m: float) -> Tuple[float, float]:
+    """Move a point by a small distance in meters (equirectangular approximation)"""
+    lat, lng = origin
+    dlat = math.degrees(north_m / EARTH_RADIUS_METERS)
+    dlng = math.degrees(east_m / (EARTH_RADIUS_METERS * math.cos(math.radians(lat))))
+    return lat + dlat, lng + dlng
+
+
+@dataclass(frozen=True)
+class Tile:
+    """A square tile of side ``2 * half_side`` meters centered on ``center``"""
+    center: Tuple[float, float]
+    half_side: float
+    depth: int = 0
+
+    @property
+    def radius(self) -> int:
+        """Radius of the circle that circumscribes the tile, used for the Nearby query"""
+        return math.ceil(self.half_side * math.sqrt(2))
+
+    def subdivide(self) -> List["Tile"]:
+        quarter = self.half_side / 2
+        return [
+            Tile(offset(self.center, north, east), quarter, self.depth + 1)
+            for north in (quarter, -quarter)
+            for east in (-quarter, quarter)
+        ]
+
+    def intersects(self, center: Tuple[float, float], radius_meters: float) -> bool:
+        """Whether any part of the tile lies inside the search circle"""
+        # Project the search center into the tile's local frame and clamp to the square
+        north = (center[0] - self.center[0]) * math.pi / 180 * EARTH_RADIUS_METERS
+        east = ((center[1] - self.center[1]) * math.pi / 180
+                * EARTH_RADIUS_METERS * math.cos(math.radians(self.center[0])))
+        nearest_north = max(-self.half_side, min(self.half_side, north))
+        nearest_east = max(-self.half_side, min(self.half_side, east))
+        return math.hypot(north - nearest_north, east - nearest_east) <= radius_meters
+
+
+def root_tile(center: Tuple[float, float], radius_meters: float) -> Tile:
+    """Smallest square tile that covers the search circle"""
+    return Tile(center, radius_meters)
+
+
+def child_tiles(tile: Tile, center: Tuple[float, float], radius_meters: float) -> List[Tile]:
+    """Children of a saturated tile that still overlap the search circle"""
+    return [child for child in tile.subdivide() if child.intersects(center, radius_meters)]
@@ -0,0 +1,124 @@
+"""
+Geocoding helpers - coordinate parsing and a persistent geocode cache
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+import functools
+import logging
+import re
+import sqlite3
+import threading
+import time
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Tuple[float, float]
+
+# "lat,lng" with optional signs, decimals and whitespace, e.g. "34.0, -81.03"
+_COORDINATES_RE = re.compile(
+    r"^\s*([+-]?\d{1,3}(?:\.\d+)?)\s*,\s*([+-]?\d{1,3}(?:\.\d+)?)\s*$"
+)
+_WHITESPACE_RE = re.compile(r"\s+")
+_COMMA_RE = re.compile(r"\s*,\s*")
+
+
+def parse_coordinates(location: str) -> Optional[Coordinates]:
+    """Parse a "lat,lng" string, returning None if it is not valid coordinates"""
+    match = _COORDINATES_RE.match(location)
+    if not match:
+        return None
+
+    lat, lng = float(match.group(1)), float(match.group(2))
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return lat, lng
+
+
+def normalize_location(location: str) -> str:
+    """Cache key for a free-text location: case, spacing and trailing punctuation ignored"""
+    key = _WHITESPACE_RE.sub(" ", location.strip().lower())
+    return _COMMA_RE.sub(", ", key).strip(" ,.")
+
+
+class GeocodeCache:
+    """
+    LRU cache of geocoded locations backed by SQLite
+
+    Lookups are served from an in-memory LRU; every result is also written to
+    SQLite so the cache survives restarts. Use ``":memory:"`` for tests.
+    """
+
+    def __init__(self, path: str, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Coordinates]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS geocode "
+            "(key TEXT PRIMARY KEY, lat REAL NOT NULL, lng REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+        # Warm the LRU with the most recently used entries
+        rows = self._db.execute(
+            "SELECT key, lat, lng FROM geocode ORDER BY updated_at DESC LIMIT ?",
+            (max_entries,)
+        ).fetchall()
+        for key, lat, lng in reversed(rows):
+            self._entries[key] = (lat, lng)
+
+    def get(self, location: str) -> Optional[Coordinates]:
+        key = normalize_location(location)
+        with self._lock:
+            coords = self._entries.get(key)
+            if coords is None:
+                row = self._db.execute(
+                    "SELECT lat, lng FROM geocode WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    coords = (row[0], row[1])
+                    self._remember(key, coords)
+            else:
+                self._entries.move_to_end(key)
+
+            if coords is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return coords
+
+    def set(self, location: str, coords: Coordinates):
+        key = normalize_location(location)
+        with self._lock:
+            self._remember(key, coords)
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO geocode (key, lat, lng, updated_at) VALUES (?, ?, ?, ?)",
+                    (key, coords[0], coords[1], time.time())
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist geocode for '{key}': {e}")
+
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _remember(self, key: str, coords: Coordinates):
+        self._entries[key] = coords
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+@functools.cache
+def get_geocode_cache() -> GeocodeCache:
+    """Return the process-wide geocode cache"""
+    return GeocodeCache(settings.geocode_cache_path, settings.geocode_cache_size)
@@ -0,0 +1,89 @@
+"""
+Geohash - encode coordinates and cover bounding boxes with geohash prefixes
+
+Stored businesses carry a geohash so spatial lookups become a handful of
+B-tree range scans that work the same on PostgreSQL and SQLite.
+"""
+from typing import List, Optional, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 9  # ~5m cells, plenty for storefronts
+
+# Upper bound on prefix ranges per query; more ranges mean a tighter cover
+MAX_COVER_CELLS = 32
+
+
+def encode(lat: float, lng: float, precision: int = PRECISION) -> str:
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, bit_count, even = 0, 0, True
+
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits, bit_count = 0, 0
+
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(lat height, lng width) in degrees of a geohash cell"""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = (5 * precision) // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def cover(min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> List[str]:
+    """Geohash prefixes whose cells together cover the bounding box"""
+    precision = 1
+    for candidate in range(PRECISION, 0, -1):
+        height, width = cell_size(candidate)
+        rows = int((max_lat - min_lat) / height) + 2
+        cols = int((max_lng - min_lng) / width) + 2
+        if rows * cols <= MAX_COVER_CELLS:
+            precision = candidate
+            break
+
+    height, width = cell_size(precision)
+    prefixes = set()
+    lat = min_lat
+    while True:
+        lng = min_lng
+        while True:
+            prefixes.add(encode(lat, lng, precision))
+            if lng >= max_lng:
+                break
+            lng = min(lng + width, max_lng)
+        if lat >= max_lat:
+            break
+        lat = min(lat + height, max_lat)
+
+    return sorted(prefixes)
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    Smallest string above every geohash starting with ``prefix``, or None
+
+    The last character is incremented (carrying past "z") rather than
+    appending a sentinel such as "~": the alphabet only sorts the same way
+    as ASCII under every collation, punctuation does not.
+    """
+    chars = list(prefix)
+    while chars:
+        index = BASE32.index(chars[-1])
+        if index + 1 < len(BASE32):
+            chars[-1] = BASE32[index + 1]
+            return "".join(chars)
+        chars.pop()
+    return None
@@ -1,38 +1,75 @@
 import googlemaps
-from typing import List, Optional, Dict, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional, Dict, Any, Callable, Awaitable, AsyncIterator, Tuple
+import asyncio
 import logging
-import time
 
 from core.config import settings
-from models.business import WebsiteStatus
+from models.business import Business, WebsiteStatus
+from services.business_store import find_businesses_in_bbox
+from services.place_cache import PlaceDetailsCache, FIELD_GROUPS, get_place_cache
+from services.geocoding import GeocodeCache, get_geocode_cache, parse_coordinates
+from services.chain_matcher import chain_matcher
+from services.geo_tiling import Tile, NEARBY_RESULT_CAP, child_tiles, haversine_meters, offset, root_tile
+from services.search_tiles import SearchTileIndex, get_search_tiles
 
 logger = logging.getLogger(__name__)
 
+# googlemaps is synchronous; its requests run on this pool, shared by all
+# service instances so the default executor is not starved by API calls
+_api_executor = ThreadPoolExecutor(
+    max_workers=max(32, settings.places_details_concurrency),
+    thread_name_prefix="google-places"
+)
+
 
 class GooglePlacesService:
-    def __init__(self):
-        self.client = googlemaps.Client(key=settings.google_maps_api_key)
+    # Google requires a short delay before a next_page_token becomes valid
+    PAGE_TOKEN_DELAY = 2
+    
+    def __init__(
+        self,
+        client: Optional[googlemaps.Client] = None,
+        details_cache: Optional[PlaceDetailsCache] = None,
+        geocode_cache: Optional[GeocodeCache] = None,
+        session_factory: Optional[Callable[[], Any]] = None,
+        search_tiles: Optional[SearchTileIndex] = None
+    ):
+        self.client = client or googlemaps.Client(key=settings.google_maps_api_key)
+        self.details_cache = details_cache or get_place_cache()
+        self.geocode_cache = geocode_cache or get_geocode_cache()
+        # With a session factory, tiles scanned before are answered from the
+        # businesses table; callers passing one must store what they get back
+        self.session_factory = session_factory
+        self.search_tiles = search_tiles or get_search_tiles()
+        self.details_concurrency = max(1, settings.places_details_concurrency)
+        self.tiling_concurrency = max(1, settings.tiling_concurrency)
+        self.tiling_request_budget = settings.tiling_request_budget
+        self.tiling_min_tile_meters = settings.tiling_min_tile_meters
+        
+        # Per-search state: services are created for a single search
+        self.chains_filtered = 0
+        self._on_business: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
     
     async def search_businesses(
         self,
         location: str,
         radius_miles: float,
         business_types: Optional[List[str]] = None,
-        max_results: int = 60  # Maximum results to fetch (3 pages of 20 each)
+        max_results: int = 60,  # Maximum results to fetch (3 pages of 20 each)
+        on_business: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
     ) -> List[Dict[str, Any]]:
+        """Search an area for local businesses.
+        
+        ``on_business`` is awaited with each business as soon as its details
+        arrive, before the final sort; used by ``stream_businesses``.
+        """
+        self._on_business = on_business
         try:
-            # Geocode location
-            if ',' in location and location.replace(',', '').replace('.', '').replace('-', '').replace(' ', '').isdigit():
-                lat, lng = map(float, location.split(','))
-                location_coords = (lat, lng)
-            else:
-                geocode_result = self.client.geocode(location)
-                if not geocode_result:
-                    raise ValueError(f"Could not geocode location: {location}")
-                location_coords = (
-                    geocode_result[0]['geometry']['location']['lat'],
-                    geocode_result[0]['geometry']['location']['lng']
-                )
+            # Geocode once per search; helpers receive the coordinates
+            location_coords = await self._geocode(location)
             
             radius_meters = int(radius_miles * 1609.34)
             
@@ -53,9 +90,9 @@ class GooglePlacesService:
                                 all_businesses.append(business)
                                 seen_place_ids.add(business['place_id'])
             else:
-                # Smart neighborhood-based search like archive approach
-                all_businesses = await self._search_neighborhoods_smart(
-                    location, max_results
+                # Default to local restaurants across the whole search area
+                all_businesses = await self._search_by_type_smart(
+                    location_coords, radius_meters, 'restaurant', max_results
                 )
             
             # Sort by website status FIRST, then popularity - prioritize businesses without websites
@@ -90,6 +127,33 @@ class GooglePlacesService:
             logger.error(f"Search failed: {e}")
             raise
     
+    async def stream_businesses(
+        self,
+        location: str,
+        radius_miles: float,
+        business_types: Optional[List[str]] = None,
+        max_results: int = 60
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield businesses in arrival order while the search is still running"""
+        queue: asyncio.Queue = asyncio.Queue()
+        seen_place_ids = set()
+        
+        search = asyncio.create_task(self.search_businesses(
+            location, radius_miles, business_types, max_results, on_business=queue.put
+        ))
+        search.add_done_callback(lambda _: queue.put_nowait(None))
+        
+        try:
+            while (business := await queue.get()) is not None:
+                if business['place_id'] in seen_place_ids:
+                    continue
+                seen_place_ids.add(business['place_id'])
+                yield business
+            # Surface search errors to the consumer
+            await search
+        finally:
+            search.cancel()
+    
     async def _search_by_type_smart(
         self, 
         location_coords: tuple, 
@@ -99,200 +163,206 @@ class GooglePlacesService:
     ) -> List[Dict[str, Any]]:
         """Search for businesses by specific type with chain filtering"""
         try:
-            search_params = {
-                'location': location_coords,
-                'radius': radius_meters,
-                'type': business_type
-            }
-            
-            results = await self._paginated_search(search_params, max_results * 2)  # Get more to filter
-            return self._filter_chains(results, max_results)
+            return await self._search_tiled(location_coords, radius_meters, business_type, max_results)
             
         except Exception as e:
             logger.error(f"Type search failed for '{business_type}': {e}")
             return []
     
-    async def _search_neighborhoods_smart(self, location: str, max_results: int) -> List[Dict[str, Any]]:
-        """Search specific neighborhoods like archive approach"""
+    async def _geocode(self, location: str) -> tuple:
+        """Resolve a location to (lat, lng): coordinates are parsed, addresses cached"""
+        coords = parse_coordinates(location)
+        if coords:
+            return coords
         
-        # Define neighborhood coordinates for different cities based on archive data
-        city_neighborhoods = {
-            'columbia': [
-                ("Rosewood", 34.0332, -81.0129),      # 50% no websites in archive
-                ("Elmwood Park", 34.0297, -81.0754),   # 80% no websites in archive  
-                ("North Main Street", 34.0115, -81.0348),
-                ("Devine Street", 34.0198, -80.9943),
-                ("The Vista", 34.0010, -81.0403),
-                ("Five Points", 34.0037, -81.0292)
-            ],
-            'pittsburgh': [
-                ("Lawrenceville", 40.4653, -79.9608),
-                ("Shadyside", 40.4511, -79.9425),
-                ("South Side", 40.4297, -79.9756),
-                ("Strip District", 40.4515, -79.9609)
-            ]
-        }
+        coords = self.geocode_cache.get(location)
+        if coords:
+            return coords
         
-        # Determine which city/neighborhoods to use
-        location_lower = location.lower()
-        neighborhoods = []
+        geocode_result = await self._call_api(self.client.geocode, location)
+        if not geocode_result:
+            raise ValueError(f"Could not geocode location: {location}")
+        coords = (
+            geocode_result[0]['geometry']['location']['lat'],
+            geocode_result[0]['geometry']['location']['lng']
+        )
+        self.geocode_cache.set(location, coords)
+        return coords
+    
+    async def _search_tiled(
+        self,
+        location_coords: tuple,
+        radius_meters: int,
+        place_type: str,
+        max_results: int
+    ) -> List[Dict[str, Any]]:
+        """Cover the search circle with quadtree tiles.
         
-        if 'columbia' in location_lower or 'sc' in location_lower:
-            neighborhoods = city_neighborhoods['columbia']
-            logger.info("Using Columbia, SC neighborhoods for targeted search")
-        elif 'pittsburgh' in location_lower or 'pennsylvania' in location_lower or 'pa' in location_lower:
-            neighborhoods = city_neighborhoods['pittsburgh']
-            logger.info("Using Pittsburgh, PA neighborhoods for targeted search")
-        else:
-            # Fallback to general search around the geocoded location
-            logger.info("Unknown location, falling back to general restaurant search")
-            geocode_result = self.client.geocode(location)
-            if geocode_result:
-                location_coords = (
-                    geocode_result[0]['geometry']['location']['lat'],
-                    geocode_result[0]['geometry']['location']['lng']
-                )
-                return await self._search_restaurants_smart(location_coords, 5000, max_results)
-            return []
+        Nearby Search stops at 60 results, so any tile that hits the cap is
+        split into four and its children are scanned. Tiles run concurrently
+        and share a budget of Nearby requests. Each page is deduplicated by
+        place_id and cleared of chains, then handed straight to the details
+        fetcher, so paid details calls overlap the rest of the scan. Paging
+        and subdividing stop once enough places have been found.
         
-        # Search each neighborhood with small radius like archive
-        all_businesses = []
+        With a ``session_factory``, tiles recorded in ``search_tiles`` are
+        answered from the database first, and tiles scanned to the end with
+        every place resolved are recorded for the next search.
+        """
+        budget = {'remaining': self.tiling_request_budget, 'tiles': 0, 'unscanned': 0, 'stored': 0}
+        semaphore = asyncio.Semaphore(self.tiling_concurrency)
         seen_place_ids = set()
-        businesses_per_neighborhood = max(3, max_results // len(neighborhoods))
+        fetcher = _DetailsFetcher(self, max_results)
+        # (tile, place_ids added from it, whether it was split) for tiles scanned to the end
+        scanned: List[Tuple[Tile, List[str], bool]] = []
         
-        for neighborhood, lat, lng in neighborhoods:
-            logger.info(f"Searching {neighborhood}...")
-            
-            # Small radius like archive (1200m = ~0.75 miles)
-            search_params = {
-                'location': (lat, lng),
-                'radius': 1200,  
-                'type': 'restaurant'
-            }
-            
-            try:
-                # Get restaurants from this neighborhood
-                neighborhood_results = await self._paginated_search(search_params, businesses_per_neighborhood * 2)
-                
-                # Filter chains and add neighborhood info
-                filtered_results = self._filter_chains(neighborhood_results, businesses_per_neighborhood)
-                
-                for business in filtered_results:
-                    if business['place_id'] not in seen_place_ids:
-                        business['neighborhood'] = neighborhood  # Add neighborhood info
-                        all_businesses.append(business)
-                        seen_place_ids.add(business['place_id'])
-                        
-                        # Log target businesses
-                        if business['website_status'] in ['NO_WEBSITE', 'FACEBOOK_ONLY']:
-                            logger.info(f"  🎯 FOUND TARGET: {business['name']} - {business['website_status']}")
-                
-                targets_found = len([b for b in filtered_results if b['website_status'] in ['NO_WEBSITE', 'FACEBOOK_ONLY']])
-                logger.info(f"  {neighborhood}: {len(filtered_results)} local businesses found, {targets_found} targets")
-                
-            except Exception as e:
-                logger.error(f"Error searching {neighborhood}: {e}")
-                continue
+        def new_places(places: List[Dict[str, Any]], location: Callable[[Dict[str, Any]], Optional[tuple]]):
+            candidates = []
+            for place in places:
+                if place['place_id'] in seen_place_ids:
+                    continue
+                coords = location(place)
+                if coords and haversine_meters(coords, location_coords) > radius_meters:
+                    continue
+                seen_place_ids.add(place['place_id'])
+                candidates.append(place)
+            return self._filter_chains(candidates, len(candidates))
+        
+        def nearby_location(place: Dict[str, Any]) -> Optional[tuple]:
+            location = place.get('geometry', {}).get('location')
+            return (location['lat'], location['lng']) if location else None
+        
+        def on_page(places: List[Dict[str, Any]], place_ids: List[str]):
+            candidates = new_places(places, nearby_location)
+            place_ids += [place['place_id'] for place in candidates]
+            fetcher.add(candidates)
+        
+        async def scan(tile: Tile):
+            record = await self.search_tiles.lookup(place_type, tile) if self.session_factory else None
+            if record:
+                stored = await asyncio.to_thread(self._stored_businesses, tile, record['place_ids'])
+                budget['stored'] += 1
+                await fetcher.add_stored(new_places(stored, lambda b: (b['latitude'], b['longitude'])))
+                if not record['split']:
+                    return
+            else:
+                place_ids = []
+                search_params = {'location': tile.center, 'radius': tile.radius, 'type': place_type}
+                try:
+                    found, complete = await self._scan_pages(
+                        search_params, lambda places: on_page(places, place_ids), fetcher, semaphore, budget
+                    )
+                except Exception as e:
+                    logger.error(f"Tile scan failed at {tile.center}: {e}")
+                    return
+                budget['tiles'] += 1
+                if found < NEARBY_RESULT_CAP or tile.half_side / 2 < self.tiling_min_tile_meters:
+                    if complete:
+                        scanned.append((tile, place_ids, False))
+                    return
+            if not await fetcher.need_more():
+                return
+            if not record:
+                if budget['remaining'] <= 0:
+                    budget['unscanned'] += 1
+                    return
+                scanned.append((tile, place_ids, True))
+            await asyncio.gather(*(scan(child) for child in child_tiles(tile, location_coords, radius_meters)))
         
-        logger.info(f"Neighborhood search completed: {len(all_businesses)} total businesses")
-        return all_businesses
-    
-    async def _search_restaurants_smart(
-        self, 
-        location_coords: tuple, 
-        radius_meters: int, 
-        max_results: int
-    ) -> List[Dict[str, Any]]:
-        """Smart restaurant search focusing on local businesses"""
         try:
-            search_params = {
-                'location': location_coords,
-                'radius': radius_meters,
-                'type': 'restaurant'  # Specific restaurant search like archive
-            }
-            
-            results = await self._paginated_search(search_params, max_results * 3)  # Get more to filter
-            return self._filter_chains(results, max_results)
-            
-        except Exception as e:
-            logger.error(f"Restaurant search failed: {e}")
-            return []
+            await scan(root_tile(location_coords, radius_meters))
+            businesses = await fetcher.finish()
+        finally:
+            fetcher.cancel()
+        
+        if self.session_factory:
+            await self._record_tiles(place_type, scanned, fetcher)
+        if budget['unscanned']:
+            logger.warning(f"Tiling budget exhausted with {budget['unscanned']} saturated tiles left unsplit")
+        logger.info(
+            f"Tiled '{place_type}' search: {budget['tiles']} tiles, {budget['stored']} answered from the database, "
+            f"{self.tiling_request_budget - budget['remaining']} nearby requests, "
+            f"{len(seen_place_ids)} unique places, {len(businesses)} businesses"
+        )
+        return businesses
     
-    async def _search_nearby(
-        self, 
-        location_coords: tuple, 
-        radius_meters: int, 
-        max_results: int
-    ) -> List[Dict[str, Any]]:
-        """General nearby search without type restrictions"""
-        try:
-            search_params = {
-                'location': location_coords,
-                'radius': radius_meters
-            }
-            
-            return await self._paginated_search(search_params, max_results)
-            
-        except Exception as e:
-            logger.error(f"Nearby search failed: {e}")
-            return []
+    def _stored_businesses(self, tile: Tile, place_ids: List[str]) -> List[Dict[str, Any]]:
+        """The stored businesses a recorded tile held, found in the box around its query circle"""
+        south, west = offset(tile.center, -tile.radius, -tile.radius)
+        north, east = offset(tile.center, tile.radius, tile.radius)
+        wanted = set(place_ids)
+        with self.session_factory() as db:
+            stored = find_businesses_in_bbox(db, south, west, north, east)
+            return [_business_data(business) for business in stored if business.google_place_id in wanted]
     
-    async def _paginated_search(
-        self, 
-        search_params: Dict[str, Any], 
-        max_results: int
-    ) -> List[Dict[str, Any]]:
-        """Handle paginated search results"""
-        all_businesses = []
-        next_page_token = None
-        page_count = 0
-        max_pages = max(1, max_results // 20)  # Each page returns up to 20 results
+    async def _record_tiles(
+        self,
+        place_type: str,
+        scanned: List[Tuple[Tile, List[str], bool]],
+        fetcher: "_DetailsFetcher"
+    ):
+        # Places never requested were not stored, so their tiles must be scanned again
+        unresolved = {place['place_id'] for _, place in fetcher.reserve}
+        for tile, place_ids, split in scanned:
+            if not unresolved.intersection(place_ids):
+                await self.search_tiles.record(place_type, tile, place_ids, split)
+    
+    async def _scan_pages(
+        self,
+        search_params: Dict[str, Any],
+        on_page: Callable[[List[Dict[str, Any]]], None],
+        fetcher: "_DetailsFetcher",
+        semaphore: asyncio.Semaphore,
+        budget: Dict[str, int]
+    ) -> Tuple[int, bool]:
+        """Page through one Nearby Search, handing each page to ``on_page`` as it arrives.
         
-        while page_count < max_pages and len(all_businesses) < max_results:
-            # Add page token if we have one
-            if next_page_token:
-                search_params['page_token'] = next_page_token
-                # Google requires a short delay before using page token
-                time.sleep(2)
-            
-            places_result = self.client.places_nearby(**search_params)
-            raw_results = places_result.get('results', [])
-            logger.info(f"Page {page_count + 1}: Found {len(raw_results)} raw places from Google API")
-            
-            # Process current page results - pass types from nearby search
-            for place in raw_results:
-                if len(all_businesses) >= max_results:
+        The next page is requested only while ``fetcher`` still needs places;
+        when in-flight details could fill it, their outcome is awaited first.
+        ``semaphore`` and ``budget`` bound the requests themselves, and the page
+        token delay is waited out without holding the semaphore. Returns the
+        number of raw results seen and whether the search was paged to its end.
+        """
+        found = 0
+        pages = 0
+        page_token = None
+        complete = False
+        
+        while True:
+            if page_token:
+                # Details for the previous page keep running during the delay
+                await asyncio.sleep(self.PAGE_TOKEN_DELAY)
+            async with semaphore:
+                if budget['remaining'] <= 0:
                     break
-                    
-                # Get types from nearby search result
-                place_types = place.get('types', [])
-                business_data = await self._get_place_details(place['place_id'], place_types)
-                if business_data:  # Only skip if we can't get basic details
-                    all_businesses.append(business_data)
+                budget['remaining'] -= 1
+                params = {**search_params, 'page_token': page_token} if page_token else search_params
+                places_result = await self._call_api(self.client.places_nearby, **params)
+            pages += 1
             
-            # Check if there's a next page
-            next_page_token = places_result.get('next_page_token')
-            page_count += 1
+            raw_results = places_result.get('results', [])
+            found += len(raw_results)
+            logger.info(f"Page {pages}: Found {len(raw_results)} raw places from Google API")
+            on_page(raw_results)
             
-            # If no more pages available, break
-            if not next_page_token:
+            page_token = places_result.get('next_page_token')
+            if not page_token:
+                complete = True
+                break
+            if not await fetcher.need_more():
                 break
-            
-            # Remove page_token for next iteration (it gets added above)
-            search_params.pop('page_token', None)
         
-        logger.info(f"Total collected: {len(all_businesses)} businesses from {page_count} pages")
-        return all_businesses
+        return found, complete
+    
+    async def _call_api(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking googlemaps call on the API thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_api_executor, partial(func, *args, **kwargs))
     
     async def _get_place_details(self, place_id: str, place_types: List[str] = None) -> Optional[Dict[str, Any]]:
         """Get detailed information for a specific place"""
         try:
-            details = self.client.place(
-                place_id=place_id,
-                fields=['website', 'name', 'formatted_address', 
-                       'geometry/location', 'url', 'formatted_phone_number',
-                       'business_status', 'rating', 'user_ratings_total']
-            )['result']
+            details = await self._load_place_details(place_id)
             
             # Skip permanently closed businesses
             if details.get('business_status') == 'CLOSED_PERMANENTLY':
@@ -343,54 +413,31 @@ class GooglePlacesService:
             logger.error(f"Failed to get details for place {place_id}: {e}")
             return None
     
+    async def _load_place_details(self, place_id: str) -> Dict[str, Any]:
+        """Read-through cache: only field groups that are missing or stale hit the API"""
+        details, stale_groups = await self.details_cache.lookup(place_id)
+        if not stale_groups:
+            return details
+        
+        fields = [field for group in stale_groups for field in FIELD_GROUPS[group]['fields']]
+        response = await self._call_api(self.client.place, place_id=place_id, fields=fields)
+        fresh = response['result']
+        await self.details_cache.store(place_id, fresh, stale_groups)
+        
+        return {**(details or {}), **fresh}
+    
     def _filter_chains(self, businesses: List[Dict[str, Any]], max_results: int) -> List[Dict[str, Any]]:
         """Filter out chain restaurants and big companies - focus on local businesses"""
         
-        # Chain keywords from archive + ones we've seen slip through
-        chain_keywords = [
-            # Fast food chains
-            'mcdonald', 'subway', 'taco bell', 'kfc', 'pizza hut', 'domino', 'papa john',
-            'wendy', 'burger king', 'chick-fil-a', 'chipotle', 'panera', 'five guys',
-            'starbucks', 'dunkin', 'tim horton', 'dairy queen', 'sonic drive',
-            'little caesars', 'popeyes', 'arby', 'jack in the box', 'whataburger',
-            
-            # Pizza chains
-            'pizza hut', 'domino', 'papa john', 'little caesars', 'papa murphy',
-            'godfather', 'casey', 'hunt brothers pizza',
-            
-            # Casual dining chains  
-            'applebee', 'olive garden', 'red lobster', 'outback steakhouse', 'chili',
-            'tgi friday', 'buffalo wild wing', 'cracker barrel', 'ihop', 'denny',
-            'waffle house', 'perkins', 'bob evan', 'golden corral', 'ruth chris',
-            'longhorn steakhouse', 'texas roadhouse',
-            
-            # Specific chains we've seen
-            'mellow mushroom', 'bonefish grill', 'firehouse subs', 'zaxby', 'moe',
-            'california dreaming', 'carolina ale house',
-            
-            # Coffee chains
-            'starbucks', 'dunkin', 'tim hortons', 'caribou coffee',
-            
-            # Gas stations / convenience  
-            'shell', 'exxon', 'bp', 'chevron', 'mobil', '7-eleven', 'circle k',
-            'sheetz', 'wawa', 'speedway',
-            
-            # Grocery/retail chains
-            'walmart', 'target', 'kroger', 'safeway', 'cvs', 'walgreens', 'rite aid',
-            'food lion', 'harris teeter', 'bi-lo',
-            
-            # Hotels
-            'marriott', 'hilton', 'holiday inn', 'hampton inn', 'best western', 'motel 6',
-            'comfort inn', 'quality inn', 'super 8'
-        ]
+        chain_matcher.reload_if_changed()
         
         filtered_businesses = []
         for business in businesses:
-            business_name = business.get('name', '').lower()
-            
-            # Skip if it matches any chain keyword
-            if any(keyword in business_name for keyword in chain_keywords):
-                logger.debug(f"Filtered out chain: {business.get('name')}")
+            # Skip if it matches any chain name
+            chain = chain_matcher.match(business.get('name', ''))
+            if chain:
+                logger.debug(f"Filtered out chain: {business.get('name')} (matched '{chain}')")
+                self.chains_filtered += 1
                 continue
             
             filtered_businesses.append(business)
@@ -418,4 +465,100 @@ class GooglePlacesService:
         if website_lower.endswith('.business.site'):
             return WebsiteStatus.FACEBOOK_ONLY
         
-        return WebsiteStatus.HAS_WEBSITE
\ No newline at end of file
+        return WebsiteStatus.HAS_WEBSITE
+
+
+class _DetailsFetcher:
+    """
+    Fetches place details as places are found, for at most ``limit`` businesses
+
+    Places are started as they are added, ``details_concurrency`` at a time,
+    until the businesses found plus the calls in flight could fill the
+    limit. Further places wait in reserve and are only requested when an
+    earlier one is dropped (closed or failed), so no paid call is wasted.
+    Results keep the order the places were added in.
+    """
+    
+    def __init__(self, service: GooglePlacesService, limit: int):
+        self.service = service
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(service.details_concurrency)
+        self.results: Dict[int, Dict[str, Any]] = {}
+        self.reserve: deque = deque()
+        self.in_flight = 0
+        self.added = 0
+        self.tasks: set = set()
+        self.changed = asyncio.Event()
+    
+    def add(self, places: List[Dict[str, Any]]):
+        for place in places:
+            self.reserve.append((self.added, place))
+            self.added += 1
+        self._start_needed()
+    
+    async def add_stored(self, businesses: List[Dict[str, Any]]):
+        """Take businesses already stored in the database, without details calls"""
+        for business in businesses:
+            if len(self.results) + self.in_flight >= self.limit:
+                break
+            self.results[self.added] = business
+            self.added += 1
+            if self.service._on_business:
+                await self.service._on_business(business)
+        self.changed.set()
+    
+    async def need_more(self) -> bool:
+        """Whether more places are needed, waiting on in-flight calls that could settle it"""
+        while len(self.results) < self.limit and (self.in_flight or self.reserve):
+            if len(self.results) + self.in_flight + len(self.reserve) < self.limit:
+                return True
+            self.changed.clear()
+            await self.changed.wait()
+        return len(self.results) < self.limit
+    
+    async def finish(self) -> List[Dict[str, Any]]:
+        while self.tasks:
+            await asyncio.gather(*self.tasks)
+        return [self.results[index] for index in sorted(self.results)]
+    
+    def cancel(self):
+        for task in self.tasks:
+            task.cancel()
+    
+    def _start_needed(self):
+        while self.reserve and len(self.results) + self.in_flight < self.limit:
+            self.in_flight += 1
+            task = asyncio.create_task(self._fetch(*self.reserve.popleft()))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+    
+    async def _fetch(self, index: int, place: Dict[str, Any]):
+        try:
+            async with self.semaphore:
+                business = await self.service._get_place_details(place['place_id'], place.get('types', []))
+            if business:
+                self.results[index] = business
+        finally:
+            self.in_flight -= 1
+            self._start_needed()
+            self.changed.set()
+        if business and self.service._on_business:
+            await self.service._on_business(business)
+
+
+def _business_data(business: Business) -> Dict[str, Any]:
+    """A stored business in the shape ``_get_place_details`` returns"""
+    return {
+        'place_id': business.google_place_id,
+        'name': business.name,
+        'address': business.address,
+        'latitude': business.latitude,
+        'longitude': business.longitude,
+        'phone': business.phone,
+        'website': business.website,
+        'website_status': business.website_status,
+        'google_maps_url': business.google_maps_url,
+        'business_type': business.business_type,
+        'rating': None,
+        'rating_count': None
+    }
@@ -0,0 +1,352 @@
+"""
+Job Queue - durable background jobs with leases, retries and dead-lettering
+
+Jobs live in the ``jobs`` table, so they survive restarts and any number of
+worker processes can share them. A claimed job holds a lease that its worker
+renews with heartbeats; if the worker dies the lease expires and another
+worker picks the job up. Failures are retried with exponential backoff until
+``max_attempts``, after which the job is dead-lettered.
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import os
+import random
+import socket
+import uuid
+
+from sqlalchemy import and_, func, or_
+
+from core.config import settings
+from models import Job, JobStatus
+from models.database import SessionLocal
+from services.worker_pool import WorkerPool
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+class JobQueue:
+    def __init__(self, session_factory: Callable = SessionLocal):
+        self.session_factory = session_factory
+        self.lease = timedelta(seconds=settings.job_lease_seconds)
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        dedupe_key: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        claimed_by: Optional[str] = None
+    ) -> str:
+        """
+        Add a job and return its id; an active job with the same dedupe_key is reused
+
+        With ``claimed_by`` the job starts out leased to that caller, which runs
+        it itself and reports through heartbeat/complete/fail like a worker. If
+        the caller dies, the lease expires and a worker picks the job up.
+        """
+        with self.session_factory() as db:
+            if dedupe_key:
+                existing = self._active(db, dedupe_key)
+                if existing:
+                    return existing.id
+
+            now = datetime.utcnow()
+            job = Job(
+                kind=kind,
+                payload=payload,
+                dedupe_key=dedupe_key,
+                max_attempts=max_attempts or settings.job_max_attempts,
+                run_after=now
+            )
+            if claimed_by:
+                job.status = JobStatus.RUNNING
+                job.attempts = 1
+                job.locked_by = claimed_by
+                job.lease_expires_at = now + self.lease
+                job.heartbeat_at = now
+            db.add(job)
+            db.commit()
+            logger.info(f"Enqueued {kind} job {job.id}")
+            return job.id
+
+    def has_active(self, dedupe_key: str) -> bool:
+        return self.find_active(dedupe_key) is not None
+
+    def find_active(self, dedupe_key: str) -> Optional[Dict[str, Any]]:
+        """The queued or running job for ``dedupe_key``, if any"""
+        with self.session_factory() as db:
+            job = self._active(db, dedupe_key)
+            return {"id": job.id, "kind": job.kind, "payload": job.payload} if job else None
+
+    def list_active(self, kind: str) -> List[Dict[str, Any]]:
+        with self.session_factory() as db:
+            jobs = db.query(Job).filter(Job.kind == kind, Job.status.in_(ACTIVE_STATUSES)).all()
+            return [{"id": job.id, "kind": job.kind, "payload": job.payload} for job in jobs]
+
+    def claim(self, worker_id: str, kinds: List[str], limit: int) -> List[Dict[str, Any]]:
+        """
+        Lease up to ``limit`` due jobs, including ones whose lease has expired
+
+        A job whose lease expired on its final attempt comes back with
+        ``"expired": True``; the worker dead-letters it through ``fail`` rather
+        than running it again.
+        """
+        if limit <= 0:
+            return []
+
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            jobs = db.query(Job).filter(
+                Job.kind.in_(kinds),
+                or_(
+                    and_(Job.status == JobStatus.QUEUED, Job.run_after <= now),
+                    and_(Job.status == JobStatus.RUNNING, Job.lease_expires_at < now)
+                )
+            ).order_by(Job.run_after).limit(limit).with_for_update(skip_locked=True).all()
+
+            claimed = []
+            for job in jobs:
+                expired = job.status == JobStatus.RUNNING and job.attempts >= job.max_attempts
+                if job.status == JobStatus.RUNNING:
+                    logger.warning(f"Reclaiming job {job.id}: lease held by {job.locked_by} expired")
+
+                job.status = JobStatus.RUNNING
+                if not expired:
+                    job.attempts += 1
+                job.locked_by = worker_id
+                job.lease_expires_at = now + self.lease
+                job.heartbeat_at = now
+                claimed.append({
+                    "id": job.id,
+                    "kind": job.kind,
+                    "payload": job.payload,
+                    "attempts": job.attempts,
+                    "max_attempts": job.max_attempts,
+                    "expired": expired
+                })
+
+            db.commit()
+            return claimed
+
+    def heartbeat(self, job_ids: List[str], worker_id: str):
+        if not job_ids:
+            return
+        now = datetime.utcnow()
+        with self.session_factory() as db:
+            db.query(Job).filter(
+                Job.id.in_(job_ids),
+                Job.locked_by == worker_id,
+                Job.status == JobStatus.RUNNING
+            ).update(
+                {Job.heartbeat_at: now, Job.lease_expires_at: now + self.lease},
+                synchronize_session=False
+            )
+            db.commit()
+
+    @asynccontextmanager
+    async def leased(self, job_ids: List[str], worker_id: str):
+        """Renew the leases of jobs run inline by ``worker_id`` for as long as the block runs"""
+        async def renew():
+            while True:
+                await asyncio.sleep(self.lease.total_seconds() / 3)
+                try:
+                    await asyncio.to_thread(self.heartbeat, job_ids, worker_id)
+                except Exception as e:
+                    logger.error(f"Job heartbeat failed: {e}")
+
+        task = asyncio.create_task(renew())
+        try:
+            yield
+        finally:
+            task.cancel()
+
+    def complete(self, job_id: str, worker_id: str):
+        with self.session_factory() as db:
+            job = self._owned(db, job_id, worker_id)
+            if job:
+                job.status = JobStatus.SUCCEEDED
+                job.locked_by = None
+                job.lease_expires_at = None
+                db.commit()
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> Optional[JobStatus]:
+        """Record a failed attempt: retry with backoff, or dead-letter on the last attempt"""
+        with self.session_factory() as db:
+            job = self._owned(db, job_id, worker_id)
+            if not job:
+                return None
+
+            job.last_error = error
+            job.locked_by = None
+            job.lease_expires_at = None
+            if job.attempts >= job.max_attempts:
+                job.status = JobStatus.DEAD
+                logger.error(f"Job {job.id} dead-lettered after {job.attempts} attempts: {error}")
+            else:
+                job.status = JobStatus.QUEUED
+                job.run_after = datetime.utcnow() + self.backoff(job.attempts)
+                logger.warning(f"Job {job.id} attempt {job.attempts} failed, retrying at {job.run_after}: {error}")
+            db.commit()
+            return job.status
+
+    def release(self, job_ids: List[str], worker_id: str):
+        """Hand interrupted jobs back to the queue without counting the attempt"""
+        if not job_ids:
+            return
+        with self.session_factory() as db:
+            db.query(Job).filter(
+                Job.id.in_(job_ids),
+                Job.locked_by == worker_id,
+                Job.status == JobStatus.RUNNING
+            ).update({
+                Job.status: JobStatus.QUEUED,
+                Job.attempts: Job.attempts - 1,
+                Job.locked_by: None,
+                Job.lease_expires_at: None,
+                Job.run_after: datetime.utcnow()
+            }, synchronize_session=False)
+            db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self.session_factory() as db:
+            counts = dict(db.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+        return {status.value: counts.get(status, 0) for status in JobStatus}
+
+    @staticmethod
+    def backoff(attempts: int) -> timedelta:
+        delay = min(settings.job_backoff_max_seconds, settings.job_backoff_base_seconds * 2 ** (attempts - 1))
+        # Jitter spreads retries from a burst of failures
+        return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+    def _active(self, db, dedupe_key: str) -> Optional[Job]:
+        return db.query(Job).filter(
+            Job.dedupe_key == dedupe_key,
+            Job.status.in_(ACTIVE_STATUSES)
+        ).first()
+
+    def _owned(self, db, job_id: str, worker_id: str) -> Optional[Job]:
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if not job or job.locked_by != worker_id:
+            logger.warning(f"Job {job_id} is no longer leased by {worker_id}; ignoring result")
+            return None
+        return job
+
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class JobWorker:
+    """
+    Claims jobs from a JobQueue and runs them on a bounded WorkerPool
+
+    ``handlers`` maps job kinds to coroutines taking the job payload.
+    ``dead_letter_handlers`` run when a job of that kind is dead-lettered.
+    Database calls are made off the event loop.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        concurrency: int,
+        dead_letter_handlers: Optional[Dict[str, JobHandler]] = None,
+        poll_interval: Optional[float] = None
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.dead_letter_handlers = dead_letter_handlers or {}
+        self.poll_interval = poll_interval if poll_interval is not None else settings.job_poll_interval_seconds
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.pool = WorkerPool("jobs", self._run_job, concurrency)
+        self._active: Dict[str, Dict[str, Any]] = {}
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        self._stopping = False
+        await self.pool.start()
+        self._tasks = [
+            asyncio.create_task(self._poll_loop(), name="jobs-poll"),
+            asyncio.create_task(self._heartbeat_loop(), name="jobs-heartbeat"),
+        ]
+        logger.info(f"Job worker {self.worker_id} started for {sorted(self.handlers)}")
+
+    async def stop(self):
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.pool.stop()
+        # Anything still running was interrupted, not failed
+        await asyncio.to_thread(self.queue.release, list(self._active), self.worker_id)
+        self._active.clear()
+        logger.info(f"Job worker {self.worker_id} stopped")
+
+    def notify(self):
+        """Wake the poller, e.g. right after enqueueing in the same process"""
+        self._wakeup.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"worker_id": self.worker_id, **self.pool.stats()}
+
+    async def run_once(self) -> int:
+        """Claim and dispatch as many jobs as there is free capacity for"""
+        free = self.pool.concurrency - self.pool.in_flight - self.pool.queue_depth
+        jobs = await asyncio.to_thread(self.queue.claim, self.worker_id, list(self.handlers), free)
+        for job in jobs:
+            if job["expired"]:
+                await self._fail(job, "Lease expired on final attempt")
+                continue
+            self._active[job["id"]] = job
+            await self.pool.submit(job)
+        return len(jobs)
+
+    async def _poll_loop(self):
+        while not self._stopping:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Job poll failed: {e}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _heartbeat_loop(self):
+        interval = self.queue.lease.total_seconds() / 3
+        while not self._stopping:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.queue.heartbeat, list(self._active), self.worker_id)
+            except Exception as e:
+                logger.error(f"Job heartbeat failed: {e}")
+
+    async def _run_job(self, job: Dict[str, Any]):
+        try:
+            await self.handlers[job["kind"]](job["payload"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._active.pop(job["id"], None)
+            await self._fail(job, f"{type(e).__name__}: {e}")
+        else:
+            self._active.pop(job["id"], None)
+            await asyncio.to_thread(self.queue.complete, job["id"], self.worker_id)
+        finally:
+            # A slot just freed up
+            self._wakeup.set()
+
+    async def _fail(self, job: Dict[str, Any], error: str):
+        status = await asyncio.to_thread(self.queue.fail, job["id"], self.worker_id, error)
+        if status == JobStatus.DEAD and job["kind"] in self.dead_letter_handlers:
+            await self.dead_letter_handlers[job["kind"]](job["payload"])
+
+
+job_queue = JobQueue()
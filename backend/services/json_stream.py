@@ -0,0 +1,98 @@
+"""
+JSON Stream - incremental parser for a JSON object arriving in chunks
+
+Each top-level member is decoded as soon as its value closes, so streamed
+LLM output can be used field by field and a truncated reply still yields
+every member that finished.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_SMART_QUOTES = str.maketrans({"\u201c": '"', "\u201d": '"'})
+
+
+def repair_json(text: str) -> str:
+    """Fix the slips LLMs make most: trailing commas and typographic quotes"""
+    return _TRAILING_COMMA.sub(r"\1", text.translate(_SMART_QUOTES))
+
+
+class JSONObjectStream:
+    """
+    Feed text chunks; ``feed`` returns the top-level (key, value) pairs that
+    completed in that chunk. Text before the first ``{`` (prose, a code fence)
+    is ignored, as is anything after the object closes.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        if self.complete or not chunk:
+            return []
+
+        self._text += chunk
+        completed = []
+        text = self._text
+        while self._pos < len(text):
+            char = text[self._pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif self._member_start is None:
+                if char == "{":
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._close_member(self._pos))
+                    self.complete = True
+                    self._pos += 1
+                    break
+            elif char == "," and self._depth == 1:
+                completed.extend(self._close_member(self._pos))
+                self._member_start = self._pos + 1
+            self._pos += 1
+
+        return completed
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        return self._text
+
+    def _close_member(self, end: int) -> List[Tuple[str, Any]]:
+        segment = self._text[self._member_start:end]
+        if not segment.strip():
+            return []
+        try:
+            member = json.loads("{" + segment + "}")
+        except ValueError:
+            try:
+                member = json.loads("{" + repair_json(segment) + "}")
+            except ValueError as e:
+                logger.warning(f"Skipping malformed JSON member: {e}")
+                return []
+        self.fields.update(member)
+        return list(member.items())
@@ -0,0 +1,139 @@
+"""
+KV Backend - storage shared by the place cache, research cache and token budget
+
+Each store keeps JSON values and counters that expire, either in-process or in
+Redis so every API and job worker sees the same data. Redis is used only when
+``REDIS_URL`` is configured (or a store's backend setting asks for it), so a
+deployment without Redis runs every store in memory.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+import json
+import logging
+import time
+
+import redis.asyncio as redis
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def backend_name(setting: Optional[str] = None) -> str:
+    """"redis" or "memory" for a store's backend setting; unset follows REDIS_URL"""
+    if setting:
+        return setting
+    return "redis" if settings.redis_url else "memory"
+
+
+class KVBackend(ABC):
+    """
+    Expiring JSON values and counters under a key prefix
+
+    Backends only implement ``_get``/``_set``/``_incr``. The stores built on
+    this must never break the work they support, so a failing backend reads as
+    a miss, counts as zero and is only logged.
+    """
+
+    name = "base"
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    async def _set(self, key: str, raw: str, ttl: int):
+        pass
+
+    @abstractmethod
+    async def _incr(self, key: str, amount: int, ttl: int) -> int:
+        pass
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self._get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"{self.name} read of {self.prefix}{key} failed: {e}")
+            return None
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, value: Any, ttl: int):
+        try:
+            await self._set(self.prefix + key, json.dumps(value), ttl)
+        except Exception as e:
+            logger.warning(f"{self.name} write of {self.prefix}{key} failed: {e}")
+
+    async def incr(self, key: str, amount: int, ttl: int) -> int:
+        """Add ``amount`` to a counter and return its new total"""
+        try:
+            return await self._incr(self.prefix + key, amount, ttl)
+        except Exception as e:
+            logger.warning(f"{self.name} update of {self.prefix}{key} failed: {e}")
+            return 0
+
+
+class MemoryBackend(KVBackend):
+    """In-process backend used for tests and when Redis is not configured"""
+
+    name = "memory"
+
+    def __init__(self, prefix: str = ""):
+        super().__init__(prefix)
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+
+    def _live(self, key: str) -> Optional[Any]:
+        item = self._entries.get(key)
+        if not item:
+            return None
+        expires_at, value = item
+        if time.time() >= expires_at:
+            del self._entries[key]
+            return None
+        return value
+
+    async def _get(self, key: str) -> Optional[str]:
+        return self._live(key)
+
+    async def _set(self, key: str, raw: str, ttl: int):
+        self._entries[key] = (time.time() + ttl, raw)
+
+    async def _incr(self, key: str, amount: int, ttl: int) -> int:
+        total = (self._live(key) or 0) + amount
+        expires_at = self._entries[key][0] if key in self._entries else time.time() + ttl
+        self._entries[key] = (expires_at, total)
+        return total
+
+
+class RedisBackend(KVBackend):
+    """Redis-backed storage shared by the API and every job worker"""
+
+    name = "redis"
+
+    def __init__(self, redis_url: str, prefix: str):
+        super().__init__(prefix)
+        self.client = redis.from_url(redis_url, decode_responses=True)
+
+    async def _get(self, key: str) -> Optional[str]:
+        return await self.client.get(key)
+
+    async def _set(self, key: str, raw: str, ttl: int):
+        await self.client.set(key, raw, ex=ttl)
+
+    async def _incr(self, key: str, amount: int, ttl: int) -> int:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.incrby(key, amount)
+            pipe.expire(key, ttl)
+            total, _ = await pipe.execute()
+        return total
+
+
+def create_backend(prefix: str, setting: Optional[str] = None) -> KVBackend:
+    """Backend for one store, chosen by its backend setting (see ``backend_name``)"""
+    if backend_name(setting) == "redis":
+        if not settings.redis_url:
+            raise ValueError(f"A Redis backend for {prefix!r} needs REDIS_URL")
+        return RedisBackend(settings.redis_url, prefix)
+    return MemoryBackend(prefix)
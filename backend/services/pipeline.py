@@ -0,0 +1,431 @@
+"""
+Pipeline - discovery -> research -> generation in one overlapped run
+
+Businesses stream out of GooglePlacesService into a research stage and then a
+generation stage, each with its own number of workers. Stages are joined by
+bounded queues, so a slow stage pauses the one upstream instead of piling up
+work. Progress lives on the PipelineRun row: a resumed run replays the
+businesses already discovered and skips every stage already done for each.
+Database work runs on worker threads, one session per call, so the event
+loop never blocks on it.
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from datetime import datetime
+import asyncio
+import logging
+import os
+import socket
+import time
+
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from models.database import SessionLocal
+from models import (
+    Business, BusinessResearch, GeneratedWebsite, PipelineRun, PipelineStatus, ResearchStatus, Template
+)
+from services.business_store import upsert_businesses
+from services.google_places import GooglePlacesService
+from services.job_queue import job_queue
+from services.single_flight import single_flight
+from services.website_generator import GENERATE_WEBSITE_JOB, WebsiteGenerator, generation_dedupe_key
+from agents.research_agent import RESEARCH_JOB, research_agent, research_dedupe_key
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_JOB = "pipeline"
+
+# Newly discovered businesses written to PipelineRun.business_ids at once
+CHECKPOINT_BATCH = 25
+# Longest that stats and discovered businesses go unsaved
+CHECKPOINT_SECONDS = 2.0
+
+T = TypeVar("T")
+
+
+class StageStats:
+    """Counts and timings for one stage; offsets are seconds since the run started"""
+
+    def __init__(self):
+        self.completed = 0
+        self.skipped = 0
+        self.failed = 0
+        # Summed over workers, i.e. how long the stage would take run serially
+        self.busy_seconds = 0.0
+        # Time spent waiting for room in the next stage's queue
+        self.blocked_seconds = 0.0
+        self.first_at: Optional[float] = None
+        self.last_at: Optional[float] = None
+
+    def record(self, outcome: str, started: float, finished: float, run_started: float):
+        setattr(self, outcome, getattr(self, outcome) + 1)
+        self.busy_seconds += finished - started
+        if self.first_at is None:
+            self.first_at = started - run_started
+        self.last_at = finished - run_started
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "busy_seconds": round(self.busy_seconds, 2),
+            "blocked_seconds": round(self.blocked_seconds, 2),
+            "first_at": None if self.first_at is None else round(self.first_at, 2),
+            "last_at": None if self.last_at is None else round(self.last_at, 2),
+        }
+
+
+class Pipeline:
+    """
+    Runs (or resumes) one PipelineRun to completion
+
+    ``places_service``, ``researcher`` and ``generator`` default to the real
+    services; each business passes through ``researcher.research_business``
+    and then ``generator.generate`` for a GeneratedWebsite row.
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        session_factory: Callable[[], Session] = SessionLocal,
+        places_service=None,
+        researcher=None,
+        generator=None
+    ):
+        self.run_id = str(run_id)
+        # Owner of the research/generation jobs this run registers and runs inline
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-pipeline-{self.run_id[:8]}"
+        self.session_factory = session_factory
+        self.places_service = places_service
+        self.researcher = researcher or research_agent
+        self.generator = generator
+        self.stages = {name: StageStats() for name in ("discovery", "research", "generation")}
+        self.business_ids: List[str] = []
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._started = 0.0
+        self._saved_at = 0.0
+        self._saved_businesses = 0
+        # Errors outside a stage's handler, e.g. saving progress; they fail the run
+        self._errors: List[Exception] = []
+
+    async def run(self) -> Dict[str, Any]:
+        spec, template_id, business_ids, replay = await self._db(self._start_run)
+        self.business_ids = business_ids
+        self._saved_businesses = len(business_ids)
+
+        self.spec = spec
+        self.template_id = template_id
+        self.force_refresh = spec.get("force_refresh", False)
+        self._started = time.monotonic()
+        self._queues = {
+            "research": asyncio.Queue(maxsize=max(1, settings.pipeline_queue_size)),
+            "generation": asyncio.Queue(maxsize=max(1, settings.pipeline_queue_size)),
+        }
+        # Without a template the run stops after research
+        generation = self._queues["generation"] if template_id else None
+        research_workers = spec.get("research_concurrency") or settings.pipeline_research_concurrency
+        generation_workers = spec.get("generation_concurrency") or settings.pipeline_generation_concurrency
+
+        workers = [
+            asyncio.create_task(self._stage_worker("research", self._research, generation))
+            for _ in range(max(1, research_workers))
+        ]
+        if generation is not None:
+            workers += [
+                asyncio.create_task(self._stage_worker("generation", self._generate, None))
+                for _ in range(max(1, generation_workers))
+            ]
+
+        logger.info(
+            f"Pipeline {self.run_id}: {'replaying' if replay else 'discovering'} businesses, "
+            f"{research_workers} research / {generation_workers if generation else 0} generation workers"
+        )
+        try:
+            search_error = None
+            try:
+                if replay:
+                    await self._replay()
+                else:
+                    await self._discover()
+            except Exception as e:
+                search_error = e
+            # Businesses found before a search error are still finished
+            await self._drain(workers)
+            if search_error:
+                raise search_error
+            if self._errors:
+                raise RuntimeError(f"{len(self._errors)} pipeline items failed to save: {self._errors[0]}")
+        except Exception as e:
+            logger.error(f"Pipeline {self.run_id} failed: {e}")
+            await self._checkpoint(status=PipelineStatus.FAILED, error=str(e), finished_at=datetime.utcnow())
+            raise
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        await self._checkpoint(status=PipelineStatus.SUCCEEDED, finished_at=datetime.utcnow())
+        logger.info(f"Pipeline {self.run_id} finished: {self.stats()}")
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        return {
+            "stages": {name: stage.to_dict() for name, stage in self.stages.items()},
+            "queues": {name: queue.qsize() for name, queue in self._queues.items()},
+            "elapsed_seconds": round(elapsed, 2),
+            "serial_seconds": round(sum(stage.busy_seconds for stage in self.stages.values()), 2),
+        }
+
+    def _start_run(self, db: Session) -> Tuple[Dict[str, Any], Optional[str], List[str], bool]:
+        run = db.get(PipelineRun, self.run_id)
+        if run is None:
+            raise ValueError(f"Pipeline run {self.run_id} not found")
+        run.status = PipelineStatus.RUNNING
+        run.started_at = datetime.utcnow()
+        run.finished_at = None
+        run.error = None
+        db.commit()
+        return dict(run.spec), run.template_id, list(run.business_ids or []), run.discovery_complete
+
+    async def _drain(self, workers: List[asyncio.Task]):
+        """Wait until both queues are empty; a worker that dies instead fails the run"""
+        async def join():
+            await self._queues["research"].join()
+            await self._queues["generation"].join()
+
+        drained = asyncio.create_task(join())
+        done, _ = await asyncio.wait([drained, *workers], return_when=asyncio.FIRST_COMPLETED)
+        if drained in done:
+            return
+        drained.cancel()
+        worker = done.pop()
+        error = None if worker.cancelled() else worker.exception()
+        raise RuntimeError(f"Pipeline worker stopped unexpectedly: {error}")
+
+    async def _discover(self):
+        stage = self.stages["discovery"]
+        places_service = self.places_service or GooglePlacesService(session_factory=self.session_factory)
+        seen = set(self.business_ids)
+
+        mark = time.monotonic()
+        async for business_data in places_service.stream_businesses(
+            location=self.spec["location"],
+            radius_miles=self.spec["radius_miles"],
+            business_types=self.spec.get("business_types"),
+            max_results=self.spec["max_results"]
+        ):
+            business_id, website_status = await self._db(_store_business, business_data)
+            if business_id not in seen:
+                seen.add(business_id)
+                self.business_ids.append(business_id)
+
+            # Busy time covers waiting on the search and saving the business
+            eligible = website_status.value in self.spec["website_statuses"]
+            stage.record("completed" if eligible else "skipped", mark, time.monotonic(), self._started)
+            await self._checkpoint()
+            if eligible:
+                await self._put("discovery", "research", business_id)
+            mark = time.monotonic()
+
+        await self._checkpoint(discovery_complete=True)
+
+    async def _replay(self):
+        stage = self.stages["discovery"]
+        statuses = await self._db(lambda db: dict(
+            db.query(Business.id, Business.website_status).filter(Business.id.in_(self.business_ids))
+        ))
+
+        for business_id in self.business_ids:
+            now = time.monotonic()
+            website_status = statuses.get(business_id)
+            eligible = website_status is not None and website_status.value in self.spec["website_statuses"]
+            stage.record("completed" if eligible else "skipped", now, now, self._started)
+            if eligible:
+                await self._put("discovery", "research", business_id)
+
+    async def _put(self, stage: str, queue: str, business_id: str):
+        # Blocks while the next stage is full; that wait is the backpressure
+        started = time.monotonic()
+        await self._queues[queue].put(business_id)
+        self.stages[stage].blocked_seconds += time.monotonic() - started
+
+    async def _stage_worker(
+        self,
+        name: str,
+        handler: Callable[[str], Awaitable[str]],
+        next_queue: Optional[asyncio.Queue]
+    ):
+        queue = self._queues[name]
+        while True:
+            business_id = await queue.get()
+            try:
+                started = time.monotonic()
+                try:
+                    outcome = await handler(business_id)
+                except Exception as e:
+                    logger.error(f"Pipeline {self.run_id} {name} failed for {business_id}: {e}")
+                    outcome = "failed"
+                self.stages[name].record(outcome, started, time.monotonic(), self._started)
+                await self._checkpoint()
+                if outcome != "failed" and next_queue is not None:
+                    await self._put(name, "generation", business_id)
+            except Exception as e:
+                # The worker carries on; the run fails at the end and a retry resumes it
+                logger.error(f"Pipeline {self.run_id} {name} could not save {business_id}: {e}")
+                self._errors.append(e)
+            finally:
+                queue.task_done()
+
+    async def _research(self, business_id: str) -> str:
+        dedupe_key = research_dedupe_key(business_id)
+        # Same lock as the research endpoints, so a business is never researched twice at once
+        async with single_flight.lock(dedupe_key):
+            await self._wait_for_job(dedupe_key)
+            if not await self._db(self._claim_research, business_id):
+                return "skipped"
+            job_id = await self._register_job(
+                RESEARCH_JOB, {"business_id": business_id, "force_refresh": self.force_refresh}, dedupe_key
+            )
+
+        try:
+            await self._run_job(job_id, lambda: self.researcher.research_business(
+                business_id, force_refresh=self.force_refresh
+            ))
+        except Exception:
+            await asyncio.to_thread(self.researcher.mark_failed, business_id)
+            raise
+
+        completed = await self._db(lambda db: db.query(BusinessResearch.id).filter(
+            BusinessResearch.business_id == business_id,
+            BusinessResearch.status == ResearchStatus.COMPLETED
+        ).first() is not None)
+        return "completed" if completed else "failed"
+
+    def _claim_research(self, db: Session, business_id: str) -> bool:
+        """Mark the business's research in progress; False when it is already done"""
+        research = db.query(BusinessResearch).filter(BusinessResearch.business_id == business_id).first()
+        if research and research.status == ResearchStatus.COMPLETED and not self.force_refresh:
+            return False
+        if research is None:
+            db.add(BusinessResearch(business_id=business_id, status=ResearchStatus.IN_PROGRESS))
+        else:
+            research.status = ResearchStatus.IN_PROGRESS
+        db.commit()
+        return True
+
+    async def _generate(self, business_id: str) -> str:
+        dedupe_key = generation_dedupe_key(business_id, self.template_id)
+        async with single_flight.lock(dedupe_key):
+            await self._wait_for_job(dedupe_key)
+            website_id = await self._db(self._claim_website, business_id)
+            if website_id is None:
+                return "skipped"
+            job_id = await self._register_job(GENERATE_WEBSITE_JOB, {"website_id": website_id}, dedupe_key)
+
+        generator = self.generator or WebsiteGenerator()
+        await self._run_job(job_id, lambda: generator.generate(website_id))
+
+        generated = await self._db(lambda db: db.query(GeneratedWebsite.id).filter(
+            GeneratedWebsite.id == website_id,
+            GeneratedWebsite.preview_url.isnot(None)
+        ).first() is not None)
+        return "completed" if generated else "failed"
+
+    def _claim_website(self, db: Session, business_id: str) -> Optional[str]:
+        """The website row to generate, created if needed; None when it is already generated"""
+        website = db.query(GeneratedWebsite).filter(
+            GeneratedWebsite.business_id == business_id,
+            GeneratedWebsite.template_id == self.template_id
+        ).order_by(GeneratedWebsite.created_at.desc()).first()
+        if website and website.preview_url and not self.force_refresh:
+            return None
+        if website is None:
+            website = GeneratedWebsite(
+                business_id=business_id, template_id=self.template_id, content={}, settings={}
+            )
+            db.add(website)
+            db.commit()
+        return website.id
+
+    async def _register_job(self, kind: str, payload: Dict[str, Any], dedupe_key: str) -> str:
+        """
+        Record work this run is about to do inline as a job leased to it
+
+        Called under the dedupe lock, so an endpoint checking for an active job
+        finds this one and joins it instead of starting the same work again.
+        One attempt only: a failure is retried by resuming the run, not by the
+        job queue.
+        """
+        return await asyncio.to_thread(
+            job_queue.enqueue, kind, payload, dedupe_key, max_attempts=1, claimed_by=self.worker_id
+        )
+
+    async def _run_job(self, job_id: str, work: Callable[[], Awaitable[Any]]):
+        """Run a registered job inline, renewing its lease, and record how it ended"""
+        try:
+            async with job_queue.leased([job_id], self.worker_id):
+                await work()
+        except Exception as e:
+            await asyncio.to_thread(job_queue.fail, job_id, self.worker_id, f"{type(e).__name__}: {e}")
+            raise
+        await asyncio.to_thread(job_queue.complete, job_id, self.worker_id)
+
+    async def _wait_for_job(self, dedupe_key: str):
+        # A queued job for the same work (started from the UI) finishes first,
+        # after which the stage usually finds nothing left to do
+        while await asyncio.to_thread(job_queue.find_active, dedupe_key):
+            await asyncio.sleep(settings.job_poll_interval_seconds)
+
+    async def _checkpoint(self, **fields):
+        """
+        Save stats and newly discovered businesses to the PipelineRun row
+
+        Runs at most every CHECKPOINT_SECONDS or CHECKPOINT_BATCH new
+        businesses, and always when ``fields`` are given. A resumed run
+        rediscovers anything found after the last checkpoint.
+        """
+        now = time.monotonic()
+        unsaved = len(self.business_ids) - self._saved_businesses
+        if not fields and unsaved < CHECKPOINT_BATCH and now - self._saved_at < CHECKPOINT_SECONDS:
+            return
+        self._saved_at = now
+        if unsaved:
+            fields["business_ids"] = list(self.business_ids)
+            self._saved_businesses = len(self.business_ids)
+        fields["stats"] = self.stats()
+        await self._db(self._save_run, fields)
+
+    def _save_run(self, db: Session, fields: Dict[str, Any]):
+        run = db.get(PipelineRun, self.run_id)
+        for field, value in fields.items():
+            setattr(run, field, value)
+        db.commit()
+
+    async def _db(self, fn: Callable[..., T], *args) -> T:
+        """Run ``fn(db, *args)`` in a fresh session on a worker thread"""
+        def call():
+            with self.session_factory() as db:
+                return fn(db, *args)
+        return await asyncio.to_thread(call)
+
+
+def _store_business(db: Session, business_data: Dict[str, Any]) -> Tuple[str, Any]:
+    business = upsert_businesses(db, [business_data])[0]
+    db.commit()
+    return business.id, business.website_status
+
+
+def default_template_id(db: Session) -> Optional[str]:
+    template = db.query(Template).filter(Template.is_active == True).order_by(Template.name).first()
+    return template.id if template else None
+
+
+def pipeline_dedupe_key(run_id) -> str:
+    return f"{PIPELINE_JOB}:{run_id}"
+
+
+async def run_pipeline_job(payload: Dict[str, Any]):
+    # A failed attempt is retried by the job queue and resumes where it stopped
+    await Pipeline(payload["run_id"]).run()
@@ -0,0 +1,128 @@
+"""
+Place Details Cache - read-through cache in front of Google Place Details
+"""
+from typing import Dict, Any, Optional, List, Tuple
+import functools
+import logging
+import time
+
+from core.config import settings
+from services.kv_backend import KVBackend, MemoryBackend, create_backend
+
+logger = logging.getLogger(__name__)
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# Place Details fields grouped by how quickly they go stale. Each group is
+# refreshed independently, so an expired rating only re-requests rating fields.
+FIELD_GROUPS: Dict[str, Dict[str, Any]] = {
+    "basic": {
+        "fields": ["name", "formatted_address", "geometry/location", "url"],
+        "keys": ["name", "formatted_address", "geometry", "url"],
+        "ttl": 30 * DAY,
+    },
+    "contact": {
+        "fields": ["website", "formatted_phone_number", "business_status"],
+        "keys": ["website", "formatted_phone_number", "business_status"],
+        "ttl": 7 * DAY,
+    },
+    "atmosphere": {
+        "fields": ["rating", "user_ratings_total"],
+        "keys": ["rating", "user_ratings_total"],
+        "ttl": 1 * DAY,
+    },
+}
+
+# Permanently closed places are remembered so they are never paid for again
+CLOSED_TTL = 90 * DAY
+
+KEY_PREFIX = "bizfly:place:"
+
+
+class PlaceDetailsCache:
+    """
+    Cache keyed by place_id, in memory unless given a shared backend
+
+    Entries hold one timestamped block per field group plus an optional
+    ``closed_at`` marker for negative caching.
+    """
+
+    def __init__(self, backend: Optional[KVBackend] = None):
+        self.backend = backend or MemoryBackend(KEY_PREFIX)
+        self.hits = 0
+        self.misses = 0
+        self.partial_hits = 0
+        self.negative_hits = 0
+
+    async def lookup(self, place_id: str) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """
+        Return cached details and the field groups that need refreshing
+
+        A permanently closed place comes back as ``{"business_status":
+        "CLOSED_PERMANENTLY"}`` with nothing to refresh.
+        """
+        entry = await self.backend.get(place_id)
+        now = time.time()
+
+        if entry and entry.get("closed_at") and now - entry["closed_at"] < CLOSED_TTL:
+            self.negative_hits += 1
+            return {"business_status": "CLOSED_PERMANENTLY"}, []
+
+        details: Dict[str, Any] = {}
+        stale_groups = []
+        groups = (entry or {}).get("groups", {})
+        for group, spec in FIELD_GROUPS.items():
+            block = groups.get(group)
+            if block and now - block["fetched_at"] < spec["ttl"]:
+                details.update(block["data"])
+            else:
+                stale_groups.append(group)
+
+        if not stale_groups:
+            self.hits += 1
+        elif len(stale_groups) < len(FIELD_GROUPS):
+            self.partial_hits += 1
+        else:
+            self.misses += 1
+
+        return (details or None), stale_groups
+
+    async def store(self, place_id: str, details: Dict[str, Any], groups: List[str]):
+        """Store freshly fetched details for the given field groups"""
+        now = time.time()
+
+        if details.get("business_status") == "CLOSED_PERMANENTLY":
+            await self.backend.set(place_id, {"closed_at": now}, CLOSED_TTL)
+            return
+
+        entry = await self.backend.get(place_id) or {}
+        entry.pop("closed_at", None)
+        entry.setdefault("groups", {})
+        for group in groups:
+            keys = FIELD_GROUPS[group]["keys"]
+            entry["groups"][group] = {
+                "fetched_at": now,
+                "data": {key: details[key] for key in keys if key in details}
+            }
+
+        await self.backend.set(place_id, entry, max(spec["ttl"] for spec in FIELD_GROUPS.values()))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.partial_hits + self.negative_hits
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "partial_hits": self.partial_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 3) if lookups else 0.0
+        }
+
+
+@functools.cache
+def get_place_cache() -> PlaceDetailsCache:
+    """Return the process-wide place details cache"""
+    cache = PlaceDetailsCache(create_backend(KEY_PREFIX, settings.place_cache_backend))
+    logger.info(f"Place details cache: {cache.backend.name}")
+    return cache
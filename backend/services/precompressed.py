@@ -0,0 +1,114 @@
+"""
+Precompressed Artifacts - gzip/brotli variants written next to generated files
+
+Generated pages and assets are compressed once when they are saved, so the
+serving paths only pick the best existing variant for a request's
+Accept-Encoding instead of compressing on every response.
+"""
+from typing import List, Optional, Tuple
+from pathlib import Path
+import gzip
+import os
+import tempfile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content-Encoding and file suffix of each variant, most preferred first
+ENCODINGS: List[Tuple[str, str]] = [("br", ".br"), ("gzip", ".gz")]
+
+# Below this size the variant saves too little to be worth a second file
+MIN_SIZE = 256
+
+
+def _compress(encoding: str, data: bytes) -> Optional[bytes]:
+    if encoding == "gzip":
+        # mtime=0 keeps the output identical for identical input
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=11)
+    return None
+
+
+def write_precompressed(path: Path, data: Optional[bytes] = None) -> List[str]:
+    """
+    Write the compressed variants of ``path`` (read from disk unless ``data``
+    is given); returns the names of the variant files written
+
+    Files too small to benefit get no variants, and stale ones are removed.
+    """
+    if data is None:
+        data = path.read_bytes()
+    if len(data) < MIN_SIZE:
+        remove_precompressed(path)
+        return []
+    written = []
+    for encoding, suffix in ENCODINGS:
+        compressed = _compress(encoding, data)
+        if compressed is None:
+            continue
+        variant = path.with_name(path.name + suffix)
+        # Written to a temporary file and renamed, so a reader never sees half a variant
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{variant.name}.")
+        with os.fdopen(fd, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, variant)
+        written.append(variant.name)
+    return written
+
+
+def remove_precompressed(path: Path):
+    for _, suffix in ENCODINGS:
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def _accepted(accept_encoding: str) -> dict:
+    """Quality value per encoding named in an Accept-Encoding header"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def select_variant(path: Path, accept_encoding: Optional[str]) -> Optional[Tuple[str, Path]]:
+    """
+    Best precompressed variant of ``path`` the client accepts, as
+    (encoding, variant path), or None to serve the file as is
+
+    A variant older than its source is ignored, since it may be stale.
+    """
+    if not accept_encoding:
+        return None
+    accepted = _accepted(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    candidates = [
+        (accepted.get(encoding, wildcard), -rank, encoding, suffix)
+        for rank, (encoding, suffix) in enumerate(ENCODINGS)
+    ]
+    source_mtime = None
+    for quality, _, encoding, suffix in sorted(candidates, reverse=True):
+        if quality <= 0:
+            break
+        variant = path.with_name(path.name + suffix)
+        try:
+            variant_mtime = variant.stat().st_mtime_ns
+            if source_mtime is None:
+                source_mtime = path.stat().st_mtime_ns
+        except OSError:
+            continue
+        if variant_mtime >= source_mtime:
+            return encoding, variant
+    return None
@@ -13,6 +13,9 @@ import logging
 import json
 import signal
 
+from core.config import settings
+from templates.template_manager import TemplateManager
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,7 +31,7 @@ class PreviewServer:
         self.process: Optional[subprocess.Popen] = None
         self.started_at: Optional[datetime] = None
         self.last_accessed: Optional[datetime] = None
-        self.website_path = Path(f"../generated_websites/{business_id}")
+        self.website_path = Path(settings.generated_websites_dir) / business_id
         self.timeout_minutes = 30  # Auto-shutdown after 30 minutes
         
     async def start(self) -> bool:
@@ -38,11 +41,14 @@ class PreviewServer:
             return False
         
         try:
+            # Saved pages link assets through the API; serve the standalone export
+            served_path = TemplateManager().export_website(self.business_id)
+            
             # Use Python's built-in HTTP server for simplicity
             cmd = [
                 "python3", "-m", "http.server", 
                 str(self.port),
-                "--directory", str(self.website_path)
+                "--directory", str(served_path)
             ]
             
             self.process = subprocess.Popen(
@@ -0,0 +1,129 @@
+"""
+Progress - research and generation progress events for websocket clients
+
+Research and generation run in the job worker, which is usually a separate
+process from the API holding the websocket connections. Events are published
+on a Redis channel and the API relays them to its clients; without Redis they
+go straight to the handlers registered in the same process, which only reaches
+clients when the worker runs inside the API.
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import json
+import logging
+
+import redis.asyncio as redis
+
+from core.config import settings
+from services.kv_backend import backend_name
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "bizfly:progress"
+RESUBSCRIBE_SECONDS = 2.0
+
+Handler = Callable[..., Awaitable[None]]
+
+
+class ProgressBus:
+    """
+    ``publish`` from any process; ``start(handler)`` in the process serving clients
+
+    Handlers are called as ``handler(business_id=..., progress_type=..., data=...)``.
+    Progress is best effort: a lost event is logged, never raised to the job.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.client = redis.from_url(redis_url, decode_responses=True) if redis_url else None
+        self._handlers: List[Handler] = []
+        self._relay: Optional[asyncio.Task] = None
+
+    async def publish(self, business_id: str, progress_type: str, data: Dict[str, Any]):
+        event = {"business_id": business_id, "progress_type": progress_type, "data": data}
+        if self.client is not None:
+            try:
+                await self.client.publish(CHANNEL, json.dumps(event))
+                return
+            except Exception as e:
+                logger.warning(f"Progress publish failed for {business_id}, delivering locally: {e}")
+        await self._deliver(event)
+
+    async def start(self, handler: Handler):
+        """Deliver events to ``handler``; with Redis, events from every process"""
+        self._handlers.append(handler)
+        if self.client is not None and self._relay is None:
+            self._relay = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        self._handlers.clear()
+        if self._relay is not None:
+            self._relay.cancel()
+            try:
+                await self._relay
+            except asyncio.CancelledError:
+                pass
+            self._relay = None
+
+    async def _deliver(self, event: Dict[str, Any]):
+        for handler in list(self._handlers):
+            try:
+                await handler(**event)
+            except Exception as e:
+                logger.warning(f"Progress handler failed for {event.get('business_id')}: {e}")
+
+    async def _listen(self):
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        await self._deliver(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Progress relay lost Redis, resubscribing: {e}")
+                await asyncio.sleep(RESUBSCRIBE_SECONDS)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+progress_bus = ProgressBus(settings.redis_url if backend_name() == "redis" else None)
+
+
+async def send_research_progress(
+    business_id: str,
+    step: str,
+    progress: float,
+    message: str,
+    data: Optional[Dict[str, Any]] = None
+):
+    """Send research progress update; ``data`` carries extras such as a finished field"""
+    await progress_bus.publish(
+        business_id=business_id,
+        progress_type="research_progress",
+        data={
+            "step": step,
+            "progress": progress,
+            "message": message,
+            "status": "in_progress" if progress < 100 else "completed",
+            **(data or {})
+        }
+    )
+
+
+async def send_generation_progress(business_id: str, step: str, progress: float, message: str):
+    """Send website generation progress update"""
+    await progress_bus.publish(
+        business_id=business_id,
+        progress_type="generation_progress",
+        data={
+            "step": step,
+            "progress": progress,
+            "message": message,
+            "status": "in_progress" if progress < 100 else "completed"
+        }
+    )
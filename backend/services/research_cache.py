@@ -0,0 +1,67 @@
+"""
+Research Cache - content-addressed cache of LLM research results
+
+Entries are keyed by a fingerprint of everything that shapes the answer:
+the prompt inputs, the model and the prompt version. Unchanged businesses
+reuse their research; editing the business, switching models or bumping the
+prompt version naturally misses.
+"""
+from typing import Dict, Any, Optional
+import functools
+import hashlib
+import json
+import logging
+
+from core.config import settings
+from services.kv_backend import KVBackend, MemoryBackend, create_backend
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "bizfly:research:"
+
+
+def fingerprint(inputs: Dict[str, Any], model: str, prompt_version: str) -> str:
+    canonical = json.dumps(
+        {"inputs": inputs, "model": model, "prompt_version": prompt_version},
+        sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResearchCache:
+    """Research results by fingerprint, in memory unless given a shared backend"""
+
+    def __init__(self, ttl: int, backend: Optional[KVBackend] = None):
+        self.ttl = ttl
+        self.backend = backend or MemoryBackend(KEY_PREFIX)
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        data = await self.backend.get(key)
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    async def set(self, key: str, data: Dict[str, Any]):
+        await self.backend.set(key, data, self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+@functools.cache
+def get_research_cache() -> ResearchCache:
+    """Return the process-wide research cache"""
+    backend = create_backend(KEY_PREFIX, settings.research_cache_backend)
+    cache = ResearchCache(settings.research_cache_ttl_seconds, backend)
+    logger.info(f"Research cache: {backend.name}")
+    return cache
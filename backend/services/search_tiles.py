@@ -0,0 +1,52 @@
+"""
+Search Tiles - quadtree tiles already scanned for a place type
+
+Tiles derive from the search center and radius, so a repeated search of the
+same area walks the same tiles. Each tile whose Nearby Search ran to the end,
+with every place in it resolved, is recorded with the place_ids it held;
+while the record lasts, searches answer that tile from the businesses table
+instead of calling Google again.
+"""
+from typing import Any, Dict, List, Optional
+import functools
+import logging
+
+from core.config import settings
+from services.geo_tiling import Tile
+from services.kv_backend import KVBackend, MemoryBackend, create_backend
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "bizfly:tile:"
+
+
+def tile_key(place_type: str, tile: Tile) -> str:
+    lat, lng = tile.center
+    return f"{place_type}:{lat:.5f},{lng:.5f}:{round(tile.half_side)}"
+
+
+class SearchTileIndex:
+    """
+    Records of scanned tiles, in memory unless given a shared backend
+
+    A record holds the place_ids first found in the tile. ``split`` marks a
+    saturated tile: its children were scanned too and carry records of their own.
+    """
+
+    def __init__(self, backend: Optional[KVBackend] = None, ttl: Optional[int] = None):
+        self.backend = backend or MemoryBackend(KEY_PREFIX)
+        self.ttl = ttl or settings.search_tile_ttl_seconds
+
+    async def lookup(self, place_type: str, tile: Tile) -> Optional[Dict[str, Any]]:
+        return await self.backend.get(tile_key(place_type, tile))
+
+    async def record(self, place_type: str, tile: Tile, place_ids: List[str], split: bool = False):
+        await self.backend.set(tile_key(place_type, tile), {"place_ids": place_ids, "split": split}, self.ttl)
+
+
+@functools.cache
+def get_search_tiles() -> SearchTileIndex:
+    """Return the process-wide search tile index"""
+    index = SearchTileIndex(create_backend(KEY_PREFIX, settings.search_tile_backend))
+    logger.info(f"Search tile index: {index.backend.name}")
+    return index
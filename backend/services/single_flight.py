@@ -0,0 +1,130 @@
+"""
+Single Flight - collapse concurrent work for the same key into one execution
+
+Callers in the same process share one in-flight future; across processes the
+work runs under a Redis lock, so a check-then-start sequence (is a job already
+running? if not, start one) cannot interleave. When Redis is unavailable the
+lock degrades to a per-process asyncio lock.
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+from contextlib import AsyncExitStack, asynccontextmanager
+import asyncio
+import logging
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from core.config import settings
+from services.kv_backend import backend_name
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    ``await single_flight.do(key, fn)`` runs ``fn()`` once per key at a time
+
+    Concurrent callers with the same key receive the same result (or error).
+    ``fn`` should return plain data rather than ORM objects bound to the
+    first caller's session.
+    """
+
+    KEY_PREFIX = "bizfly:lock:"
+
+    def __init__(self, redis_url: Optional[str] = None, lock_timeout: float = 30, wait_timeout: float = 10):
+        self.client = redis.from_url(redis_url) if redis_url else None
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.executed = 0
+        self.shared = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._local_locks: Dict[str, list] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.shared += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting; don't warn about an unretrieved exception
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            async with self.lock(key):
+                self.executed += 1
+                result = await fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    @asynccontextmanager
+    async def lock(self, key: str):
+        """Cross-process lock for ``key``; falls back to an in-process lock"""
+        redis_lock = None
+        if self.client is not None:
+            redis_lock = self.client.lock(
+                self.KEY_PREFIX + key,
+                timeout=self.lock_timeout,
+                blocking_timeout=self.wait_timeout
+            )
+            try:
+                if not await redis_lock.acquire():
+                    raise TimeoutError(f"Timed out waiting for lock {key}")
+            except RedisError as e:
+                logger.warning(f"Redis lock unavailable for {key}, using in-process lock: {e}")
+                redis_lock = None
+
+        if redis_lock is not None:
+            try:
+                yield
+            finally:
+                try:
+                    await redis_lock.release()
+                except RedisError as e:
+                    logger.warning(f"Failed to release lock {key}: {e}")
+            return
+
+        # [lock, users]; dropped once nobody holds or waits on it
+        entry = self._local_locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._local_locks[key]
+
+    @asynccontextmanager
+    async def lock_many(self, keys):
+        """Hold the locks for several keys; sorted acquisition avoids deadlocks"""
+        async with AsyncExitStack() as stack:
+            for key in sorted(set(keys)):
+                await stack.enter_async_context(self.lock(key))
+            yield
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis" if self.client is not None else "memory",
+            "in_flight": len(self._inflight),
+            "executed": self.executed,
+            "shared": self.shared,
+        }
+
+
+def lock_redis_url() -> Optional[str]:
+    """REDIS_URL when locks are shared through Redis (see ``backend_name``), else None"""
+    if backend_name(settings.single_flight_backend) != "redis":
+        return None
+    if not settings.redis_url:
+        raise ValueError("A Redis single-flight backend needs REDIS_URL")
+    return settings.redis_url
+
+
+single_flight = SingleFlight(lock_redis_url())
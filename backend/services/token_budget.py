@@ -0,0 +1,102 @@
+"""
+Token Budget - per-minute and per-day LLM token limits shared by all workers
+
+Callers reserve an estimate before each call and settle the actual usage
+afterwards. When a window is full, ``reserve`` waits for the next window
+instead of failing, so research slows down rather than erroring out.
+"""
+from typing import Dict, Any, Optional, Tuple
+import asyncio
+import functools
+import logging
+import time
+
+from core.config import settings
+from services.kv_backend import KVBackend, MemoryBackend, create_backend
+
+logger = logging.getLogger(__name__)
+
+MINUTE = 60
+DAY = 24 * 60 * 60
+
+KEY_PREFIX = "bizfly:tokens:"
+
+
+class TokenBudget:
+    """
+    Fixed-window token counters, in memory unless given a shared backend
+
+    The backend atomically adds to a window's counter and returns the new
+    total, so reserving is add-then-check with a rollback when over the limit.
+    A failing backend counts as zero, which lets the call through.
+    """
+
+    def __init__(self, per_minute: int, per_day: int, backend: Optional[KVBackend] = None):
+        self.limits = {"minute": (MINUTE, per_minute), "day": (DAY, per_day)}
+        self.backend = backend or MemoryBackend(KEY_PREFIX)
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    async def reserve(self, tokens: int) -> Dict[str, int]:
+        """Wait until ``tokens`` fit in every window; returns the reservation"""
+        waited_since = None
+        while True:
+            reservation, retry_after = await self._try_reserve(tokens)
+            if reservation is not None:
+                if waited_since is not None:
+                    self.wait_seconds += time.monotonic() - waited_since
+                return reservation
+
+            if waited_since is None:
+                waited_since = time.monotonic()
+                self.waits += 1
+                logger.info(f"Token budget full, waiting {retry_after:.0f}s for {tokens} tokens")
+            await asyncio.sleep(retry_after)
+
+    async def settle(self, reservation: Dict[str, int], actual_tokens: int):
+        """Replace the reserved estimate with what the call actually used"""
+        delta = actual_tokens - reservation["tokens"]
+        if delta:
+            for key, ttl in self._window_keys(reservation["at"]).values():
+                await self.backend.incr(key, delta, ttl)
+
+    async def usage(self) -> Dict[str, Any]:
+        windows = self._window_keys(time.time())
+        used = {name: await self.backend.incr(key, 0, ttl) for name, (key, ttl) in windows.items()}
+        return {
+            "backend": self.backend.name,
+            "minute": {"used": used["minute"], "limit": self.limits["minute"][1]},
+            "day": {"used": used["day"], "limit": self.limits["day"][1]},
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 1),
+        }
+
+    async def _try_reserve(self, tokens: int) -> Tuple[Optional[Dict[str, int]], float]:
+        now = time.time()
+        windows = self._window_keys(now)
+        added = []
+        for name, (key, ttl) in windows.items():
+            size, limit = self.limits[name]
+            total = await self.backend.incr(key, tokens, ttl)
+            added.append((key, ttl))
+            # A single call larger than the limit is let through in an empty window
+            if total > limit and total != tokens:
+                for added_key, added_ttl in added:
+                    await self.backend.incr(added_key, -tokens, added_ttl)
+                return None, size - now % size + 0.1
+        return {"tokens": tokens, "at": int(now)}, 0.0
+
+    def _window_keys(self, at: float) -> Dict[str, Tuple[str, int]]:
+        return {
+            name: (f"{name}:{int(at // size)}", size * 2)
+            for name, (size, limit) in self.limits.items()
+        }
+
+
+@functools.cache
+def get_token_budget() -> TokenBudget:
+    """Return the process-wide research token budget"""
+    backend = create_backend(KEY_PREFIX, settings.token_budget_backend)
+    budget = TokenBudget(settings.research_tokens_per_minute, settings.research_tokens_per_day, backend)
+    logger.info(f"Token budget: {backend.name}")
+    return budget
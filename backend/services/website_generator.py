@@ -1,67 +1,219 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from uuid import UUID
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
 import logging
-import json
+import multiprocessing
+import os
 from pathlib import Path
 
+from sqlalchemy.orm import Session
+
+from core.config import settings
 from models.database import SessionLocal
 from models import GeneratedWebsite, Business, Template, BusinessResearch
-from templates.template_manager import TemplateManager
+from services.job_queue import job_queue
+from templates.template_manager import RenderTask, TemplateManager, generate_websites_task
 
 logger = logging.getLogger(__name__)
 
+# Most sites sent to a generation process per round trip
+RENDER_CHUNK_SIZE = 16
+
+_generation_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_generation_pool() -> ProcessPoolExecutor:
+    """Process pool shared by every generation in this process, created on first use"""
+    global _generation_pool
+    if _generation_pool is None:
+        workers = settings.generation_workers or os.cpu_count() or 1
+        # Spawned, not forked: the parent runs an event loop and threads
+        _generation_pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info(f"Started website generation pool with {workers} processes")
+    return _generation_pool
+
+
+def shutdown_generation_pool():
+    global _generation_pool
+    if _generation_pool is not None:
+        _generation_pool.shutdown(wait=False, cancel_futures=True)
+        _generation_pool = None
+
+
+async def render_sites(
+    tasks: List[RenderTask],
+    executor: Optional[Executor] = None,
+    output_base: Optional[str] = None,
+    force: bool = False
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Render (website_id, template_name, content, settings) tasks and write their files
+
+    Runs on ``executor`` (the shared process pool by default); returns the
+    TemplateManager result per website id, or {"success": False, "error": ...}.
+    Sites whose inputs are unchanged are skipped unless ``force`` is set.
+    Tasks go out in chunks: a site renders in well under a millisecond, about
+    what one round trip to a worker process costs.
+    """
+    if not tasks:
+        return {}
+    loop = asyncio.get_running_loop()
+    pool = executor or get_generation_pool()
+    workers = getattr(pool, "_max_workers", 1)
+    chunk_size = max(1, min(RENDER_CHUNK_SIZE, -(-len(tasks) // workers)))
+
+    async def render(chunk: List[RenderTask]):
+        try:
+            results = await loop.run_in_executor(pool, generate_websites_task, chunk, output_base, force)
+        except Exception as e:
+            logger.error(f"Failed to render {len(chunk)} websites: {e}")
+            if isinstance(e, BrokenProcessPool) and executor is None and pool is _generation_pool:
+                # A dead worker breaks the pool for good; the next batch starts a new one
+                shutdown_generation_pool()
+            results = [{"success": False, "error": str(e)}] * len(chunk)
+        for (website_id, *_), result in zip(chunk, results):
+            if not result.get("success"):
+                logger.error(f"Failed to render website {website_id}: {result.get('error')}")
+        return [(website_id, result) for (website_id, *_), result in zip(chunk, results)]
+
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    rendered = await asyncio.gather(*(render(chunk) for chunk in chunks))
+    return {website_id: result for results in rendered for website_id, result in results}
+
 
 class WebsiteGenerator:
-    def __init__(self):
-        self.output_dir = Path("generated_websites")
+    def __init__(self, executor: Optional[Executor] = None):
+        self.output_dir = Path(settings.generated_websites_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.template_manager = TemplateManager()
+        self.executor = executor
     
-    async def generate(self, website_id: UUID):
+    async def generate(self, website_id: UUID) -> Dict[str, Any]:
+        """Generate one website; raises unless it completed, so its job is retried"""
+        result = (await self.generate_batch([website_id]))[str(website_id)]
+        if result["status"] not in ("completed", "unchanged"):
+            raise RuntimeError(
+                f"Website {website_id} generation {result['status']}: {result.get('error', '')}"
+            )
+        return result
+    
+    async def generate_batch(
+        self,
+        website_ids: Iterable[UUID],
+        force: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Generate many websites, rendering them in parallel on the process pool
+        
+        Rows are loaded with one query per table. Sites whose fingerprint
+        matches the stored one and the saved files are not sent to the pool
+        at all, unless ``force`` is set. Returns a status per website id:
+        "completed" or "unchanged" with its preview_url, "failed" with an
+        error, or "not_found".
+        """
+        website_ids = list(dict.fromkeys(str(website_id) for website_id in website_ids))
+        results: Dict[str, Dict[str, Any]] = {
+            website_id: {"status": "not_found"} for website_id in website_ids
+        }
         db = SessionLocal()
         try:
-            website = db.query(GeneratedWebsite).filter(
-                GeneratedWebsite.id == website_id
-            ).first()
-            
-            if not website:
-                logger.error(f"Website {website_id} not found")
-                return
-            
-            business = db.query(Business).filter(
-                Business.id == website.business_id
-            ).first()
-            
-            template = db.query(Template).filter(
-                Template.id == website.template_id
-            ).first()
+            websites = db.query(GeneratedWebsite).filter(GeneratedWebsite.id.in_(website_ids)).all()
+            tasks, contents = self._build_tasks(db, websites)
+            for website in websites:
+                if website.id not in contents:
+                    logger.error(f"Business {website.business_id} for website {website.id} not found")
             
-            research = db.query(BusinessResearch).filter(
-                BusinessResearch.business_id == website.business_id
-            ).first()
+            if not force:
+                tasks = self._drop_unchanged(tasks, websites, results)
+            rendered = await render_sites(tasks, self.executor, force=force)
             
-            content = self._generate_content(business, research)
-            
-            template_name = template.name.lower() if template else "minimal"
-            result = self.template_manager.generate_website(
-                template_name=template_name,
-                business_data=content,
-                website_id=str(website.id)
-            )
-            
-            website.content = content
-            website.preview_url = result["preview_url"]
+            for website in websites:
+                result = rendered.get(website.id)
+                if result is None:
+                    continue
+                if not result.get("success"):
+                    results[website.id] = {"status": "failed", "error": result.get("error")}
+                    continue
+                website.content = contents[website.id]
+                website.preview_url = result["preview_url"]
+                website.fingerprint = result["fingerprint"]
+                results[website.id] = {
+                    "status": "unchanged" if result["unchanged"] else "completed",
+                    "preview_url": result["preview_url"]
+                }
             
             db.commit()
             
-            logger.info(f"Website generated successfully for {business.name}")
-            
-        except Exception as e:
-            logger.error(f"Failed to generate website: {e}")
+            completed = sum(result["status"] == "completed" for result in results.values())
+            unchanged = sum(result["status"] == "unchanged" for result in results.values())
+            logger.info(f"Generated {completed} of {len(website_ids)} websites, {unchanged} unchanged")
+            return results
+        except Exception:
             db.rollback()
+            raise
         finally:
             db.close()
     
+    def _build_tasks(
+        self,
+        db: Session,
+        websites: List[GeneratedWebsite]
+    ) -> Tuple[List[RenderTask], Dict[str, Dict[str, Any]]]:
+        business_ids = {website.business_id for website in websites}
+        businesses = {
+            business.id: business
+            for business in db.query(Business).filter(Business.id.in_(business_ids))
+        }
+        templates = {
+            template.id: template
+            for template in db.query(Template).filter(
+                Template.id.in_({website.template_id for website in websites})
+            )
+        }
+        research = {
+            item.business_id: item
+            for item in db.query(BusinessResearch).filter(BusinessResearch.business_id.in_(business_ids))
+        }
+        
+        tasks, contents = [], {}
+        for website in websites:
+            business = businesses.get(website.business_id)
+            if business is None:
+                continue
+            template = templates.get(website.template_id)
+            content = self._generate_content(business, research.get(business.id))
+            template_name = template.name.lower() if template else "minimal"
+            contents[website.id] = content
+            tasks.append((website.id, template_name, content, website.settings or {}))
+        return tasks, contents
+    
+    def _drop_unchanged(
+        self,
+        tasks: List[RenderTask],
+        websites: List[GeneratedWebsite],
+        results: Dict[str, Dict[str, Any]]
+    ) -> List[RenderTask]:
+        """Mark sites already rendered from the same inputs unchanged; returns the rest"""
+        stored = {website.id: website for website in websites}
+        remaining = []
+        for task in tasks:
+            website_id, template_name, content, website_settings = task
+            website = stored[website_id]
+            if not website.fingerprint or not self.template_manager.get_template(template_name):
+                # Never rendered, or an unknown template the render reports as failed
+                remaining.append(task)
+                continue
+            fingerprint = self.template_manager.fingerprint(template_name, content, website_settings)
+            if website.fingerprint == fingerprint and self.template_manager.is_current(website_id, fingerprint):
+                results[website_id] = {"status": "unchanged", "preview_url": website.preview_url}
+            else:
+                remaining.append(task)
+        return remaining
+    
     def _generate_content(
         self, 
         business: Business, 
@@ -90,4 +242,93 @@ class WebsiteGenerator:
                 "history": research.history
             })
         
-        return content
\ No newline at end of file
+        return content
+
+
+def get_or_create_websites(
+    db: Session,
+    business_ids: Iterable[str],
+    template_id,
+    website_settings: Optional[Dict[str, Any]] = None
+) -> Dict[str, str]:
+    """
+    The GeneratedWebsite row per business for this template; returns website ids by business id
+
+    The latest existing row is reused, so its stored fingerprint lets an
+    unchanged site skip the render; a row is added only for businesses without
+    one. ``website_settings``, when given, replace a reused row's settings.
+    """
+    business_ids = list(business_ids)
+    existing = {}
+    for website in db.query(GeneratedWebsite).filter(
+        GeneratedWebsite.business_id.in_(business_ids),
+        GeneratedWebsite.template_id == str(template_id)
+    ).order_by(GeneratedWebsite.created_at):
+        existing[website.business_id] = website
+    
+    websites = {}
+    for business_id in business_ids:
+        website = existing.get(business_id)
+        if website is None:
+            website = GeneratedWebsite(
+                business_id=business_id,
+                template_id=str(template_id),
+                content={},
+                settings=website_settings or {}
+            )
+            db.add(website)
+        elif website_settings is not None:
+            website.settings = website_settings
+        websites[business_id] = website
+    db.commit()
+    return {business_id: website.id for business_id, website in websites.items()}
+
+
+GENERATE_WEBSITE_JOB = "generate_website"
+
+
+def generation_dedupe_key(business_id, template_id) -> str:
+    return f"{GENERATE_WEBSITE_JOB}:{business_id}:{template_id}"
+
+
+async def run_generation_job(payload: Dict[str, Any]):
+    await WebsiteGenerator().generate(payload["website_id"])
+
+
+async def run_claimed_generation_jobs(
+    job_ids: Dict[str, str],
+    worker_id: str,
+    generator: Optional[WebsiteGenerator] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Generate websites whose jobs were enqueued ``claimed_by=worker_id``
+
+    ``job_ids`` maps website ids to job ids. The leases are renewed while the
+    batch renders, and each job is completed or failed with its site's result,
+    so a failed site is retried by the job worker like any other job.
+    """
+    if not job_ids:
+        return {}
+    jobs = list(job_ids.values())
+    try:
+        async with job_queue.leased(jobs, worker_id):
+            results = await (generator or WebsiteGenerator()).generate_batch(job_ids)
+    except Exception as e:
+        await asyncio.to_thread(_fail_jobs, jobs, worker_id, f"{type(e).__name__}: {e}")
+        raise
+
+    def settle():
+        for website_id, job_id in job_ids.items():
+            result = results[str(website_id)]
+            if result["status"] in ("completed", "unchanged"):
+                job_queue.complete(job_id, worker_id)
+            else:
+                job_queue.fail(job_id, worker_id, f"{result['status']}: {result.get('error', '')}")
+
+    await asyncio.to_thread(settle)
+    return results
+
+
+def _fail_jobs(job_ids: List[str], worker_id: str, error: str):
+    for job_id in job_ids:
+        job_queue.fail(job_id, worker_id, error)
@@ -10,6 +10,10 @@ from datetime import datetime
 import hashlib
 import logging
 
+from core.config import settings
+from services.precompressed import write_precompressed
+from templates.template_manager import SHARED_ASSETS_DIR, TemplateManager
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,12 +25,14 @@ class WebsiteStorage:
     generated_websites/
     ├── business_id_1/
     │   ├── index.html
+    │   ├── index.html.gz / .br (precompressed variants)
     │   ├── styles.css
     │   ├── script.js
     │   ├── images/
     │   │   ├── hero.jpg
     │   │   ├── gallery_1.jpg
     │   │   └── logo.svg
+    │   ├── export/ (standalone copy with its own assets, for zips and preview servers)
     │   └── metadata.json
     ├── business_id_2/
     │   └── ...
@@ -34,12 +40,12 @@ class WebsiteStorage:
         └── shared_assets/
     """
     
-    def __init__(self, base_path: str = "../generated_websites"):
+    def __init__(self, base_path: str = settings.generated_websites_dir):
         self.base_path = Path(base_path)
         self.base_path.mkdir(exist_ok=True)
         
         # Create shared assets directory
-        self.shared_assets = self.base_path / "templates" / "shared_assets"
+        self.shared_assets = self.base_path / SHARED_ASSETS_DIR
         self.shared_assets.mkdir(parents=True, exist_ok=True)
         
         # Static file server path (for FastAPI)
@@ -70,18 +76,21 @@ class WebsiteStorage:
         html = self._inject_local_assets(html, business_id)
         with open(html_path, 'w', encoding='utf-8') as f:
             f.write(html)
+        write_precompressed(html_path, html.encode('utf-8'))
         
         # Save CSS
         if css:
             css_path = website_dir / "styles.css"
             with open(css_path, 'w', encoding='utf-8') as f:
                 f.write(css)
+            write_precompressed(css_path, css.encode('utf-8'))
         
         # Save JavaScript
         if js:
             js_path = website_dir / "script.js"
             with open(js_path, 'w', encoding='utf-8') as f:
                 f.write(js)
+            write_precompressed(js_path, js.encode('utf-8'))
         
         # Handle images
         if images:
@@ -216,12 +225,14 @@ class WebsiteStorage:
         if not website_dir.exists():
             return None
         
-        # Create zip file
+        # Zip the standalone export, which carries its own copy of the assets
+        manager = TemplateManager()
+        manager.output_base = self.base_path
         zip_path = self.base_path / f"{business_id}.zip"
         shutil.make_archive(
             str(zip_path.with_suffix('')),
             'zip',
-            website_dir
+            manager.export_website(business_id)
         )
         
         return str(zip_path)
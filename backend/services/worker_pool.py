@@ -0,0 +1,108 @@
+"""
+Worker Pool - bounded asyncio workers fed from a queue
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted to a pool whose queue is full"""
+
+
+class WorkerPool:
+    """
+    Runs ``handler(job)`` for queued jobs with at most ``concurrency`` in flight
+
+    Jobs are processed in submission order. Queue depth and in-flight count
+    are exposed through ``stats()`` so callers can see backlog building up.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[None]],
+        concurrency: int,
+        max_queue: int = 0
+    ):
+        self.name = name
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    @property
+    def is_full(self) -> bool:
+        return self._queue is not None and self._queue.full()
+
+    async def start(self):
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"{self.name}-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(f"Started {self.name} pool with {self.concurrency} workers")
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info(f"Stopped {self.name} pool")
+
+    async def submit(self, job: Any):
+        """Queue a job; raises QueueFullError instead of blocking the caller"""
+        if not self.running:
+            await self.start()
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"{self.name} queue is full ({self.max_queue} jobs)")
+
+    async def join(self):
+        """Wait until every queued job has been processed"""
+        if self._queue:
+            await self._queue.join()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            self.in_flight += 1
+            try:
+                await self.handler(job)
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"{self.name} job {job} failed: {e}")
+            finally:
+                self.in_flight -= 1
+                self._queue.task_done()
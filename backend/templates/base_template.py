@@ -1,9 +1,60 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from html import escape
+import hashlib
+import inspect
 import json
+import re
 from pathlib import Path
 
 
+# {{name}} is replaced by the escaped value, {{name|raw}} by trusted markup
+_SLOT = re.compile(r"\{\{(\w+)(\|raw)?\}\}")
+
+# Base names of the shared asset files, by asset kind
+ASSET_NAMES = {"css": "styles", "js": "script"}
+
+
+class CompiledTemplate:
+    """
+    Template source split once into static chunks and dynamic slots
+
+    ``static`` values are inlined at compile time and merged into the
+    surrounding chunks, so rendering only fills the slots and joins.
+    """
+
+    __slots__ = ("_parts", "_slots")
+
+    def __init__(self, source: str, static: Optional[Dict[str, str]] = None):
+        static = static or {}
+        parts: List[str] = [""]
+        slots: List[Tuple[int, str, bool]] = []
+        pos = 0
+        for match in _SLOT.finditer(source):
+            name, raw = match.group(1), bool(match.group(2))
+            parts[-1] += source[pos:match.start()]
+            if name in static:
+                parts[-1] += static[name] if raw else escape(static[name])
+            else:
+                slots.append((len(parts), name, raw))
+                parts += [None, ""]
+            pos = match.end()
+        parts[-1] += source[pos:]
+        self._parts = parts
+        self._slots = slots
+
+    @property
+    def slots(self) -> List[str]:
+        return [name for _, name, _ in self._slots]
+
+    def render(self, context: Dict[str, Any]) -> str:
+        parts = self._parts.copy()
+        for index, name, raw in self._slots:
+            value = context[name]
+            parts[index] = value if raw else escape(str(value))
+        return "".join(parts)
+
+
 class BaseTemplate(ABC):
     def __init__(self, name: str, category: str):
         self.name = name
@@ -11,6 +62,10 @@ class BaseTemplate(ABC):
         self.components = {}
         self.styles = {}
         self.structure = {}
+        # Compiled pages by asset URL; None inlines the assets
+        self._compiled: Dict[Optional[str], CompiledTemplate] = {}
+        self._asset_files: Optional[Dict[str, Tuple[str, str]]] = None
+        self._version: Optional[str] = None
     
     @abstractmethod
     def get_structure(self) -> Dict[str, Any]:
@@ -21,12 +76,88 @@ class BaseTemplate(ABC):
         pass
     
     @abstractmethod
-    def render(self, business_data: Dict[str, Any]) -> str:
-        pass
+    def get_page(self) -> str:
+        """Page source with {{slot}} markers; compiled once per template instance"""
+    
+    def get_static_slots(self) -> Dict[str, str]:
+        """Slots that do not depend on business data, inlined at compile time"""
+        return {}
+    
+    def get_assets(self) -> Dict[str, str]:
+        """CSS and JS shared by every page of this template, keyed by kind ("css", "js")"""
+        return {}
+    
+    @abstractmethod
+    def get_context(self, business_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Values for the page's dynamic slots"""
+    
+    @property
+    def asset_files(self) -> Dict[str, Tuple[str, str]]:
+        """Content-hashed file name and content for each asset kind"""
+        if self._asset_files is None:
+            self._asset_files = {
+                kind: (
+                    f"{ASSET_NAMES[kind]}.{hashlib.sha256(content.encode()).hexdigest()[:12]}.{kind}",
+                    content
+                )
+                for kind, content in self.get_assets().items()
+            }
+        return self._asset_files
+    
+    @property
+    def version(self) -> str:
+        """
+        Hash of the template's code, page source and assets
+
+        The code covers fragments and get_context, so any edit to the template
+        module (or to this one) changes the version.
+        """
+        if self._version is None:
+            digest = hashlib.sha256()
+            for module in sorted({inspect.getfile(BaseTemplate), inspect.getfile(type(self))}):
+                digest.update(Path(module).read_bytes())
+            digest.update(json.dumps(
+                [self.get_page(), self.get_static_slots(), self.get_assets()], sort_keys=True
+            ).encode())
+            self._version = digest.hexdigest()[:12]
+        return self._version
+    
+    def compile(self, asset_url: Optional[str] = None) -> CompiledTemplate:
+        """
+        Compile the page, inlining its assets or linking them under ``asset_url``
+        
+        Pages place the assets with the {{stylesheet|raw}} and {{script|raw}} slots.
+        """
+        static = dict(self.get_static_slots())
+        if asset_url is None:
+            assets = self.get_assets()
+            if "css" in assets:
+                static["stylesheet"] = f"<style>\n        {assets['css']}\n    </style>"
+            if "js" in assets:
+                static["script"] = f"<script>\n        {assets['js']}\n    </script>"
+        else:
+            files = self.asset_files
+            if "css" in files:
+                static["stylesheet"] = f'<link rel="stylesheet" href="{asset_url}/{files["css"][0]}">'
+            if "js" in files:
+                static["script"] = f'<script src="{asset_url}/{files["js"][0]}"></script>'
+        return CompiledTemplate(self.get_page(), static)
+    
+    @property
+    def compiled(self) -> CompiledTemplate:
+        return self.compiled_for(None)
+    
+    def compiled_for(self, asset_url: Optional[str]) -> CompiledTemplate:
+        if asset_url not in self._compiled:
+            self._compiled[asset_url] = self.compile(asset_url)
+        return self._compiled[asset_url]
+    
+    def render(self, business_data: Dict[str, Any], asset_url: Optional[str] = None) -> str:
+        return self.compiled_for(asset_url).render(self.get_context(business_data))
     
     def get_component(self, component_name: str) -> str:
         return self.components.get(component_name, "")
     
     def save_to_file(self, content: str, output_path: Path):
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(content, encoding='utf-8')
\ No newline at end of file
+        output_path.write_text(content, encoding='utf-8')
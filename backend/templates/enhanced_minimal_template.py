@@ -39,7 +39,14 @@ class EnhancedMinimalTemplate(BaseTemplate):
             }
         }
         
-    def render(self, business_data: Dict[str, Any]) -> str:
+    def get_page(self) -> str:
+        # The page is built whole from its own f-string rather than from slots
+        return "{{page|raw}}"
+    
+    def get_context(self, business_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {"page": self._render_page(business_data)}
+    
+    def _render_page(self, business_data: Dict[str, Any]) -> str:
         business = business_data.get("business", {})
         name = business.get("name", "Business Name")
         address = business.get("address", "")
@@ -1,5 +1,56 @@
 from typing import Dict, Any
-from .base_template import BaseTemplate
+from .base_template import BaseTemplate, CompiledTemplate
+
+
+CALL_BUTTON = CompiledTemplate('<a href="tel:{{phone}}" class="btn btn-secondary">Call Now</a>')
+
+SERVICE_CARD = CompiledTemplate("""<div class="service-card">
+                <h3>{{service}}</h3>
+                <p>Exquisite {{service_lower}} delivered with uncompromising attention to detail and luxury standards.</p>
+            </div>""")
+
+SERVICES_SECTION = CompiledTemplate("""
+        <section id="services" class="section">
+            <div class="container">
+                <div class="section-header">
+                    <h2 class="section-title">Our Premium Services</h2>
+                    <div class="section-divider"></div>
+                </div>
+                <div class="services-grid">
+                    {{items|raw}}
+                </div>
+            </div>
+        </section>
+        """)
+
+ADDRESS_ITEM = CompiledTemplate("""<div class="contact-item">
+                        <h3>Visit Us</h3>
+                        <p>{{address}}</p>
+                    </div>""")
+
+PHONE_ITEM = CompiledTemplate("""<div class="contact-item">
+                        <h3>Call Us</h3>
+                        <p><a href="tel:{{phone}}">{{phone}}</a></p>
+                    </div>""")
+
+CONTACT_SECTION = CompiledTemplate("""
+        <section id="contact" class="section contact-section">
+            <div class="container">
+                <div class="section-header">
+                    <h2 class="section-title">Get in Touch</h2>
+                    <div class="section-divider"></div>
+                </div>
+                <div class="contact-info">
+                    {{address|raw}}
+                    {{phone|raw}}
+                    <div class="contact-item">
+                        <h3>Experience</h3>
+                        <p>Luxury service awaits you. Contact us to discover excellence.</p>
+                    </div>
+                </div>
+            </div>
+        </section>
+        """)
 
 
 class LuxuryTemplate(BaseTemplate):
@@ -44,29 +95,20 @@ class LuxuryTemplate(BaseTemplate):
             }
         }
     
-    def render(self, business_data: Dict[str, Any]) -> str:
-        business = business_data.get("business", {})
-        name = business.get("name", "Business Name")
-        address = business.get("address", "")
-        phone = business.get("phone", "")
-        description = business_data.get("description", "")
-        services = business_data.get("services", [])
-        
-        html = f"""<!DOCTYPE html>
+    def get_page(self) -> str:
+        return """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{name} - Luxury Experience</title>
-    <meta name="description" content="{description or f'{name} - Premium services with unmatched excellence'}">
-    <style>
-        {self._generate_css()}
-    </style>
+    <title>{{name}} - Luxury Experience</title>
+    <meta name="description" content="{{meta_description}}">
+    {{stylesheet|raw}}
 </head>
 <body>
     <nav class="navbar" id="navbar">
         <div class="container">
-            <div class="nav-brand">{name}</div>
+            <div class="nav-brand">{{name}}</div>
             <ul class="nav-menu">
                 <li><a href="#home">Home</a></li>
                 <li><a href="#about">About</a></li>
@@ -81,11 +123,11 @@ class LuxuryTemplate(BaseTemplate):
         <div class="hero-overlay"></div>
         <div class="container">
             <div class="hero-content">
-                <h1 class="hero-title">{name}</h1>
-                <p class="hero-subtitle">{description or 'Luxury. Excellence. Uncompromising Quality.'}</p>
+                <h1 class="hero-title">{{name}}</h1>
+                <p class="hero-subtitle">{{tagline}}</p>
                 <div class="hero-actions">
                     <a href="#contact" class="btn btn-primary">Experience Excellence</a>
-                    {f'<a href="tel:{phone}" class="btn btn-secondary">Call Now</a>' if phone else ''}
+                    {{call_button|raw}}
                 </div>
             </div>
         </div>
@@ -101,52 +143,54 @@ class LuxuryTemplate(BaseTemplate):
                 <div class="section-divider"></div>
             </div>
             <div class="about-content">
-                <p class="about-text">{description or f'Welcome to {name}, where luxury meets exceptional service. We are dedicated to providing an unparalleled experience that exceeds your every expectation.'}</p>
+                <p class="about-text">{{about}}</p>
             </div>
         </div>
     </section>
 
-    {self._render_services(services)}
-    {self._render_contact(business)}
+    {{services|raw}}
+    {{contact|raw}}
     
     <footer class="footer">
         <div class="container">
             <div class="footer-content">
                 <div class="footer-brand">
-                    <h3>{name}</h3>
+                    <h3>{{name}}</h3>
                     <p>Excellence in every detail</p>
                 </div>
                 <div class="footer-info">
-                    <p>&copy; 2024 {name}. All rights reserved.</p>
+                    <p>&copy; 2024 {{name}}. All rights reserved.</p>
                 </div>
             </div>
         </div>
     </footer>
 
-    <script>
-        // Smooth scrolling and navbar effects
-        window.addEventListener('scroll', function() {{
-            const navbar = document.getElementById('navbar');
-            if (window.scrollY > 100) {{
-                navbar.classList.add('scrolled');
-            }} else {{
-                navbar.classList.remove('scrolled');
-            }}
-        }});
-
-        // Smooth scroll for navigation links
-        document.querySelectorAll('a[href^="#"]').forEach(anchor => {{
-            anchor.addEventListener('click', function (e) {{
-                e.preventDefault();
-                document.querySelector(this.getAttribute('href')).scrollIntoView({{
-                    behavior: 'smooth'
-                }});
-            }});
-        }});
-    </script>
+    {{script|raw}}
 </body>
 </html>"""
-        return html
+    
+    def get_assets(self) -> Dict[str, str]:
+        return {"css": self._generate_css(), "js": self._generate_js()}
+    
+    def get_context(self, business_data: Dict[str, Any]) -> Dict[str, Any]:
+        business = business_data.get("business", {})
+        name = business.get("name", "Business Name")
+        phone = business.get("phone", "")
+        description = business_data.get("description", "")
+        services = business_data.get("services", [])
+        
+        return {
+            "name": name,
+            "meta_description": description or f"{name} - Premium services with unmatched excellence",
+            "tagline": description or "Luxury. Excellence. Uncompromising Quality.",
+            "call_button": CALL_BUTTON.render({"phone": phone}) if phone else "",
+            "about": description or (
+                f"Welcome to {name}, where luxury meets exceptional service. We are dedicated to "
+                "providing an unparalleled experience that exceeds your every expectation."
+            ),
+            "services": self._render_services(services),
+            "contact": self._render_contact(business),
+        }
     
     def _generate_css(self) -> str:
         styles = self.get_styles()
@@ -684,52 +728,37 @@ class LuxuryTemplate(BaseTemplate):
             return ""
         
         service_items = "".join([
-            f"""<div class="service-card">
-                <h3>{service}</h3>
-                <p>Exquisite {service.lower()} delivered with uncompromising attention to detail and luxury standards.</p>
-            </div>"""
+            SERVICE_CARD.render({"service": service, "service_lower": service.lower()})
             for service in services[:6]
         ])
-        
-        return f"""
-        <section id="services" class="section">
-            <div class="container">
-                <div class="section-header">
-                    <h2 class="section-title">Our Premium Services</h2>
-                    <div class="section-divider"></div>
-                </div>
-                <div class="services-grid">
-                    {service_items}
-                </div>
-            </div>
-        </section>
-        """
+        return SERVICES_SECTION.render({"items": service_items})
     
     def _render_contact(self, business: Dict[str, Any]) -> str:
         address = business.get("address", "")
         phone = business.get("phone", "")
         
-        return f"""
-        <section id="contact" class="section contact-section">
-            <div class="container">
-                <div class="section-header">
-                    <h2 class="section-title">Get in Touch</h2>
-                    <div class="section-divider"></div>
-                </div>
-                <div class="contact-info">
-                    {f'''<div class="contact-item">
-                        <h3>Visit Us</h3>
-                        <p>{address}</p>
-                    </div>''' if address else ''}
-                    {f'''<div class="contact-item">
-                        <h3>Call Us</h3>
-                        <p><a href="tel:{phone}">{phone}</a></p>
-                    </div>''' if phone else ''}
-                    <div class="contact-item">
-                        <h3>Experience</h3>
-                        <p>Luxury service awaits you. Contact us to discover excellence.</p>
-                    </div>
-                </div>
-            </div>
-        </section>
-        """
\ No newline at end of file
+        return CONTACT_SECTION.render({
+            "address": ADDRESS_ITEM.render({"address": address}) if address else "",
+            "phone": PHONE_ITEM.render({"phone": phone}) if phone else "",
+        })
+    
+    def _generate_js(self) -> str:
+        return """// Smooth scrolling and navbar effects
+        window.addEventListener('scroll', function() {
+            const navbar = document.getElementById('navbar');
+            if (window.scrollY > 100) {
+                navbar.classList.add('scrolled');
+            } else {
+                navbar.classList.remove('scrolled');
+            }
+        });
+
+        // Smooth scroll for navigation links
+        document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+            anchor.addEventListener('click', function (e) {
+                e.preventDefault();
+                document.querySelector(this.getAttribute('href')).scrollIntoView({
+                    behavior: 'smooth'
+                });
+            });
+        });"""
@@ -1,5 +1,46 @@
 from typing import Dict, Any
-from .base_template import BaseTemplate
+from .base_template import BaseTemplate, CompiledTemplate
+
+
+CALL_BUTTON = CompiledTemplate('<a href="tel:{{phone}}" class="btn btn-secondary">Call Now</a>')
+
+SERVICE_CARD = CompiledTemplate("""<div class="service-card">
+                <h3>{{service}}</h3>
+                <p>Professional {{service_lower}} services</p>
+            </div>""")
+
+SERVICES_SECTION = CompiledTemplate("""
+        <section id="services" class="section">
+            <div class="container">
+                <h2>Our Services</h2>
+                <div class="services-grid">
+                    {{items|raw}}
+                </div>
+            </div>
+        </section>
+        """)
+
+ADDRESS_ITEM = CompiledTemplate("""<div class="contact-item">
+                        <h3>Address</h3>
+                        <p>{{address}}</p>
+                    </div>""")
+
+PHONE_ITEM = CompiledTemplate("""<div class="contact-item">
+                        <h3>Phone</h3>
+                        <p><a href="tel:{{phone}}">{{phone}}</a></p>
+                    </div>""")
+
+CONTACT_SECTION = CompiledTemplate("""
+        <section id="contact" class="section">
+            <div class="container">
+                <h2>Contact Us</h2>
+                <div class="contact-info">
+                    {{address|raw}}
+                    {{phone|raw}}
+                </div>
+            </div>
+        </section>
+        """)
 
 
 class MinimalTemplate(BaseTemplate):
@@ -43,30 +84,20 @@ class MinimalTemplate(BaseTemplate):
             }
         }
     
-    def render(self, business_data: Dict[str, Any]) -> str:
-        business = business_data.get("business", {})
-        name = business.get("name", "Business Name")
-        address = business.get("address", "")
-        phone = business.get("phone", "")
-        description = business_data.get("description", "")
-        services = business_data.get("services", [])
-        hours = business_data.get("hours", {})
-        
-        html = f"""<!DOCTYPE html>
+    def get_page(self) -> str:
+        return """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{name} - Professional Services</title>
-    <meta name="description" content="{description or f'{name} - Quality services in your area'}">
-    <style>
-        {self._generate_css()}
-    </style>
+    <title>{{name}} - Professional Services</title>
+    <meta name="description" content="{{meta_description}}">
+    {{stylesheet|raw}}
 </head>
 <body>
     <nav class="navbar">
         <div class="container">
-            <div class="nav-brand">{name}</div>
+            <div class="nav-brand">{{name}}</div>
             <ul class="nav-menu">
                 <li><a href="#home">Home</a></li>
                 <li><a href="#about">About</a></li>
@@ -78,11 +109,11 @@ class MinimalTemplate(BaseTemplate):
 
     <section id="home" class="hero">
         <div class="container">
-            <h1>{name}</h1>
-            <p class="hero-subtitle">{description or 'Quality Services You Can Trust'}</p>
+            <h1>{{name}}</h1>
+            <p class="hero-subtitle">{{tagline}}</p>
             <div class="hero-actions">
                 <a href="#contact" class="btn btn-primary">Get in Touch</a>
-                {f'<a href="tel:{phone}" class="btn btn-secondary">Call Now</a>' if phone else ''}
+                {{call_button|raw}}
             </div>
         </div>
     </section>
@@ -90,21 +121,40 @@ class MinimalTemplate(BaseTemplate):
     <section id="about" class="section">
         <div class="container">
             <h2>About Us</h2>
-            <p>{description or f'Welcome to {name}. We are dedicated to providing exceptional service to our community.'}</p>
+            <p>{{about}}</p>
         </div>
     </section>
 
-    {self._render_services(services)}
-    {self._render_contact(business)}
+    {{services|raw}}
+    {{contact|raw}}
     
     <footer class="footer">
         <div class="container">
-            <p>&copy; 2024 {name}. All rights reserved.</p>
+            <p>&copy; 2024 {{name}}. All rights reserved.</p>
         </div>
     </footer>
 </body>
 </html>"""
-        return html
+    
+    def get_assets(self) -> Dict[str, str]:
+        return {"css": self._generate_css()}
+    
+    def get_context(self, business_data: Dict[str, Any]) -> Dict[str, Any]:
+        business = business_data.get("business", {})
+        name = business.get("name", "Business Name")
+        phone = business.get("phone", "")
+        description = business_data.get("description", "")
+        services = business_data.get("services", [])
+        
+        return {
+            "name": name,
+            "meta_description": description or f"{name} - Quality services in your area",
+            "tagline": description or "Quality Services You Can Trust",
+            "about": description or f"Welcome to {name}. We are dedicated to providing exceptional service to our community.",
+            "call_button": CALL_BUTTON.render({"phone": phone}) if phone else "",
+            "services": self._render_services(services),
+            "contact": self._render_contact(business),
+        }
     
     def _generate_css(self) -> str:
         styles = self.get_styles()
@@ -408,42 +458,16 @@ class MinimalTemplate(BaseTemplate):
             return ""
         
         service_items = "".join([
-            f"""<div class="service-card">
-                <h3>{service}</h3>
-                <p>Professional {service.lower()} services</p>
-            </div>"""
+            SERVICE_CARD.render({"service": service, "service_lower": service.lower()})
             for service in services[:6]
         ])
-        
-        return f"""
-        <section id="services" class="section">
-            <div class="container">
-                <h2>Our Services</h2>
-                <div class="services-grid">
-                    {service_items}
-                </div>
-            </div>
-        </section>
-        """
+        return SERVICES_SECTION.render({"items": service_items})
     
     def _render_contact(self, business: Dict[str, Any]) -> str:
         address = business.get("address", "")
         phone = business.get("phone", "")
         
-        return f"""
-        <section id="contact" class="section">
-            <div class="container">
-                <h2>Contact Us</h2>
-                <div class="contact-info">
-                    {f'''<div class="contact-item">
-                        <h3>Address</h3>
-                        <p>{address}</p>
-                    </div>''' if address else ''}
-                    {f'''<div class="contact-item">
-                        <h3>Phone</h3>
-                        <p><a href="tel:{phone}">{phone}</a></p>
-                    </div>''' if phone else ''}
-                </div>
-            </div>
-        </section>
-        """
\ No newline at end of file
+        return CONTACT_SECTION.render({
+            "address": ADDRESS_ITEM.render({"address": address}) if address else "",
+            "phone": PHONE_ITEM.render({"phone": phone}) if phone else "",
+        })
@@ -1,5 +1,80 @@
 from typing import Dict, Any
-from .base_template import BaseTemplate
+from .base_template import BaseTemplate, CompiledTemplate
+
+
+CALL_BUTTON = CompiledTemplate('<a href="tel:{{phone}}" class="btn btn-outline">Call {{phone}}</a>')
+
+SERVICE_CARD = CompiledTemplate("""<div class="service-modern">
+                <h3>{{service}}</h3>
+                <p>Professional {{service_lower}} services tailored to your needs</p>
+            </div>""")
+
+SERVICES_SECTION = CompiledTemplate("""
+        <section id="services" class="section">
+            <div class="container">
+                <div class="section-header">
+                    <h2>Our Services</h2>
+                    <p class="section-subtitle">Comprehensive solutions for your needs</p>
+                </div>
+                <div class="services-modern">
+                    {{items|raw}}
+                </div>
+            </div>
+        </section>
+        """)
+
+TESTIMONIAL_CARD = CompiledTemplate("""<div class="testimonial-card">
+                <p class="testimonial-text">"{{text}}"</p>
+                <p class="testimonial-author">- {{author}}</p>
+            </div>""")
+
+TESTIMONIALS_SECTION = CompiledTemplate("""
+        <section class="section section-alt">
+            <div class="container">
+                <div class="section-header">
+                    <h2>What Our Clients Say</h2>
+                    <p class="section-subtitle">Don't just take our word for it</p>
+                </div>
+                <div class="testimonials-grid">
+                    {{items|raw}}
+                </div>
+            </div>
+        </section>
+        """)
+
+HOURS_ROW = CompiledTemplate("<tr><td>{{day}}</td><td>{{time}}</td></tr>")
+
+HOURS_TABLE = CompiledTemplate("""
+            <div class="hours-table">
+                <h3>Business Hours</h3>
+                <table>
+                    {{rows|raw}}
+                </table>
+            </div>
+            """)
+
+ADDRESS_LINE = CompiledTemplate("<p><strong>Address:</strong><br>{{address}}</p>")
+
+PHONE_LINE = CompiledTemplate('<p><strong>Phone:</strong><br><a href="tel:{{phone}}">{{phone}}</a></p>')
+
+CONTACT_SECTION = CompiledTemplate("""
+        <section id="contact" class="section">
+            <div class="container">
+                <div class="section-header">
+                    <h2>Get In Touch</h2>
+                    <p class="section-subtitle">We're here to help</p>
+                </div>
+                <div class="contact-modern">
+                    <div class="contact-info-modern">
+                        <h3>Contact Information</h3>
+                        {{address|raw}}
+                        {{phone|raw}}
+                    </div>
+                    {{hours|raw}}
+                </div>
+            </div>
+        </section>
+        """)
 
 
 class ModernTemplate(BaseTemplate):
@@ -41,35 +116,24 @@ class ModernTemplate(BaseTemplate):
             }
         }
     
-    def render(self, business_data: Dict[str, Any]) -> str:
-        business = business_data.get("business", {})
-        name = business.get("name", "Business Name")
-        address = business.get("address", "")
-        phone = business.get("phone", "")
-        description = business_data.get("description", "")
-        services = business_data.get("services", [])
-        hours = business_data.get("hours", {})
-        reviews = business_data.get("reviews", [])
-        
-        html = f"""<!DOCTYPE html>
+    def get_page(self) -> str:
+        return """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{name} - Modern Business Solutions</title>
-    <meta name="description" content="{description or f'{name} - Innovative solutions for your needs'}">
+    <title>{{name}} - Modern Business Solutions</title>
+    <meta name="description" content="{{meta_description}}">
     <link rel="preconnect" href="https://fonts.googleapis.com">
     <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
     <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Poppins:wght@600;700&display=swap" rel="stylesheet">
-    <style>
-        {self._generate_css()}
-    </style>
+    {{stylesheet|raw}}
 </head>
 <body>
     <nav class="navbar">
         <div class="container">
             <div class="nav-wrapper">
-                <div class="nav-brand">{name}</div>
+                <div class="nav-brand">{{name}}</div>
                 <ul class="nav-menu">
                     <li><a href="#home">Home</a></li>
                     <li><a href="#about">About</a></li>
@@ -85,39 +149,39 @@ class ModernTemplate(BaseTemplate):
         <div class="hero-bg"></div>
         <div class="container">
             <div class="hero-content">
-                <h1 class="hero-title">{name}</h1>
-                <p class="hero-subtitle">{description or 'Excellence in Every Detail'}</p>
+                <h1 class="hero-title">{{name}}</h1>
+                <p class="hero-subtitle">{{tagline}}</p>
                 <div class="hero-actions">
                     <a href="#services" class="btn btn-primary">Our Services</a>
-                    {f'<a href="tel:{phone}" class="btn btn-outline">Call {phone}</a>' if phone else ''}
+                    {{call_button|raw}}
                 </div>
             </div>
         </div>
     </section>
 
-    {self._render_features()}
+    {{features|raw}}
     
     <section id="about" class="section section-alt">
         <div class="container">
             <div class="section-header">
-                <h2>About {name}</h2>
-                <p class="section-subtitle">{description or 'Your trusted partner for quality services'}</p>
+                <h2>About {{name}}</h2>
+                <p class="section-subtitle">{{about_subtitle}}</p>
             </div>
             <div class="about-content">
-                <p>{description or f'{name} is committed to delivering exceptional service and building lasting relationships with our clients. Our dedication to quality and customer satisfaction sets us apart.'}</p>
+                <p>{{about}}</p>
             </div>
         </div>
     </section>
 
-    {self._render_services_modern(services)}
-    {self._render_testimonials(reviews)}
-    {self._render_contact_modern(business, hours)}
+    {{services|raw}}
+    {{testimonials|raw}}
+    {{contact|raw}}
     
     <footer class="footer">
         <div class="container">
             <div class="footer-content">
                 <div class="footer-brand">
-                    <h3>{name}</h3>
+                    <h3>{{name}}</h3>
                     <p>Quality service you can trust</p>
                 </div>
                 <div class="footer-links">
@@ -127,17 +191,44 @@ class ModernTemplate(BaseTemplate):
                 </div>
             </div>
             <div class="footer-bottom">
-                <p>&copy; 2024 {name}. All rights reserved.</p>
+                <p>&copy; 2024 {{name}}. All rights reserved.</p>
             </div>
         </div>
     </footer>
 
-    <script>
-        {self._generate_js()}
-    </script>
+    {{script|raw}}
 </body>
 </html>"""
-        return html
+    
+    def get_static_slots(self) -> Dict[str, str]:
+        return {"features": self._render_features()}
+    
+    def get_assets(self) -> Dict[str, str]:
+        return {"css": self._generate_css(), "js": self._generate_js()}
+    
+    def get_context(self, business_data: Dict[str, Any]) -> Dict[str, Any]:
+        business = business_data.get("business", {})
+        name = business.get("name", "Business Name")
+        phone = business.get("phone", "")
+        description = business_data.get("description", "")
+        services = business_data.get("services", [])
+        hours = business_data.get("hours", {})
+        reviews = business_data.get("reviews", [])
+        
+        return {
+            "name": name,
+            "meta_description": description or f"{name} - Innovative solutions for your needs",
+            "tagline": description or "Excellence in Every Detail",
+            "call_button": CALL_BUTTON.render({"phone": phone}) if phone else "",
+            "about_subtitle": description or "Your trusted partner for quality services",
+            "about": description or (
+                f"{name} is committed to delivering exceptional service and building lasting relationships "
+                "with our clients. Our dedication to quality and customer satisfaction sets us apart."
+            ),
+            "services": self._render_services_modern(services),
+            "testimonials": self._render_testimonials(reviews),
+            "contact": self._render_contact_modern(business, hours),
+        }
     
     def _generate_css(self) -> str:
         styles = self.get_styles()
@@ -547,52 +638,23 @@ class ModernTemplate(BaseTemplate):
             return ""
         
         service_items = "".join([
-            f"""<div class="service-modern">
-                <h3>{service}</h3>
-                <p>Professional {service.lower()} services tailored to your needs</p>
-            </div>"""
+            SERVICE_CARD.render({"service": service, "service_lower": service.lower()})
             for service in services[:6]
         ])
-        
-        return f"""
-        <section id="services" class="section">
-            <div class="container">
-                <div class="section-header">
-                    <h2>Our Services</h2>
-                    <p class="section-subtitle">Comprehensive solutions for your needs</p>
-                </div>
-                <div class="services-modern">
-                    {service_items}
-                </div>
-            </div>
-        </section>
-        """
+        return SERVICES_SECTION.render({"items": service_items})
     
     def _render_testimonials(self, reviews: list) -> str:
         if not reviews or len(reviews) == 0:
             return ""
         
         review_items = "".join([
-            f"""<div class="testimonial-card">
-                <p class="testimonial-text">"{review.get('text', 'Great service!')[:200]}"</p>
-                <p class="testimonial-author">- {review.get('author', 'Happy Customer')}</p>
-            </div>"""
+            TESTIMONIAL_CARD.render({
+                "text": review.get('text', 'Great service!')[:200],
+                "author": review.get('author', 'Happy Customer')
+            })
             for review in reviews[:3]
         ])
-        
-        return f"""
-        <section class="section section-alt">
-            <div class="container">
-                <div class="section-header">
-                    <h2>What Our Clients Say</h2>
-                    <p class="section-subtitle">Don't just take our word for it</p>
-                </div>
-                <div class="testimonials-grid">
-                    {review_items}
-                </div>
-            </div>
-        </section>
-        """
+        return TESTIMONIALS_SECTION.render({"items": review_items})
     
     def _render_contact_modern(self, business: Dict[str, Any], hours: Dict[str, str]) -> str:
         address = business.get("address", "")
@@ -601,36 +663,16 @@ class ModernTemplate(BaseTemplate):
         hours_html = ""
         if hours:
             hours_rows = "".join([
-                f"<tr><td>{day}</td><td>{time}</td></tr>"
+                HOURS_ROW.render({"day": day, "time": time})
                 for day, time in hours.items()
             ])
-            hours_html = f"""
-            <div class="hours-table">
-                <h3>Business Hours</h3>
-                <table>
-                    {hours_rows}
-                </table>
-            </div>
-            """
+            hours_html = HOURS_TABLE.render({"rows": hours_rows})
         
-        return f"""
-        <section id="contact" class="section">
-            <div class="container">
-                <div class="section-header">
-                    <h2>Get In Touch</h2>
-                    <p class="section-subtitle">We're here to help</p>
-                </div>
-                <div class="contact-modern">
-                    <div class="contact-info-modern">
-                        <h3>Contact Information</h3>
-                        {f'<p><strong>Address:</strong><br>{address}</p>' if address else ''}
-                        {f'<p><strong>Phone:</strong><br><a href="tel:{phone}">{phone}</a></p>' if phone else ''}
-                    </div>
-                    {hours_html}
-                </div>
-            </div>
-        </section>
-        """
+        return CONTACT_SECTION.render({
+            "address": ADDRESS_LINE.render({"address": address}) if address else "",
+            "phone": PHONE_LINE.render({"phone": phone}) if phone else "",
+            "hours": hours_html,
+        })
     
     def _generate_js(self) -> str:
         return """
@@ -1,10 +1,33 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
+import hashlib
 import json
+import os
+import shutil
+import tempfile
 from .minimal_template import MinimalTemplate
 from .modern_template import ModernTemplate
 from .luxury_template import LuxuryTemplate
 from .base_template import BaseTemplate
+from core.config import settings
+from services.precompressed import ENCODINGS, write_precompressed
+
+DEFAULT_OUTPUT_BASE = Path(settings.generated_websites_dir)
+# Content-hashed CSS/JS shared by every site built from the same template version,
+# published once here, relative to the output base
+SHARED_ASSETS_DIR = Path("templates") / "shared_assets"
+# Saved pages link the shared files at the API's immutable asset route, so a
+# browser fetches them once for every preview built from the same template
+SHARED_ASSETS_URL = "/preview/assets"
+# Exports (zips, preview servers) run without the API: the page is copied into
+# the site's export directory and links the assets relatively, from there
+SITE_EXPORT_DIR = "export"
+SITE_ASSETS_DIR = "assets"
+# Part of every fingerprint; bump when the layout of saved sites changes
+OUTPUT_VERSION = 3
+
+# (website_id, template_name, business_data, website_settings)
+RenderTask = Tuple[str, str, Dict[str, Any], Dict[str, Any]]
 
 
 class TemplateManager:
@@ -14,7 +37,7 @@ class TemplateManager:
             "modern": ModernTemplate(),
             "luxury": LuxuryTemplate()
         }
-        self.output_base = Path("generated_websites")
+        self.output_base = DEFAULT_OUTPUT_BASE
     
     def get_template(self, template_name: str) -> Optional[BaseTemplate]:
         return self.templates.get(template_name)
@@ -35,34 +58,166 @@ class TemplateManager:
         self,
         template_name: str,
         business_data: Dict[str, Any],
-        website_id: str
+        website_id: str,
+        force: bool = False,
+        website_settings: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
+        """
+        Render and save a site, skipping the render when its inputs are unchanged
+
+        The input fingerprint is stored in metadata.json. When it matches (and
+        ``force`` is not set) nothing is rendered or written; otherwise only
+        files whose content changed are rewritten. ``written`` lists those,
+        including the gzip/brotli variants saved next to index.html.
+        """
         template = self.get_template(template_name)
         if not template:
             raise ValueError(f"Template '{template_name}' not found")
         
-        html_content = template.render(business_data)
-        
         output_dir = self.output_base / website_id
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
         index_path = output_dir / "index.html"
-        template.save_to_file(html_content, index_path)
-        
         metadata_path = output_dir / "metadata.json"
+        fingerprint = self.fingerprint(template_name, business_data, website_settings)
+        result = {
+            "success": True,
+            "output_dir": str(output_dir),
+            "files": ["index.html", "metadata.json"],
+            "preview_url": f"/preview/{website_id}",
+            "fingerprint": fingerprint,
+            "unchanged": False,
+            "written": []
+        }
+        
+        if not force and self.is_current(website_id, fingerprint):
+            result["unchanged"] = True
+            return result
+        
+        asset_files = self.publish_assets(template)
+        html_content = template.render(business_data, asset_url=SHARED_ASSETS_URL)
+        # Per-site copies from before pages linked the shared route
+        shutil.rmtree(output_dir / SITE_ASSETS_DIR, ignore_errors=True)
+        
+        if _write_if_changed(index_path, html_content):
+            result["written"].append("index.html")
+            result["written"] += write_precompressed(index_path, html_content.encode("utf-8"))
+        elif force:
+            # Forced runs also backfill variants for pages saved before they existed
+            result["written"] += write_precompressed(index_path, html_content.encode("utf-8"))
+        
         metadata = {
             "template": template_name,
+            "template_version": template.version,
+            "fingerprint": fingerprint,
             "business_name": business_data.get("business", {}).get("name"),
-            "generated_files": ["index.html"]
+            "generated_files": ["index.html"],
+            "shared_assets": asset_files
         }
-        metadata_path.write_text(json.dumps(metadata, indent=2))
+        if _write_if_changed(metadata_path, json.dumps(metadata, indent=2)):
+            result["written"].append("metadata.json")
         
-        return {
-            "success": True,
-            "output_dir": str(output_dir),
-            "files": ["index.html", "metadata.json"],
-            "preview_url": f"/preview/{website_id}"
-        }
+        return result
+    
+    def fingerprint(
+        self,
+        template_name: str,
+        business_data: Dict[str, Any],
+        website_settings: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Hash of everything a site depends on: content, settings, template name and version"""
+        template = self.get_template(template_name)
+        if not template:
+            raise ValueError(f"Template '{template_name}' not found")
+        inputs = json.dumps(
+            {
+                "content": business_data,
+                "settings": website_settings or {},
+                "template": template_name,
+                "template_version": template.version,
+                "output_version": OUTPUT_VERSION
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(inputs.encode()).hexdigest()
+    
+    def is_current(self, website_id: str, fingerprint: str) -> bool:
+        """Whether the saved site was generated from inputs with this fingerprint"""
+        output_dir = self.output_base / website_id
+        try:
+            metadata = json.loads((output_dir / "metadata.json").read_text())
+        except (OSError, ValueError):
+            return False
+        return metadata.get("fingerprint") == fingerprint and (output_dir / "index.html").exists()
+    
+    def publish_assets(self, template: BaseTemplate) -> List[str]:
+        """Write the template's shared asset files (and their compressed variants) if missing; returns their names"""
+        shared_dir = self.output_base / SHARED_ASSETS_DIR
+        names = []
+        for name, content in template.asset_files.values():
+            path = shared_dir / name
+            names.append(name)
+            if path.exists():
+                continue
+            shared_dir.mkdir(parents=True, exist_ok=True)
+            # Concurrent generations may publish the same file; the rename is atomic.
+            # Variants go first, so the file never exists without them.
+            fd, tmp_path = tempfile.mkstemp(dir=shared_dir, prefix=f".{name}.")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            write_precompressed(path, content.encode("utf-8"))
+            os.replace(tmp_path, path)
+        return names
+    
+    def export_website(self, website_id: str) -> Path:
+        """
+        Self-contained copy of a saved site, for zips and preview servers
+
+        The page is rewritten to link its assets relatively and they are linked
+        in beside it. Sites saved without shared assets are returned as they are.
+        """
+        output_dir = self.output_base / website_id
+        try:
+            metadata = json.loads((output_dir / "metadata.json").read_text())
+        except (OSError, ValueError):
+            return output_dir
+        if "shared_assets" not in metadata:
+            return output_dir
+        
+        export_dir = output_dir / SITE_EXPORT_DIR
+        html_content = (output_dir / "index.html").read_text(encoding="utf-8")
+        html_content = html_content.replace(f'"{SHARED_ASSETS_URL}/', f'"{SITE_ASSETS_DIR}/')
+        _write_if_changed(export_dir / "index.html", html_content)
+        self.link_assets(metadata["shared_assets"], export_dir)
+        return export_dir
+    
+    def link_assets(self, names: List[str], output_dir: Path):
+        """
+        Hard-link the shared assets and their variants into the site's assets
+        directory (copying where links are unsupported); drops any others
+        """
+        shared_dir = self.output_base / SHARED_ASSETS_DIR
+        site_dir = output_dir / SITE_ASSETS_DIR
+        site_dir.mkdir(parents=True, exist_ok=True)
+        wanted = set()
+        for name in names:
+            for file_name in [name] + [name + suffix for _, suffix in ENCODINGS]:
+                source = shared_dir / file_name
+                if not source.exists():
+                    continue
+                wanted.add(file_name)
+                target = site_dir / file_name
+                if target.exists():
+                    continue
+                try:
+                    os.link(source, target)
+                except FileExistsError:
+                    pass
+                except OSError:
+                    shutil.copy2(source, target)
+        # Assets of an earlier template version
+        for path in site_dir.iterdir():
+            if path.name not in wanted:
+                path.unlink()
     
     def get_template_preview(self, template_name: str) -> str:
         template = self.get_template(template_name)
@@ -88,4 +243,44 @@ class TemplateManager:
             }
         }
         
-        return template.render(sample_data)
\ No newline at end of file
+        return template.render(sample_data)
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    """Write ``content`` unless the file already holds it; returns whether it wrote"""
+    try:
+        if path.read_text(encoding="utf-8") == content:
+            return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return True
+
+
+# One manager per generation worker process, so each template compiles once per process
+_process_manager: Optional[TemplateManager] = None
+
+
+def generate_websites_task(
+    tasks: List[RenderTask],
+    output_base: Optional[str] = None,
+    force: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Process pool entry point: render (website_id, template_name, business_data,
+    website_settings) tasks and write their files, one result per task in order
+    """
+    global _process_manager
+    if _process_manager is None:
+        _process_manager = TemplateManager()
+    _process_manager.output_base = Path(output_base) if output_base else DEFAULT_OUTPUT_BASE
+    results = []
+    for website_id, template_name, business_data, website_settings in tasks:
+        try:
+            results.append(_process_manager.generate_website(
+                template_name, business_data, website_id, force, website_settings
+            ))
+        except Exception as e:
+            results.append({"success": False, "error": str(e)})
+    return results
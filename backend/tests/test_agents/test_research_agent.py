@@ -0,0 +1,276 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import agents.research_agent as research_agent_module
+from core.config import settings
+from agents.research_agent import ResearchAgent
+from schemas.research import ResearchPayload
+from models import Business, BusinessResearch, ResearchStatus, ResearchUsage, WebsiteStatus
+from services.research_cache import ResearchCache
+from services.token_budget import TokenBudget
+
+
+@pytest.fixture
+def agent():
+    return ResearchAgent()
+
+
+def _business(i):
+    return Business(
+        id=f"business-{i}",
+        name=f"Business {i}",
+        address=f"{i} Main St",
+        latitude=40.0,
+        longitude=-74.0,
+        google_place_id=f"place-{i}",
+        website_status=WebsiteStatus.NO_WEBSITE,
+    )
+
+
+@pytest.mark.unit
+def test_batch_prompt_numbers_each_business(agent):
+    prompt = agent._create_batch_prompt([_business(1), _business(2)])
+
+    assert prompt.splitlines()[0].startswith("[1] Business 1 | 1 Main St")
+    assert prompt.splitlines()[1].startswith("[2] Business 2 | 2 Main St")
+
+
+@pytest.mark.unit
+def test_static_prefix_is_marked_for_prompt_caching(agent):
+    blocks = agent._system_blocks(research_agent_module.RESEARCH_SYSTEM_PROMPT)
+
+    assert all(block["cache_control"] == {"type": "ephemeral"} for block in blocks)
+    # Every mode starts with the same guide, and it is long enough for the API to cache
+    assert blocks[0]["text"] == research_agent_module.RESEARCH_GUIDE
+    assert agent._system_blocks(research_agent_module.BATCH_SYSTEM_PROMPT)[0] == blocks[0]
+    guide_tokens = research_agent_module._estimate_tokens(research_agent_module.RESEARCH_GUIDE)
+    assert guide_tokens >= research_agent_module.PROMPT_CACHE_MIN_TOKENS * 1.2
+    # Nothing business specific may leak into the cached prefix
+    assert "Business 1" not in research_agent_module.RESEARCH_GUIDE + research_agent_module.RESEARCH_SYSTEM_PROMPT
+    assert "Business 1" in agent._create_research_prompt(_business(1))
+
+
+@pytest.mark.unit
+def test_parse_batch_response_handles_fences(agent):
+    items = [{"ref": 1, "description": "One"}, {"ref": 2, "description": "Two"}]
+    response = "Here you go:\n```json\n" + json.dumps(items, indent=2) + "\n```"
+
+    assert agent._parse_batch_response(response) == items
+
+
+@pytest.mark.unit
+def test_parse_batch_response_keeps_complete_items_when_truncated(agent):
+    response = json.dumps([{"ref": 1, "services": ["a"]}, {"ref": 2, "services": ["b"]}])
+    truncated = response[:response.index('"b"')]
+
+    assert agent._parse_batch_response(truncated) == [{"ref": 1, "services": ["a"]}]
+    assert agent._parse_batch_response("no json here") == []
+
+
+@pytest.mark.unit
+def test_payload_repairs_near_misses_and_reports_the_rest():
+    clean, errors = ResearchPayload.validate_fields({
+        "description": ["Two", "sentences."],
+        "services": "Catering",
+        "hours": ["Monday: 9-5", "Tuesday: 9-5"],
+        "social_media": ["https://www.facebook.com/example"],
+        "reviews": ["Lovely"],
+        "images": None,
+        "menu_items": [],
+        "specialties": [],
+        "history": 1998,
+    })
+
+    assert clean["description"] == "Two sentences."
+    assert clean["services"] == ["Catering"]
+    assert clean["hours"] == {"Monday": "9-5", "Tuesday": "9-5"}
+    assert clean["social_media"] == {"facebook": "https://www.facebook.com/example"}
+    assert clean["reviews"] == [{"text": "Lovely"}]
+    assert set(errors) == {"history", "owner_info"}
+    assert errors["owner_info"] == "missing"
+    assert clean["history"] == ""
+
+
+class FakeStream:
+    def __init__(self, text):
+        self.text = text
+        self.chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def get_final_message(self):
+        return SimpleNamespace(
+            usage=SimpleNamespace(
+                input_tokens=300, output_tokens=len(self.text) // 4,
+                cache_read_input_tokens=900, cache_creation_input_tokens=0
+            ),
+            stop_reason="end_turn"
+        )
+
+
+FULL_REPLY = {
+    "description": "Fresh",
+    "services": ["Bread"],
+    "hours": {"Monday": "7am-3pm"},
+    "reviews": [],
+    "social_media": {},
+    "images": [],
+    "menu_items": [],
+    "specialties": [],
+    "history": "",
+    "owner_info": {},
+}
+
+
+class FakeMessages:
+    def __init__(self, reply=None, repair_reply="{}"):
+        self.calls = 0
+        self.reply = reply or json.dumps(FULL_REPLY)
+        self.repair_reply = repair_reply
+        self.repair_prompts = []
+
+    def stream(self, model, max_tokens, system, messages):
+        self.calls += 1
+        self.max_tokens = max_tokens
+        return FakeStream(self.reply)
+
+    async def create(self, model, max_tokens, system, messages):
+        self.repair_prompts.append(messages[0]["content"])
+        return SimpleNamespace(
+            content=[SimpleNamespace(text=self.repair_reply)],
+            usage=SimpleNamespace(
+                input_tokens=50, output_tokens=len(self.repair_reply) // 4,
+                cache_read_input_tokens=0, cache_creation_input_tokens=0
+            ),
+            stop_reason="end_turn"
+        )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_research_cache_skips_llm_unless_forced(db_session, monkeypatch):
+    monkeypatch.setattr(research_agent_module, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+    business = _business(1)
+    db_session.add_all([business, BusinessResearch(business_id=business.id, status=ResearchStatus.IN_PROGRESS)])
+    db_session.commit()
+
+    agent = ResearchAgent()
+    agent.cache = ResearchCache(ttl=60)
+    agent.budget = TokenBudget(per_minute=100000, per_day=1000000)
+    agent.client = SimpleNamespace(messages=FakeMessages())
+
+    await agent.research_business(business.id)
+    await agent.research_business(business.id)
+    assert agent.client.messages.calls == 1
+
+    await agent.research_business(business.id, force_refresh=True)
+    assert agent.client.messages.calls == 2
+
+    db_session.expire_all()
+    research = db_session.query(BusinessResearch).filter_by(business_id=business.id).one()
+    assert research.status == ResearchStatus.COMPLETED
+    assert research.description == "Fresh"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_streamed_research_pushes_fields_and_keeps_them_when_truncated(db_session, monkeypatch):
+    monkeypatch.setattr(research_agent_module, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+    frames = []
+
+    async def record(business_id, step, progress, message, data=None):
+        frames.append((step, progress, data))
+
+    monkeypatch.setattr(research_agent_module, "send_research_progress", record)
+    business = _business(2)
+    db_session.add_all([business, BusinessResearch(business_id=business.id, status=ResearchStatus.IN_PROGRESS)])
+    db_session.commit()
+
+    reply = '```json\n{"description": "Cozy {corner} spot", "services": ["Coffee", "Tea"], "hours": {"Mon'
+    agent = ResearchAgent()
+    agent.cache = ResearchCache(ttl=60)
+    agent.budget = TokenBudget(per_minute=100000, per_day=1000000)
+    agent.client = SimpleNamespace(messages=FakeMessages(reply))
+
+    await agent.research_business(business.id)
+
+    assert [step for step, _, _ in frames] == ["started", "description", "services", "completed"]
+    assert frames[1][2] == {"field": "description", "value": "Cozy {corner} spot"}
+    db_session.expire_all()
+    research = db_session.query(BusinessResearch).filter_by(business_id=business.id).one()
+    assert research.services == ["Coffee", "Tea"]
+    # Truncated replies are not cached
+    assert await agent.cache.get(research_agent_module.research_fingerprint(business)) is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_usage_is_recorded_and_max_tokens_adapts(db_session, monkeypatch):
+    monkeypatch.setattr(research_agent_module, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+    agent = ResearchAgent()
+    agent.cache = ResearchCache(ttl=60)
+    agent.budget = TokenBudget(per_minute=100000, per_day=1000000)
+    agent.client = SimpleNamespace(messages=FakeMessages())
+
+    for i in range(research_agent_module.ADAPTIVE_MIN_SAMPLES + 1):
+        business = _business(10 + i)
+        business.business_type = "bakery"
+        db_session.add_all([business, BusinessResearch(business_id=business.id, status=ResearchStatus.IN_PROGRESS)])
+        db_session.commit()
+        await agent.research_business(business.id, force_refresh=True)
+
+    usage = db_session.query(ResearchUsage).filter_by(business_type="bakery").all()
+    assert len(usage) == research_agent_module.ADAPTIVE_MIN_SAMPLES + 1
+    assert usage[0].input_tokens == 300 and usage[0].model == research_agent_module.RESEARCH_MODEL
+    assert usage[0].cache_read_tokens == 900
+    # Tiny replies shrink the next call's budget down to the floor
+    assert agent.client.messages.max_tokens == settings.research_min_max_tokens
+    assert (await agent.budget.usage())["minute"]["used"] == sum(u.input_tokens + u.output_tokens for u in usage)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_invalid_fields_are_repaired_with_a_targeted_call(db_session, monkeypatch):
+    monkeypatch.setattr(research_agent_module, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+    business = _business(3)
+    db_session.add_all([business, BusinessResearch(business_id=business.id, status=ResearchStatus.IN_PROGRESS)])
+    db_session.commit()
+
+    # Trailing commas and a newline-separated hours string are fixed locally;
+    # the object-valued reviews and the missing owner_info need the model
+    reply = dict(FULL_REPLY, hours="Monday: 7am-3pm\nTuesday: 7am-3pm", reviews="Great bread!")
+    del reply["owner_info"]
+    reply = json.dumps(reply).replace('["Bread"]', '["Bread",]')
+    repair = json.dumps({"reviews": [{"author": "Ann", "rating": 5, "text": "Great bread!"}], "owner_info": {}})
+    agent = ResearchAgent()
+    agent.cache = ResearchCache(ttl=60)
+    agent.budget = TokenBudget(per_minute=100000, per_day=1000000)
+    agent.client = SimpleNamespace(messages=FakeMessages(reply, repair_reply=repair))
+
+    await agent.research_business(business.id)
+
+    assert len(agent.client.messages.repair_prompts) == 1
+    prompt = agent.client.messages.repair_prompts[0]
+    assert "- reviews:" in prompt and "- owner_info: missing" in prompt
+    assert "- services" not in prompt and "- hours" not in prompt
+
+    db_session.expire_all()
+    research = db_session.query(BusinessResearch).filter_by(business_id=business.id).one()
+    assert research.services == ["Bread"]
+    assert research.hours == {"Monday": "7am-3pm", "Tuesday": "7am-3pm"}
+    assert research.reviews[0]["author"] == "Ann"
+    modes = [usage.mode for usage in db_session.query(ResearchUsage).filter_by(business_id=business.id)]
+    assert sorted(modes) == ["repair", "single"]
+    assert await agent.cache.get(research_agent_module.research_fingerprint(business)) is not None
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from api.businesses import list_businesses
+from models import Business, WebsiteStatus
+
+
+@pytest.fixture
+def stored_businesses(db_session):
+    base = datetime(2026, 1, 1)
+    for i in range(7):
+        db_session.add(Business(
+            id=f"00000000-0000-0000-0000-00000000000{i}",
+            google_place_id=f"place-{i}",
+            name=f"Business {i}",
+            address="123 Test St",
+            latitude=34.0,
+            longitude=-81.0,
+            website_status=WebsiteStatus.NO_WEBSITE if i % 2 else WebsiteStatus.HAS_WEBSITE,
+            business_type="restaurant",
+            # Two rows share a timestamp to exercise the id tie-breaker
+            discovered_at=base + timedelta(minutes=min(i, 5)),
+        ))
+    db_session.commit()
+    return db_session
+
+
+async def walk(db, **filters):
+    ids, cursor = [], None
+    while True:
+        page = await list_businesses(cursor=cursor, limit=2, db=db, **filters)
+        ids.extend(str(item.google_place_id) for item in page.items)
+        if not page.next_cursor:
+            return ids
+        cursor = page.next_cursor
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cursor_pagination_visits_every_row_once(stored_businesses):
+    ids = await walk(stored_businesses, website_status=None, business_type=None)
+    
+    assert ids == ["place-6", "place-5", "place-4", "place-3", "place-2", "place-1", "place-0"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_cursor_pagination_with_status_filter(stored_businesses):
+    ids = await walk(stored_businesses, website_status=WebsiteStatus.NO_WEBSITE, business_type=None)
+    
+    assert ids == ["place-5", "place-3", "place-1"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected(stored_businesses):
+    with pytest.raises(HTTPException) as exc_info:
+        await list_businesses(cursor="not-a-cursor", limit=2, website_status=None,
+                              business_type=None, db=stored_businesses)
+    
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,52 @@
+import pytest
+
+from models import Business, WebsiteStatus
+from services.business_store import upsert_businesses
+
+
+def place(place_id, **overrides):
+    data = {
+        'place_id': place_id,
+        'name': f'Business {place_id}',
+        'address': '123 Test St',
+        'latitude': 34.0,
+        'longitude': -81.0,
+        'phone': None,
+        'website': None,
+        'website_status': WebsiteStatus.NO_WEBSITE,
+        'google_maps_url': None,
+        'business_type': 'restaurant',
+    }
+    data.update(overrides)
+    return data
+
+
+@pytest.mark.unit
+def test_upsert_inserts_new_businesses_in_order(db_session):
+    businesses = upsert_businesses(db_session, [place('b'), place('a'), place('b')])
+    db_session.commit()
+    
+    assert [b.google_place_id for b in businesses] == ['b', 'a']
+    assert db_session.query(Business).count() == 2
+
+
+@pytest.mark.unit
+def test_upsert_refreshes_existing_rows(db_session):
+    first = upsert_businesses(db_session, [place('a')])[0]
+    db_session.commit()
+    original_id, original_checked = first.id, first.last_checked
+    
+    updated = upsert_businesses(db_session, [place(
+        'a',
+        name='Renamed',
+        website='https://facebook.com/a',
+        website_status=WebsiteStatus.FACEBOOK_ONLY
+    )])[0]
+    db_session.commit()
+    
+    assert updated.id == original_id
+    assert updated.name == 'Business a'
+    assert updated.website == 'https://facebook.com/a'
+    assert updated.website_status == WebsiteStatus.FACEBOOK_ONLY
+    assert updated.last_checked >= original_checked
+    assert db_session.query(Business).count() == 1
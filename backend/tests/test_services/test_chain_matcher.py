@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from services.chain_matcher import ChainMatcher, chain_matcher
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name", [
+    "McDonald's", "Wendy’s", "Moe's Southwest Grill", "Taco  Bell #123",
+    "Buffalo Wild Wings", "Chick-fil-A", "Shell", "BP", "Bob Evans", "7-Eleven",
+])
+def test_matches_chains(name):
+    assert chain_matcher.match(name) is not None
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name", [
+    "Moena Cafe", "Shellfish Shack", "BPM Lounge", "Targeted Tacos", "Rosewood Market",
+])
+def test_ignores_partial_words(name):
+    assert chain_matcher.match(name) is None
+
+
+@pytest.mark.unit
+def test_reload_picks_up_file_changes(tmp_path):
+    chain_file = tmp_path / "chains.txt"
+    chain_file.write_text("# comment\nacme burger\n")
+    matcher = ChainMatcher(chain_file)
+    assert matcher.match("Acme Burgers") == "acme burgers"
+    assert matcher.match("Local Diner") is None
+    
+    chain_file.write_text("local diner\n")
+    os.utime(chain_file, (0, 1))
+    matcher.reload_if_changed()
+    
+    assert matcher.names == ["local diner"]
+    assert matcher.match("Acme Burgers") is None
+    assert matcher.match("Local Diner") == "local diner"
@@ -0,0 +1,197 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from services.business_store import upsert_businesses
+from services.geo_tiling import Tile, child_tiles, haversine_meters, offset, root_tile
+from services.geocoding import GeocodeCache
+from services.google_places import GooglePlacesService
+from services.place_cache import PlaceDetailsCache
+from services.search_tiles import SearchTileIndex
+
+CENTER = (34.0, -81.0)
+
+
+class SpatialPlacesClient:
+    """Fake Nearby Search over a fixed set of places, capped at 60 results like Google"""
+    
+    def __init__(self, places):
+        self.places = places
+        self.nearby_calls = 0
+        self.pages = {}
+    
+    def places_nearby(self, location=None, radius=None, type=None, page_token=None):
+        self.nearby_calls += 1
+        if page_token:
+            results = self.pages.pop(page_token)
+        else:
+            results = [
+                place for place in self.places
+                if haversine_meters(location, (place['geometry']['location']['lat'],
+                                               place['geometry']['location']['lng'])) <= radius
+            ][:60]
+        response = {'results': results[:20]}
+        if len(results) > 20:
+            token = f"token_{self.nearby_calls}"
+            self.pages[token] = results[20:]
+            response['next_page_token'] = token
+        return response
+    
+    def place(self, place_id, fields=None):
+        place = next(p for p in self.places if p['place_id'] == place_id)
+        return {'result': {
+            'name': place['name'],
+            'formatted_address': '123 Test St',
+            'geometry': place['geometry'],
+            'business_status': 'OPERATIONAL',
+        }}
+
+
+def make_places(count, spread_meters):
+    places = []
+    for i in range(count):
+        north = ((i * 37) % 100 / 100 - 0.5) * spread_meters
+        east = ((i * 61) % 100 / 100 - 0.5) * spread_meters
+        lat, lng = offset(CENTER, north, east)
+        places.append({
+            'place_id': f'place_{i}',
+            'name': 'Starbucks' if i % 10 == 0 else f'Local Spot {i}',
+            'types': ['restaurant'],
+            'geometry': {'location': {'lat': lat, 'lng': lng}},
+        })
+    return places
+
+
+@pytest.mark.unit
+def test_subdivide_covers_parent():
+    tile = root_tile(CENTER, 1000)
+    children = tile.subdivide()
+    
+    assert len(children) == 4
+    assert all(child.half_side == 500 and child.depth == 1 for child in children)
+    for child in children:
+        assert haversine_meters(CENTER, child.center) == pytest.approx(500 * 2 ** 0.5, rel=0.01)
+
+
+@pytest.mark.unit
+def test_child_tiles_skip_tiles_outside_circle():
+    tile = Tile(offset(CENTER, 3000, 3000), 1000)
+    
+    children = child_tiles(tile, CENTER, 3000)
+    
+    # Only the child nearest the search center overlaps the circle
+    assert len(children) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_tiled_search_covers_saturated_area():
+    client = SpatialPlacesClient(make_places(100, 1500))
+    service = GooglePlacesService(
+        client=client,
+        details_cache=PlaceDetailsCache(),
+        geocode_cache=GeocodeCache(":memory:")
+    )
+    service.PAGE_TOKEN_DELAY = 0
+    
+    results = await service._search_tiled(CENTER, 1000, 'restaurant', 200)
+    
+    expected = {
+        p['place_id'] for p in client.places
+        if haversine_meters(CENTER, (p['geometry']['location']['lat'], p['geometry']['location']['lng'])) <= 1000
+        and p['name'] != 'Starbucks'
+    }
+    assert len(expected) > 60
+    assert {b['place_id'] for b in results} == expected
+    assert len(results) == len(expected)
+    assert client.nearby_calls <= service.tiling_request_budget
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_tiled_search_respects_request_budget():
+    client = SpatialPlacesClient(make_places(400, 1500))
+    service = GooglePlacesService(
+        client=client,
+        details_cache=PlaceDetailsCache(),
+        geocode_cache=GeocodeCache(":memory:")
+    )
+    service.PAGE_TOKEN_DELAY = 0
+    service.tiling_request_budget = 5
+    
+    await service._search_tiled(CENTER, 1000, 'restaurant', 200)
+    
+    assert client.nearby_calls == 5
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_tiled_search_stops_once_enough_places_are_found():
+    client = SpatialPlacesClient(make_places(400, 1500))
+    service = GooglePlacesService(
+        client=client,
+        details_cache=PlaceDetailsCache(),
+        geocode_cache=GeocodeCache(":memory:")
+    )
+    service.PAGE_TOKEN_DELAY = 0
+    
+    results = await service._search_tiled(CENTER, 1000, 'restaurant', 20)
+    
+    assert len(results) == 20
+    # Two pages hold 20 local places; the saturated root tile is neither paged further nor split
+    assert client.nearby_calls == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_tiled_search_fetches_details_while_scanning():
+    client = SpatialPlacesClient(make_places(100, 1500))
+    service = GooglePlacesService(
+        client=client,
+        details_cache=PlaceDetailsCache(),
+        geocode_cache=GeocodeCache(":memory:")
+    )
+    service.PAGE_TOKEN_DELAY = 0
+    calls_at_first_business = []
+    
+    async def on_business(business):
+        if not calls_at_first_business:
+            calls_at_first_business.append(client.nearby_calls)
+    
+    service._on_business = on_business
+    await service._search_tiled(CENTER, 1000, 'restaurant', 200)
+    
+    assert calls_at_first_business[0] < client.nearby_calls
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_repeated_search_answers_scanned_tiles_from_the_database(db_session):
+    session_factory = sessionmaker(bind=db_session.get_bind())
+    search_tiles = SearchTileIndex()
+    
+    def search_service(client):
+        service = GooglePlacesService(
+            client=client,
+            details_cache=PlaceDetailsCache(),
+            geocode_cache=GeocodeCache(":memory:"),
+            session_factory=session_factory,
+            search_tiles=search_tiles
+        )
+        service.PAGE_TOKEN_DELAY = 0
+        return service
+    
+    first_client = SpatialPlacesClient(make_places(100, 1500))
+    first = await search_service(first_client)._search_tiled(CENTER, 1000, 'restaurant', 200)
+    upsert_businesses(db_session, first)
+    db_session.commit()
+    
+    second_client = SpatialPlacesClient(first_client.places)
+    second = await search_service(second_client)._search_tiled(CENTER, 1000, 'restaurant', 200)
+    
+    assert first_client.nearby_calls > 1
+    assert second_client.nearby_calls == 0
+    assert {b['place_id'] for b in second} == {b['place_id'] for b in first}
+    
+    # Another place type has no scanned tiles yet
+    await search_service(second_client)._search_tiled(CENTER, 1000, 'cafe', 200)
+    assert second_client.nearby_calls > 0
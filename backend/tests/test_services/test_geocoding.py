@@ -0,0 +1,56 @@
+import pytest
+
+from services.geocoding import GeocodeCache, normalize_location, parse_coordinates
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("location, expected", [
+    ("34.0007,-81.0348", (34.0007, -81.0348)),
+    ("34.0007, -81.0348", (34.0007, -81.0348)),
+    ("  -33.8688 ,  151.2093 ", (-33.8688, 151.2093)),
+    ("+40.4406,-79.9959", (40.4406, -79.9959)),
+    ("40,-79", (40.0, -79.0)),
+])
+def test_parse_coordinates(location, expected):
+    assert parse_coordinates(location) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("location", [
+    "Columbia, SC",
+    "123 Main St, 29201",
+    "91.0, 10.0",
+    "10.0, 181.0",
+    "34.0-81.0",
+    "34.0,,-81.0",
+])
+def test_parse_coordinates_rejects_non_coordinates(location):
+    assert parse_coordinates(location) is None
+
+
+@pytest.mark.unit
+def test_normalize_location():
+    assert normalize_location("  Columbia ,SC. ") == "columbia, sc"
+    assert normalize_location("Columbia,   SC") == normalize_location("columbia, sc")
+
+
+@pytest.mark.unit
+def test_geocode_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "geocode.sqlite3")
+    GeocodeCache(path).set("Columbia, SC", (34.0007, -81.0348))
+    
+    cache = GeocodeCache(path)
+    
+    assert cache.get("columbia,  sc") == (34.0007, -81.0348)
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.unit
+def test_geocode_cache_evicts_least_recently_used():
+    cache = GeocodeCache(":memory:", max_entries=2)
+    cache.set("a", (1.0, 1.0))
+    cache.set("b", (2.0, 2.0))
+    cache.get("a")
+    cache.set("c", (3.0, 3.0))
+    
+    assert list(cache._entries) == ["a", "c"]
@@ -0,0 +1,57 @@
+import pytest
+
+from models import WebsiteStatus
+from services import geohash
+from services.business_store import find_businesses_in_bbox, find_businesses_near, upsert_businesses
+from services.geo_tiling import offset
+
+CENTER = (34.0007, -81.0348)
+
+
+@pytest.mark.unit
+def test_encode_known_value():
+    assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+@pytest.mark.unit
+def test_cover_contains_every_point_in_box():
+    prefixes = geohash.cover(33.9, -81.1, 34.1, -80.9)
+    
+    assert len(prefixes) <= geohash.MAX_COVER_CELLS
+    for i in range(11):
+        for j in range(11):
+            point = geohash.encode(33.9 + i * 0.02, -81.1 + j * 0.02)
+            assert any(point.startswith(prefix) for prefix in prefixes)
+
+
+
+@pytest.mark.unit
+def test_prefix_upper_bound_increments_last_character():
+    assert geohash.prefix_upper_bound("dnm") == "dnn"
+    assert geohash.prefix_upper_bound("dn9") == "dnb"
+    assert geohash.prefix_upper_bound("dnz") == "dp"
+    assert geohash.prefix_upper_bound("zz") is None
+    # Every geohash under the prefix sorts below the bound
+    assert "dnzzzzzzz" < geohash.prefix_upper_bound("dnz")
+
+@pytest.mark.unit
+def test_find_businesses_near(db_session):
+    places = []
+    for i, meters in enumerate([100, 400, 900, 3000]):
+        lat, lng = offset(CENTER, meters, 0)
+        places.append({
+            'place_id': f'place_{i}', 'name': f'Business {i}', 'address': '123 Test St',
+            'latitude': lat, 'longitude': lng,
+            'website_status': WebsiteStatus.NO_WEBSITE if i != 1 else WebsiteStatus.HAS_WEBSITE,
+        })
+    upsert_businesses(db_session, places)
+    db_session.commit()
+    
+    nearby = find_businesses_near(db_session, *CENTER, radius_meters=1000)
+    no_website = find_businesses_near(db_session, *CENTER, radius_meters=1000,
+                                      website_status=WebsiteStatus.NO_WEBSITE)
+    in_box = find_businesses_in_bbox(db_session, CENTER[0], CENTER[1] - 0.01, CENTER[0] + 0.05, CENTER[1] + 0.01)
+    
+    assert [b.google_place_id for b in nearby] == ['place_0', 'place_1', 'place_2']
+    assert [b.google_place_id for b in no_website] == ['place_0', 'place_2']
+    assert sorted(b.google_place_id for b in in_box) == ['place_0', 'place_1', 'place_2', 'place_3']
@@ -0,0 +1,170 @@
+import time
+
+import pytest
+
+from services.google_places import GooglePlacesService
+from services.place_cache import PlaceDetailsCache
+from services.geocoding import GeocodeCache
+
+CENTER = (34.0, -81.0)
+
+
+class FakePlacesClient:
+    def __init__(self, total_places: int, closed: set = frozenset(), latency: float = 0):
+        self.total_places = total_places
+        self.closed = closed
+        self.latency = latency
+        self.details_calls = []
+        self.geocode_calls = []
+    
+    def geocode(self, address):
+        self.geocode_calls.append(address)
+        return [{'geometry': {'location': {'lat': 34.0, 'lng': -81.0}}}]
+    
+    def places_nearby(self, page_token=None, **kwargs):
+        start = int(page_token) if page_token else 0
+        end = min(start + 20, self.total_places)
+        response = {'results': [
+            {'place_id': f'place_{i}', 'types': ['restaurant']} for i in range(start, end)
+        ]}
+        if end < self.total_places:
+            response['next_page_token'] = str(end)
+        return response
+    
+    def place(self, place_id, fields=None):
+        self.details_calls.append((place_id, tuple(fields or ())))
+        time.sleep(self.latency)
+        result = {
+            'name': place_id,
+            'formatted_address': '123 Test St',
+            'geometry': {'location': {'lat': 34.0, 'lng': -81.0}},
+            'url': f'https://maps.google.com/?cid={place_id}',
+            'formatted_phone_number': '(555) 123-4567',
+            'business_status': 'CLOSED_PERMANENTLY' if place_id in self.closed else 'OPERATIONAL',
+            'rating': 4.5,
+            'user_ratings_total': 10,
+        }
+        return {'result': {k: v for k, v in result.items() if not fields or k in fields or k == 'geometry'}}
+
+
+@pytest.fixture
+def places_service():
+    def build(total_places: int, **kwargs) -> GooglePlacesService:
+        service = GooglePlacesService(
+            client=FakePlacesClient(total_places, **kwargs),
+            details_cache=PlaceDetailsCache(),
+            geocode_cache=GeocodeCache(":memory:")
+        )
+        service.PAGE_TOKEN_DELAY = 0
+        return service
+    return build
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_search_keeps_order(places_service):
+    service = places_service(60)
+    
+    results = await service._search_tiled(CENTER, 1200, 'restaurant', 60)
+    
+    assert [b['place_id'] for b in results] == [f'place_{i}' for i in range(60)]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_search_respects_max_results(places_service):
+    service = places_service(20)
+    
+    results = await service._search_tiled(CENTER, 1200, 'restaurant', 5)
+    
+    assert [b['place_id'] for b in results] == [f'place_{i}' for i in range(5)]
+    assert len(service.client.details_calls) == 5
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_closed_places_are_backfilled(places_service):
+    service = places_service(20, closed={'place_1', 'place_3'})
+    
+    results = await service._search_tiled(CENTER, 1200, 'restaurant', 5)
+    
+    assert [b['place_id'] for b in results] == ['place_0', 'place_2', 'place_4', 'place_5', 'place_6']
+    assert len(service.client.details_calls) == 7
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_details_overlap_page_token_delay(places_service):
+    service = places_service(60, latency=0.2)
+    service.PAGE_TOKEN_DELAY = 0.3
+    service.details_concurrency = 20
+    
+    started = time.perf_counter()
+    results = await service._search_tiled(CENTER, 1200, 'restaurant', 60)
+    elapsed = time.perf_counter() - started
+    
+    # Sequential would be 2 delays + 3 details batches (1.2s); pipelined is ~0.8s
+    assert len(results) == 60
+    assert elapsed < 1.05
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_repeated_search_is_served_from_cache(places_service):
+    service = places_service(20, closed={'place_3'})
+    
+    first = await service._search_tiled(CENTER, 1200, 'restaurant', 10)
+    calls_after_first = len(service.client.details_calls)
+    second = await service._search_tiled(CENTER, 1200, 'restaurant', 10)
+    
+    assert first == second
+    assert len(service.client.details_calls) == calls_after_first
+    stats = service.details_cache.stats()
+    assert stats['hits'] == 10
+    assert stats['negative_hits'] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_only_stale_field_groups_are_refetched(places_service):
+    service = places_service(20)
+    await service._get_place_details('place_0', ['restaurant'])
+    
+    backend = service.details_cache.backend
+    entry = await backend.get('place_0')
+    entry['groups']['atmosphere']['fetched_at'] = 0
+    await backend.set('place_0', entry, ttl=3600)
+    business = await service._get_place_details('place_0', ['restaurant'])
+    
+    assert service.client.details_calls[-1] == ('place_0', ('rating', 'user_ratings_total'))
+    assert business['name'] == 'place_0'
+    assert business['rating'] == 4.5
+    assert service.details_cache.stats()['partial_hits'] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_search_geocodes_once_and_caches(places_service):
+    service = places_service(20)
+    
+    await service.search_businesses('Springfield, IL', radius_miles=1, max_results=20)
+    await service.search_businesses('  springfield ,  il ', radius_miles=1, max_results=20)
+    await service.search_businesses('34.0, -81.0', radius_miles=1, max_results=20)
+    
+    assert service.client.geocode_calls == ['Springfield, IL']
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stream_businesses_yields_before_search_finishes(places_service):
+    service = places_service(20, latency=0.02)
+    service.details_concurrency = 2
+    arrived = []
+    
+    async for business in service.stream_businesses('34.0,-81.0', radius_miles=1, max_results=20):
+        arrived.append(business['place_id'])
+        if len(arrived) == 1:
+            # The first business arrives while later details are still in flight
+            assert len(service.client.details_calls) < 20
+    
+    assert sorted(arrived) == sorted(f'place_{i}' for i in range(20))
@@ -0,0 +1,153 @@
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from models import Job, JobStatus
+from services.job_queue import JobQueue, JobWorker
+
+
+@pytest.fixture
+def queue(db_session):
+    factory = sessionmaker(bind=db_session.get_bind())
+    lock = threading.Lock()
+
+    # The SQLite test database is one connection shared by every thread, so
+    # sessions opened from worker threads must not overlap
+    @contextmanager
+    def serialized_session():
+        with lock, factory() as db:
+            yield db
+
+    return JobQueue(serialized_session)
+
+
+def _job(queue, job_id):
+    with queue.session_factory() as db:
+        return db.query(Job).filter(Job.id == job_id).one()
+
+
+@pytest.mark.unit
+def test_enqueue_dedupes_active_jobs(queue):
+    first = queue.enqueue("research", {"business_id": "a"}, dedupe_key="research:a")
+    second = queue.enqueue("research", {"business_id": "a"}, dedupe_key="research:a")
+
+    assert first == second
+    assert queue.has_active("research:a")
+    assert queue.stats()["queued"] == 1
+
+
+@pytest.mark.unit
+def test_claim_leases_job_once(queue):
+    job_id = queue.enqueue("research", {"business_id": "a"})
+
+    claimed = queue.claim("worker-1", ["research"], limit=5)
+
+    assert [job["id"] for job in claimed] == [job_id]
+    assert claimed[0]["attempts"] == 1
+    assert queue.claim("worker-2", ["research"], limit=5) == []
+    assert _job(queue, job_id).locked_by == "worker-1"
+
+
+@pytest.mark.unit
+def test_expired_lease_is_reclaimed(queue):
+    job_id = queue.enqueue("research", {})
+    queue.claim("worker-1", ["research"], limit=1)
+    with queue.session_factory() as db:
+        db.query(Job).filter(Job.id == job_id).update(
+            {Job.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db.commit()
+
+    claimed = queue.claim("worker-2", ["research"], limit=1)
+
+    assert claimed[0]["attempts"] == 2
+    # The original worker lost its lease, so its result is ignored
+    queue.complete(job_id, "worker-1")
+    assert _job(queue, job_id).status == JobStatus.RUNNING
+
+
+@pytest.mark.unit
+def test_fail_retries_with_backoff_then_dead_letters(queue):
+    job_id = queue.enqueue("research", {}, max_attempts=2)
+
+    queue.claim("worker-1", ["research"], limit=1)
+    assert queue.fail(job_id, "worker-1", "boom") == JobStatus.QUEUED
+    assert _job(queue, job_id).run_after > datetime.utcnow()
+    assert queue.claim("worker-1", ["research"], limit=1) == []
+
+    with queue.session_factory() as db:
+        db.query(Job).filter(Job.id == job_id).update({Job.run_after: datetime.utcnow()})
+        db.commit()
+    queue.claim("worker-1", ["research"], limit=1)
+
+    assert queue.fail(job_id, "worker-1", "boom again") == JobStatus.DEAD
+    assert _job(queue, job_id).last_error == "boom again"
+    assert not queue.has_active(job_id)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_worker_runs_jobs_and_dead_letters_failures(queue):
+    done, dead = [], []
+
+    async def handle(payload):
+        if payload["n"] == 0:
+            raise ValueError("bad payload")
+        done.append(payload["n"])
+
+    async def on_dead(payload):
+        dead.append(payload["n"])
+
+    for n in range(4):
+        queue.enqueue("test", {"n": n}, max_attempts=1)
+    worker = JobWorker(queue, {"test": handle}, concurrency=2, dead_letter_handlers={"test": on_dead})
+
+    while await worker.run_once() or worker.pool.queue_depth or worker.pool.in_flight:
+        await worker.pool.join()
+    await worker.stop()
+
+    assert sorted(done) == [1, 2, 3]
+    assert dead == [0]
+    assert queue.stats() == {"queued": 0, "running": 0, "succeeded": 3, "dead": 1}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_lease_expired_on_final_attempt_is_dead_lettered(queue):
+    dead = []
+
+    async def handle(payload):
+        raise AssertionError("an expired final attempt must not run again")
+
+    async def on_dead(payload):
+        dead.append(payload["n"])
+
+    job_id = queue.enqueue("test", {"n": 7}, max_attempts=1)
+    queue.claim("crashed-worker", ["test"], limit=1)
+    with queue.session_factory() as db:
+        db.query(Job).filter(Job.id == job_id).update(
+            {Job.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db.commit()
+    worker = JobWorker(queue, {"test": handle}, concurrency=1, dead_letter_handlers={"test": on_dead})
+
+    await worker.run_once()
+    await worker.stop()
+
+    assert dead == [7]
+    assert _job(queue, job_id).status == JobStatus.DEAD
+    assert queue.stats()["dead"] == 1
+
+
+@pytest.mark.unit
+def test_claimed_enqueue_is_leased_to_the_caller(queue):
+    job_id = queue.enqueue("generate_website", {}, dedupe_key="generate:a", claimed_by="api-1")
+
+    # Active for dedupe, but not handed to a worker while the caller runs it
+    assert queue.find_active("generate:a")["id"] == job_id
+    assert queue.claim("worker-1", ["generate_website"], limit=5) == []
+    queue.complete(job_id, "api-1")
+    assert _job(queue, job_id).status == JobStatus.SUCCEEDED
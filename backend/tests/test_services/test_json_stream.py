@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from services.json_stream import JSONObjectStream, repair_json
+
+DOCUMENT = {
+    "description": "Says \"hi\", uses {braces} and [brackets]",
+    "services": ["a", "b"],
+    "hours": {"Monday": "9-5", "nested": {"deep": [1, 2]}},
+    "history": None,
+}
+
+
+@pytest.mark.unit
+def test_fields_complete_as_they_close_across_chunks():
+    text = "Sure!\n```json\n" + json.dumps(DOCUMENT, indent=2) + "\n```"
+    parser = JSONObjectStream()
+
+    completed = []
+    for i in range(0, len(text), 3):
+        completed.extend(key for key, _ in parser.feed(text[i:i + 3]))
+
+    assert completed == list(DOCUMENT)
+    assert parser.fields == DOCUMENT
+    assert parser.complete
+
+
+@pytest.mark.unit
+def test_truncated_object_keeps_closed_fields():
+    text = json.dumps(DOCUMENT)
+    parser = JSONObjectStream()
+
+    parser.feed(text[:text.index('"Monday"')])
+
+    assert parser.fields == {"description": DOCUMENT["description"], "services": ["a", "b"]}
+    assert not parser.complete
+
+
+@pytest.mark.unit
+def test_no_object_yields_nothing():
+    parser = JSONObjectStream()
+
+    assert parser.feed("I could not find this business.") == []
+    assert parser.fields == {}
+
+
+@pytest.mark.unit
+def test_trailing_commas_are_repaired():
+    parser = JSONObjectStream()
+
+    parser.feed('{"services": ["a", "b",], "hours": {"Monday": "9-5",},}')
+
+    assert repair_json('[1, 2 ,\n]') == "[1, 2 ]"
+    assert parser.fields == {"services": ["a", "b"], "hours": {"Monday": "9-5"}}
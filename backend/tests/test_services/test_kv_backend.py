@@ -0,0 +1,66 @@
+import pytest
+
+from core.config import settings
+from services.kv_backend import KVBackend, MemoryBackend, backend_name, create_backend
+from services.research_cache import ResearchCache
+from services.token_budget import TokenBudget
+
+
+class BrokenBackend(KVBackend):
+    name = "broken"
+
+    async def _get(self, key):
+        raise ConnectionError("redis is down")
+
+    async def _set(self, key, raw, ttl):
+        raise ConnectionError("redis is down")
+
+    async def _incr(self, key, amount, ttl):
+        raise ConnectionError("redis is down")
+
+
+@pytest.mark.unit
+def test_stores_stay_in_memory_unless_redis_is_configured(monkeypatch):
+    monkeypatch.setattr(settings, "redis_url", None)
+    assert backend_name() == "memory"
+    assert isinstance(create_backend("test:"), MemoryBackend)
+
+    monkeypatch.setattr(settings, "redis_url", "redis://localhost:6379/0")
+    assert backend_name() == "redis"
+    assert backend_name("memory") == "memory"
+
+
+@pytest.mark.unit
+def test_backends_must_implement_storage():
+    class PartialBackend(KVBackend):
+        async def _get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialBackend("test:")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_memory_counters_expire_with_their_window(monkeypatch):
+    backend = MemoryBackend("test:")
+    clock = [1000.0]
+    monkeypatch.setattr("services.kv_backend.time.time", lambda: clock[0])
+
+    assert await backend.incr("minute:1", 5, ttl=60) == 5
+    assert await backend.incr("minute:1", 3, ttl=60) == 8
+    clock[0] += 61
+    assert await backend.incr("minute:1", 2, ttl=60) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failing_backend_never_breaks_the_store():
+    cache = ResearchCache(ttl=60, backend=BrokenBackend("test:"))
+    await cache.set("key", {"summary": "x"})
+    assert await cache.get("key") is None
+    assert cache.stats()["misses"] == 1
+
+    budget = TokenBudget(per_minute=10, per_day=100, backend=BrokenBackend("test:"))
+    reservation = await budget.reserve(50)
+    assert reservation["tokens"] == 50
@@ -0,0 +1,218 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import services.pipeline as pipeline_module
+from models import (
+    Business, BusinessResearch, GeneratedWebsite, PipelineRun, PipelineStatus, ResearchStatus, Template
+)
+from services.job_queue import JobQueue
+from services.pipeline import PIPELINE_JOB, Pipeline
+from services.single_flight import SingleFlight
+
+
+def _place(i, website_status="no_website"):
+    return {
+        "place_id": f"place-{i}",
+        "name": f"Business {i}",
+        "address": f"{i} Main St",
+        "latitude": 40.0,
+        "longitude": -74.0,
+        "website_status": website_status,
+    }
+
+
+class FakePlaces:
+    def __init__(self, places, fail_after=None):
+        self.places = places
+        self.fail_after = fail_after
+
+    async def stream_businesses(self, location, radius_miles, business_types=None, max_results=60):
+        for i, place in enumerate(self.places):
+            if i == self.fail_after:
+                raise RuntimeError("search interrupted")
+            await asyncio.sleep(0)
+            yield place
+
+
+class FakeResearcher:
+    def __init__(self, factory):
+        self.factory = factory
+        self.researched = []
+        self.active = 0
+        self.max_active = 0
+
+    async def research_business(self, business_id, force_refresh=False):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+        with self.factory() as db:
+            research = db.query(BusinessResearch).filter_by(business_id=business_id).one()
+            research.status = ResearchStatus.COMPLETED
+            db.commit()
+        self.researched.append(business_id)
+
+    def mark_failed(self, business_id):
+        pass
+
+
+class FakeGenerator:
+    def __init__(self, factory):
+        self.factory = factory
+        self.generated = []
+
+    async def generate(self, website_id):
+        await asyncio.sleep(0)
+        with self.factory() as db:
+            website = db.get(GeneratedWebsite, website_id)
+            website.preview_url = f"/preview/{website_id}"
+            db.commit()
+        self.generated.append(website_id)
+
+
+@pytest.fixture
+def factory(db_session, monkeypatch):
+    session_factory = sessionmaker(bind=db_session.get_bind())
+    lock = threading.Lock()
+
+    # The SQLite test database is one connection shared by every thread, so
+    # sessions opened by concurrent stages must not overlap
+    @contextmanager
+    def factory():
+        with lock, session_factory() as db:
+            yield db
+
+    monkeypatch.setattr(pipeline_module, "job_queue", JobQueue(factory))
+    monkeypatch.setattr(pipeline_module, "single_flight", SingleFlight())
+    return factory
+
+
+def _create_run(db_session, **spec):
+    template = Template(name="minimal", category="business", structure={}, styles={}, components={})
+    db_session.add(template)
+    db_session.commit()
+    run = PipelineRun(
+        spec={
+            "location": "Springfield", "radius_miles": 1.0, "business_types": None, "max_results": 20,
+            "website_statuses": ["no_website", "facebook_only"], "force_refresh": False, **spec
+        },
+        template_id=template.id
+    )
+    db_session.add(run)
+    db_session.commit()
+    return run.id
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_pipeline_runs_every_stage_with_bounded_concurrency(db_session, factory):
+    run_id = _create_run(db_session, research_concurrency=2)
+    places = [_place(i) for i in range(6)] + [_place(6, "has_website")]
+    researcher, generator = FakeResearcher(factory), FakeGenerator(factory)
+
+    stats = await Pipeline(run_id, factory, FakePlaces(places), researcher, generator).run()
+
+    assert stats["stages"]["discovery"]["completed"] == 6
+    assert stats["stages"]["discovery"]["skipped"] == 1
+    assert stats["stages"]["research"]["completed"] == 6
+    assert stats["stages"]["generation"]["completed"] == 6
+    assert researcher.max_active == 2
+    db_session.expire_all()
+    run = db_session.get(PipelineRun, run_id)
+    assert run.status == PipelineStatus.SUCCEEDED
+    assert run.discovery_complete and len(run.business_ids) == 7
+    assert db_session.query(GeneratedWebsite).filter(GeneratedWebsite.preview_url.isnot(None)).count() == 6
+
+
+class JobCheckingResearcher(FakeResearcher):
+    """Records whether an endpoint would see the research as already running"""
+
+    def __init__(self, factory):
+        super().__init__(factory)
+        self.visible = []
+
+    async def research_business(self, business_id, force_refresh=False):
+        active = await asyncio.to_thread(pipeline_module.job_queue.find_active, f"research:{business_id}")
+        self.visible.append(active is not None)
+        await super().research_business(business_id, force_refresh)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_inline_stage_work_is_registered_as_a_job(db_session, factory):
+    run_id = _create_run(db_session)
+    researcher, generator = JobCheckingResearcher(factory), FakeGenerator(factory)
+
+    await Pipeline(run_id, factory, FakePlaces([_place(i) for i in range(3)]), researcher, generator).run()
+
+    # A concurrent start_research would have joined these jobs instead of duplicating them
+    assert researcher.visible == [True, True, True]
+    stats = pipeline_module.job_queue.stats()
+    assert stats["succeeded"] == 6
+    assert stats["queued"] == stats["running"] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_interrupted_pipeline_resumes_without_redoing_work(db_session, factory):
+    run_id = _create_run(db_session)
+    places = [_place(i) for i in range(4)]
+    researcher, generator = FakeResearcher(factory), FakeGenerator(factory)
+
+    with pytest.raises(RuntimeError):
+        await Pipeline(run_id, factory, FakePlaces(places, fail_after=2), researcher, generator).run()
+    db_session.expire_all()
+    run = db_session.get(PipelineRun, run_id)
+    assert run.status == PipelineStatus.FAILED and not run.discovery_complete
+    assert len(researcher.researched) == 2
+
+    stats = await Pipeline(run_id, factory, FakePlaces(places), researcher, generator).run()
+
+    assert sorted(researcher.researched) == sorted(b.id for b in db_session.query(Business))
+    assert stats["stages"]["research"]["skipped"] == 2
+    assert stats["stages"]["generation"]["skipped"] == 2
+    assert len(generator.generated) == 4
+
+    # Once discovery has completed, a rerun replays stored businesses without searching
+    stats = await Pipeline(run_id, factory, FakePlaces([]), researcher, generator).run()
+    assert stats["stages"]["discovery"]["completed"] == 4
+    assert stats["stages"]["research"]["skipped"] == 4
+    assert len(researcher.researched) == 4
+
+
+class BrokenHandOffPipeline(Pipeline):
+    async def _put(self, stage, queue, business_id):
+        if stage == "research":
+            raise RuntimeError("queue unavailable")
+        await super()._put(stage, queue, business_id)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failure_outside_a_stage_fails_the_run_instead_of_hanging(db_session, factory):
+    run_id = _create_run(db_session)
+    places = [_place(i) for i in range(3)]
+    researcher, generator = FakeResearcher(factory), FakeGenerator(factory)
+
+    pipeline = BrokenHandOffPipeline(run_id, factory, FakePlaces(places), researcher, generator)
+    with pytest.raises(RuntimeError, match="queue unavailable"):
+        await asyncio.wait_for(pipeline.run(), timeout=5)
+
+    # Every business was still worked through, and the failure is on the run
+    assert len(researcher.researched) == 3
+    db_session.expire_all()
+    run = db_session.get(PipelineRun, run_id)
+    assert run.status == PipelineStatus.FAILED
+    assert "queue unavailable" in run.error
+
+
+@pytest.mark.unit
+def test_pipelines_do_not_share_slots_with_the_jobs_they_wait_on():
+    from worker import create_job_worker, create_pipeline_worker
+
+    assert PIPELINE_JOB not in create_job_worker().handlers
+    assert list(create_pipeline_worker().handlers) == [PIPELINE_JOB]
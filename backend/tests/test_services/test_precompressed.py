@@ -0,0 +1,59 @@
+import gzip
+import os
+
+import pytest
+
+from services.precompressed import MIN_SIZE, select_variant, write_precompressed
+
+
+@pytest.fixture
+def page(tmp_path):
+    path = tmp_path / "index.html"
+    data = ("<p>" + "Family business known for friendly service. " * 20 + "</p>").encode()
+    path.write_bytes(data)
+    return path
+
+
+@pytest.mark.unit
+def test_write_precompressed_round_trips(page):
+    written = write_precompressed(page)
+    
+    assert "index.html.gz" in written
+    assert gzip.decompress((page.parent / "index.html.gz").read_bytes()) == page.read_bytes()
+    # Deterministic, so unchanged pages produce unchanged variants
+    before = (page.parent / "index.html.gz").read_bytes()
+    write_precompressed(page)
+    assert (page.parent / "index.html.gz").read_bytes() == before
+
+
+@pytest.mark.unit
+def test_small_files_get_no_variants(page):
+    write_precompressed(page)
+    small = b"<p>hi</p>"
+    assert len(small) < MIN_SIZE
+    page.write_bytes(small)
+    
+    assert write_precompressed(page) == []
+    assert not (page.parent / "index.html.gz").exists()
+
+
+@pytest.mark.unit
+def test_select_variant_follows_accept_encoding(page):
+    write_precompressed(page)
+    gz = page.parent / "index.html.gz"
+    
+    assert select_variant(page, "gzip, deflate") == ("gzip", gz)
+    assert select_variant(page, "deflate, gzip;q=0.5")[0] == "gzip"
+    assert select_variant(page, "*")[0] in ("br", "gzip")
+    assert select_variant(page, "gzip;q=0") is None
+    assert select_variant(page, "identity") is None
+    assert select_variant(page, None) is None
+
+
+@pytest.mark.unit
+def test_select_variant_ignores_stale_variants(page):
+    write_precompressed(page)
+    for variant in page.parent.glob("index.html.*"):
+        os.utime(variant, ns=(0, 0))
+    
+    assert select_variant(page, "gzip, br") is None
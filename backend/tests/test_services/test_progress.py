@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from services.progress import ProgressBus, send_research_progress
+import services.progress as progress_module
+
+
+class DownRedis:
+    async def publish(self, channel, message):
+        raise ConnectionError("redis is down")
+
+
+class RecordingRedis:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_without_redis_events_reach_handlers_in_this_process(monkeypatch):
+    bus = ProgressBus()
+    monkeypatch.setattr(progress_module, "progress_bus", bus)
+    received = []
+
+    async def handler(business_id, progress_type, data):
+        received.append((business_id, progress_type, data["step"], data["status"]))
+
+    await bus.start(handler)
+    await send_research_progress("b1", "started", 0, "Researching")
+    await send_research_progress("b1", "completed", 100, "Done")
+    await bus.stop()
+
+    assert received == [
+        ("b1", "research_progress", "started", "in_progress"),
+        ("b1", "research_progress", "completed", "completed"),
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_with_redis_events_are_published_for_the_api_to_relay():
+    bus = ProgressBus()
+    bus.client = RecordingRedis()
+    local = []
+
+    async def handler(**event):
+        local.append(event)
+
+    bus._handlers.append(handler)
+    await bus.publish("b1", "research_progress", {"step": "started"})
+
+    assert local == []
+    assert bus.client.published[0][0] == progress_module.CHANNEL
+
+    # The relay hands the same event to the API's handlers
+    await bus._deliver(json.loads(bus.client.published[0][1]))
+    assert local == [{"business_id": "b1", "progress_type": "research_progress", "data": {"step": "started"}}]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_publish_is_delivered_locally_instead_of_raising():
+    bus = ProgressBus()
+    bus.client = DownRedis()
+    received = []
+
+    async def handler(**event):
+        received.append(event["business_id"])
+
+    bus._handlers.append(handler)
+    await bus.publish("b1", "research_progress", {})
+
+    assert received == ["b1"]
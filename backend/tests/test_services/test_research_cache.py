@@ -0,0 +1,33 @@
+import time
+
+import pytest
+
+from services.research_cache import ResearchCache, fingerprint
+
+INPUTS = {"name": "Joe's Diner", "address": "1 Main St", "phone": None}
+
+
+@pytest.mark.unit
+def test_fingerprint_covers_inputs_model_and_prompt_version():
+    key = fingerprint(INPUTS, "model-a", "1")
+
+    assert key == fingerprint(dict(reversed(list(INPUTS.items()))), "model-a", "1")
+    assert key != fingerprint({**INPUTS, "phone": "555-0100"}, "model-a", "1")
+    assert key != fingerprint(INPUTS, "model-b", "1")
+    assert key != fingerprint(INPUTS, "model-a", "2")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_memory_cache_hits_until_ttl(monkeypatch):
+    cache = ResearchCache(ttl=60)
+    await cache.set("key", {"description": "Cozy"})
+
+    assert await cache.get("key") == {"description": "Cozy"}
+    assert await cache.get("other") is None
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert await cache.get("key") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
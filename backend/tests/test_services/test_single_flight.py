@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from core.config import settings
+from services.single_flight import SingleFlight, lock_redis_url
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+
+    async def start():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return f"job-{calls}"
+
+    results = await asyncio.gather(*(flight.do("research:1", start) for _ in range(5)))
+
+    assert results == ["job-1"] * 5
+    assert flight.stats()["executed"] == 1
+    assert flight.stats()["shared"] == 4
+    # Once finished, the next call runs again
+    assert await flight.do("research:1", start) == "job-2"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    async def start():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("queue down")
+
+    results = await asyncio.gather(*(flight.do("key", start) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_lock_serializes_check_then_start():
+    flight = SingleFlight()
+    started = []
+
+    async def start_once(name):
+        async with flight.lock_many(["b", "a"]):
+            if not started:
+                await asyncio.sleep(0.01)
+                started.append(name)
+
+    await asyncio.gather(start_once("first"), start_once("second"))
+
+    assert started == ["first"]
+    assert flight._local_locks == {}
+
+
+@pytest.mark.unit
+def test_explicit_redis_locks_need_a_redis_url(monkeypatch):
+    monkeypatch.setattr(settings, "redis_url", None)
+    monkeypatch.setattr(settings, "single_flight_backend", None)
+    assert lock_redis_url() is None
+
+    monkeypatch.setattr(settings, "single_flight_backend", "redis")
+    with pytest.raises(ValueError):
+        lock_redis_url()
+
+    monkeypatch.setattr(settings, "redis_url", "redis://localhost:6379/0")
+    assert lock_redis_url() == "redis://localhost:6379/0"
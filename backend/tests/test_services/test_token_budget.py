@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from services.token_budget import TokenBudget
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_reserve_and_settle_track_actual_usage():
+    budget = TokenBudget(per_minute=1000, per_day=10000)
+
+    reservation = await budget.reserve(600)
+    await budget.settle(reservation, 250)
+
+    usage = await budget.usage()
+    assert usage["minute"]["used"] == 250
+    assert usage["day"]["used"] == 250
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_full_window_queues_instead_of_failing(monkeypatch):
+    budget = TokenBudget(per_minute=1000, per_day=10000)
+    await budget.reserve(900)
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        # The minute window rolls over while we wait
+        entries = budget.backend._entries
+        budget.backend._entries = {key: value for key, value in entries.items() if ":minute:" not in key}
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    await budget.reserve(200)
+
+    assert len(sleeps) == 1 and 0 < sleeps[0] <= 60.1
+    assert budget.waits == 1
+    # The rejected attempt was rolled back from the day window
+    assert (await budget.usage())["day"]["used"] == 1100
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_oversized_call_runs_in_an_empty_window():
+    budget = TokenBudget(per_minute=100, per_day=10000)
+
+    reservation = await budget.reserve(500)
+
+    assert reservation["tokens"] == 500
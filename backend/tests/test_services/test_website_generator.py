@@ -0,0 +1,79 @@
+import threading
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import services.website_generator as website_generator
+from models import GeneratedWebsite, Job, JobStatus
+from services.job_queue import JobQueue
+from services.website_generator import WebsiteGenerator, get_or_create_websites, run_claimed_generation_jobs
+
+
+@pytest.fixture
+def queue(db_session, monkeypatch):
+    factory = sessionmaker(bind=db_session.get_bind())
+    lock = threading.Lock()
+
+    @contextmanager
+    def serialized_session():
+        with lock, factory() as db:
+            yield db
+
+    queue = JobQueue(serialized_session)
+    monkeypatch.setattr(website_generator, "job_queue", queue)
+    return queue
+
+
+class FakeGenerator(WebsiteGenerator):
+    def __init__(self, results):
+        self.results = results
+
+    async def generate_batch(self, website_ids, force=False):
+        return {str(website_id): self.results[str(website_id)] for website_id in website_ids}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_generate_raises_on_a_failed_site_so_the_job_retries():
+    generator = FakeGenerator({"w1": {"status": "failed", "error": "template crashed"}})
+
+    with pytest.raises(RuntimeError, match="template crashed"):
+        await generator.generate("w1")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_claimed_jobs_are_settled_with_their_results(queue):
+    job_ids = {
+        website_id: queue.enqueue("generate_website", {"website_id": website_id}, claimed_by="api-1")
+        for website_id in ("w1", "w2")
+    }
+    generator = FakeGenerator({
+        "w1": {"status": "completed", "preview_url": "/preview/w1"},
+        "w2": {"status": "failed", "error": "template crashed"},
+    })
+
+    results = await run_claimed_generation_jobs(job_ids, "api-1", generator)
+
+    assert results["w1"]["status"] == "completed"
+    with queue.session_factory() as db:
+        statuses = {job.payload["website_id"]: job for job in db.query(Job)}
+        assert statuses["w1"].status == JobStatus.SUCCEEDED
+        # The failed site goes back on the queue for the job worker to retry
+        assert statuses["w2"].status == JobStatus.QUEUED
+        assert "template crashed" in statuses["w2"].last_error
+
+
+@pytest.mark.unit
+def test_existing_website_is_reused_so_unchanged_sites_can_skip(db_session):
+    first = get_or_create_websites(db_session, ["b1"], "t1", {"theme": "light"})
+    again = get_or_create_websites(db_session, ["b1", "b2"], "t1")
+    restyled = get_or_create_websites(db_session, ["b1"], "t1", {"theme": "dark"})
+    other_template = get_or_create_websites(db_session, ["b1"], "t2")
+
+    assert again["b1"] == first["b1"] == restyled["b1"]
+    assert again["b2"] != first["b1"]
+    assert other_template["b1"] != first["b1"]
+    website = db_session.query(GeneratedWebsite).filter(GeneratedWebsite.id == first["b1"]).one()
+    assert website.settings == {"theme": "dark"}
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from services.worker_pool import QueueFullError, WorkerPool
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_pool_bounds_concurrency():
+    active, peak = 0, 0
+    
+    async def handler(job):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+    
+    pool = WorkerPool("test", handler, concurrency=3)
+    for job in range(10):
+        await pool.submit(job)
+    await pool.join()
+    await pool.stop()
+    
+    assert peak == 3
+    assert pool.stats()["completed"] == 10
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_pool_reports_queue_and_failures():
+    release = asyncio.Event()
+    
+    async def handler(job):
+        await release.wait()
+        if job == "bad":
+            raise ValueError("boom")
+    
+    pool = WorkerPool("test", handler, concurrency=1, max_queue=2)
+    await pool.submit("first")
+    await asyncio.sleep(0)
+    await pool.submit("bad")
+    await pool.submit("third")
+    
+    assert pool.is_full
+    with pytest.raises(QueueFullError):
+        await pool.submit("overflow")
+    assert pool.stats()["in_flight"] == 1
+    assert pool.stats()["queue_depth"] == 2
+    
+    release.set()
+    await pool.join()
+    await pool.stop()
+    
+    assert pool.stats()["completed"] == 2
+    assert pool.stats()["failed"] == 1
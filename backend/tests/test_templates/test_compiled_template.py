@@ -0,0 +1,38 @@
+import pytest
+
+from templates.base_template import CompiledTemplate
+from templates.template_manager import TemplateManager
+
+
+@pytest.mark.unit
+def test_static_slots_are_inlined_and_dynamic_slots_escaped():
+    compiled = CompiledTemplate(
+        "<style>{{css|raw}}</style><h1>{{name}}</h1>{{body|raw}}<p>{{title}}</p>",
+        static={"css": "a > b {}", "title": "Fish & Chips"}
+    )
+
+    assert compiled.slots == ["name", "body"]
+    assert compiled.render({"name": "<Rosa's>", "body": "<b>ok</b>"}) == (
+        "<style>a > b {}</style><h1>&lt;Rosa&#x27;s&gt;</h1><b>ok</b><p>Fish &amp; Chips</p>"
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("template_name", ["minimal", "modern", "luxury"])
+def test_templates_compile_once_and_escape_business_data(template_name):
+    template = TemplateManager().get_template(template_name)
+    business_data = {
+        "business": {"name": "Tom & Jerry's", "address": "1 <Main> St", "phone": "555"},
+        "description": "Cheese \"fresh\" daily",
+        "services": ["<script>alert(1)</script>"],
+        "hours": {"Monday": "9-5"},
+        "reviews": [{"author": "Ann", "text": "<b>Great</b>"}],
+    }
+
+    html = template.render(business_data)
+
+    assert template.compiled is template.compiled
+    assert "Tom &amp; Jerry&#x27;s" in html
+    assert "<script>alert(1)</script>" not in html
+    assert "1 &lt;Main&gt; St" in html
+    assert "{{" not in html
@@ -4,7 +4,7 @@ import json
 import tempfile
 import shutil
 
-from templates.template_manager import TemplateManager
+from templates.template_manager import TemplateManager, generate_websites_task
 
 
 @pytest.fixture
@@ -84,4 +84,102 @@ def test_get_template_preview(template_manager: TemplateManager):
     preview_html = template_manager.get_template_preview("minimal")
     assert "Sample Business" in preview_html
     assert "(555) 123-4567" in preview_html
-    assert "DOCTYPE html" in preview_html
\ No newline at end of file
+    assert "DOCTYPE html" in preview_html
+
+@pytest.mark.unit
+def test_generated_sites_link_shared_hashed_assets(template_manager: TemplateManager):
+    business_data = {"business": {"name": "Test Business"}, "services": ["Service 1"]}
+    
+    for website_id in ("site-1", "site-2"):
+        template_manager.generate_website("modern", business_data, website_id)
+    
+    shared_dir = template_manager.output_base / "templates" / "shared_assets"
+    asset_files = template_manager.get_template("modern").asset_files
+    css, js = asset_files["css"], asset_files["js"]
+    # Each asset is published once, with its compressed variants alongside
+    names = [path.name for path in shared_dir.iterdir() if not path.name.endswith((".gz", ".br"))]
+    assert sorted(names) == sorted([css[0], js[0]])
+    assert (shared_dir / f"{css[0]}.gz").exists()
+    assert (shared_dir / css[0]).read_text() == css[1]
+    
+    # Saved pages link them at the shared immutable route, with no per-site copies
+    site_dir = template_manager.output_base / "site-1"
+    html_content = (site_dir / "index.html").read_text()
+    assert f'href="/preview/assets/{css[0]}"' in html_content
+    assert f'src="/preview/assets/{js[0]}"' in html_content
+    assert "<style>" not in html_content
+    assert not (site_dir / "assets").exists()
+    metadata = json.loads((template_manager.output_base / "site-2" / "metadata.json").read_text())
+    assert metadata["shared_assets"] == [css[0], js[0]]
+    
+    # Exports carry their own copies, referenced relatively
+    export_dir = template_manager.export_website("site-1")
+    exported_html = (export_dir / "index.html").read_text()
+    assert f'href="assets/{css[0]}"' in exported_html
+    assert f'src="assets/{js[0]}"' in exported_html
+    assert (export_dir / "assets" / css[0]).read_text() == css[1]
+    assert (export_dir / "assets" / f"{css[0]}.gz").exists()
+    
+    # Switching template replaces the exported assets
+    template_manager.generate_website("minimal", business_data, "site-1")
+    template_manager.export_website("site-1")
+    minimal_css = template_manager.get_template("minimal").asset_files["css"][0]
+    assert sorted(path.name for path in (export_dir / "assets").iterdir()) == sorted(
+        [minimal_css, f"{minimal_css}.gz"] + ([f"{minimal_css}.br"] if (shared_dir / f"{minimal_css}.br").exists() else [])
+    )
+    
+    # Previews stay self-contained
+    assert "<style>" in template_manager.get_template_preview("modern")
+
+
+@pytest.mark.unit
+def test_generate_websites_task_reports_each_site(template_manager: TemplateManager):
+    tasks = [
+        ("site-1", "minimal", {"business": {"name": "First Business"}}, {}),
+        ("site-2", "nonexistent", {"business": {"name": "Second Business"}}, {}),
+    ]
+    
+    results = generate_websites_task(tasks, str(template_manager.output_base))
+    
+    assert results[0]["success"] is True
+    assert results[0]["preview_url"] == "/preview/site-1"
+    assert "First Business" in (template_manager.output_base / "site-1" / "index.html").read_text()
+    assert results[1] == {"success": False, "error": "Template 'nonexistent' not found"}
+
+
+@pytest.mark.unit
+def test_regeneration_skips_unchanged_inputs(template_manager: TemplateManager):
+    business_data = {"business": {"name": "Test Business"}, "services": ["Service 1"]}
+    
+    first = template_manager.generate_website("minimal", business_data, "site-1")
+    assert first["unchanged"] is False
+    assert first["written"][0] == "index.html"
+    assert "index.html.gz" in first["written"]
+    assert first["written"][-1] == "metadata.json"
+    metadata = json.loads((template_manager.output_base / "site-1" / "metadata.json").read_text())
+    assert metadata["fingerprint"] == first["fingerprint"]
+    assert metadata["template_version"] == template_manager.get_template("minimal").version
+    
+    second = template_manager.generate_website("minimal", business_data, "site-1")
+    assert second["unchanged"] is True
+    assert second["written"] == []
+    assert second["fingerprint"] == first["fingerprint"]
+    
+    # Forced renders leave identical files alone, only refreshing the compressed variants
+    forced = template_manager.generate_website("minimal", business_data, "site-1", force=True)
+    assert forced["unchanged"] is False
+    assert "index.html" not in forced["written"]
+    assert "metadata.json" not in forced["written"]
+    
+    changed = template_manager.generate_website("minimal", {**business_data, "services": ["Service 2"]}, "site-1")
+    assert changed["fingerprint"] != first["fingerprint"]
+    assert changed["written"] == first["written"]
+    assert "Service 2" in (template_manager.output_base / "site-1" / "index.html").read_text()
+    
+    other = template_manager.generate_website("modern", business_data, "site-1")
+    assert other["fingerprint"] != changed["fingerprint"]
+    assert other["unchanged"] is False
+    
+    restyled = template_manager.generate_website("modern", business_data, "site-1", website_settings={"theme": "dark"})
+    assert restyled["fingerprint"] != other["fingerprint"]
+    assert restyled["unchanged"] is False
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+BizFly job worker - runs queued background jobs outside the API process
+
+Any number of workers can run against the same database; jobs are leased,
+so a crashed worker's jobs are picked up again once its lease expires.
+Set RUN_JOB_WORKER_IN_API=false on the API when running workers this way.
+
+Pipeline runs get their own worker and slots: they wait on research and
+generation jobs, so sharing slots with those could leave nothing to run them.
+
+Usage: python worker.py [--concurrency 4] [--pipeline-concurrency 2]
+"""
+import argparse
+import asyncio
+import logging
+import signal
+
+from core.config import settings
+from agents.research_agent import (
+    RESEARCH_JOB, RESEARCH_BATCH_JOB,
+    run_research_job, fail_research_job, run_research_batch_job, fail_research_batch_job
+)
+from services.job_queue import JobWorker, job_queue
+from services.pipeline import PIPELINE_JOB, run_pipeline_job
+from services.website_generator import GENERATE_WEBSITE_JOB, run_generation_job, shutdown_generation_pool
+
+logger = logging.getLogger(__name__)
+
+
+def create_job_worker(concurrency: int = None) -> JobWorker:
+    return JobWorker(
+        job_queue,
+        handlers={
+            RESEARCH_JOB: run_research_job,
+            RESEARCH_BATCH_JOB: run_research_batch_job,
+            GENERATE_WEBSITE_JOB: run_generation_job,
+        },
+        dead_letter_handlers={
+            RESEARCH_JOB: fail_research_job,
+            RESEARCH_BATCH_JOB: fail_research_batch_job,
+        },
+        concurrency=concurrency or settings.research_concurrency
+    )
+
+
+def create_pipeline_worker(concurrency: int = None) -> JobWorker:
+    return JobWorker(
+        job_queue,
+        handlers={PIPELINE_JOB: run_pipeline_job},
+        concurrency=concurrency or settings.pipeline_concurrency
+    )
+
+
+async def main(concurrency: int, pipeline_concurrency: int):
+    workers = [create_job_worker(concurrency), create_pipeline_worker(pipeline_concurrency)]
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    for worker in workers:
+        await worker.start()
+    await stop.wait()
+    for worker in workers:
+        await worker.stop()
+    shutdown_generation_pool()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=settings.research_concurrency)
+    parser.add_argument("--pipeline-concurrency", type=int, default=settings.pipeline_concurrency)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.pipeline_concurrency))
@@ -18,11 +18,17 @@ export async function getBusiness(id: string): Promise<Business> {
   return response.data
 }
 
+export interface BusinessPage {
+  items: Business[]
+  next_cursor: string | null
+}
+
 export async function listBusinesses(params?: {
-  skip?: number
+  cursor?: string
   limit?: number
   website_status?: string
-}): Promise<Business[]> {
+  business_type?: string
+}): Promise<BusinessPage> {
   const response = await api.get('/businesses', { params })
   return response.data
 }
@@ -32,6 +38,16 @@ export async function startResearch(businessId: string): Promise<Research> {
   return response.data
 }
 
+export interface BatchResearchResult {
+  job_ids: string[]
+  items: { business_id: string; status: 'queued' | 'in_progress' | 'not_found' }[]
+}
+
+export async function startBatchResearch(businessIds: string[]): Promise<BatchResearchResult> {
+  const response = await api.post('/research/batch', { business_ids: businessIds })
+  return response.data
+}
+
 export async function getResearch(businessId: string): Promise<Research> {
   const response = await api.get(`/research/${businessId}`)
   return response.data